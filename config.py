@@ -1,4 +1,3 @@
-# config.py
 TEST_CONFIG = {
     "base_url": "https://healio-test.ddns.net/",
     "headless": True,
@@ -15,5 +14,83 @@ TEST_CONFIG = {
         "",
         "123456",
         "password"
-    ]
-}
\ No newline at end of file
+    ],
+    # Tentatives d'injection SQL (utilisées comme login et mot de passe)
+    "sql_payloads": [
+        "' OR '1'='1",
+        "'; DROP TABLE users; --",
+        "admin'--",
+        "' UNION SELECT * FROM users --"
+    ],
+    # Parallélisme de la matrice HTTP et nombre d'injections rejouées dans le navigateur
+    "login_matrix_workers": 8,
+    # Échecs tolérés par Odoo avant blocage de l'IP (base.login_cooldown_after): la matrice s'arrête
+    # une combinaison avant et se reconnecte avec les identifiants valides pour remettre le compteur à zéro
+    "login_cooldown_after": 5,
+    "login_browser_sample": 2,
+    # Codes postaux: longueur des codes numériques, complétés par des zéros à gauche perdus par Excel
+    # (5 pour un fichier France/US; None: pas de complément, la feuille mêle des pays à 4 et 5 chiffres)
+    "zip_digits": None,
+    # Profil navigateur utilisé par défaut (surcharge: ODOO_BROWSER_PROFILE)
+    "browser_profile": "lean",
+    "browser_profiles": {
+        "default": {
+            "window_size": None,
+            "block_resources": False,
+            "disable_animations": False
+        },
+        "lean": {
+            "window_size": [1366, 900],
+            "block_resources": True,
+            "disable_animations": True
+        }
+    },
+    # Profils Chrome persistants (cache disque des bundles Odoo entre les runs), None pour des profils jetables
+    "profile_dir": "~/.cache/odoo_contact/chrome-profiles",
+    # Enchaîner les contacts dans le client web déjà chargé (bouton Nouveau / hash) au lieu de driver.get
+    "in_app_navigation": True,
+    # Requêtes bloquées par les profils "block_resources": images, polices, analytics
+    "blocked_url_patterns": [
+        "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.ico",
+        "*/web/image*",
+        "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+        "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+        "*facebook.net*", "*hotjar.com*"
+    ],
+    # Seuils p95 (ms) des métriques navigateur par endpoint RPC et type de page
+    "perf_thresholds": {
+        "rpc:call_kw/res.partner/create": 2000,
+        "rpc:call_kw/res.partner/web_save": 2000,
+        "rpc:call_kw/res.partner/onchange": 1000,
+        "rpc:call_kw/res.partner/web_search_read": 2000,
+        "rpc:action/load": 1500,
+        "page:webclient.load": 8000,
+        "page:form.long_tasks_ms": 1000
+    },
+    # Faire échouer les tests quand un seuil est dépassé (sinon simple avertissement)
+    "perf_fail_on_threshold": False,
+    # Supprimer en fin de run les contacts étiquetés test-run:<RUN_ID>
+    # (désactivé par défaut: les runs incrémentaux réutilisent les contacts déjà créés)
+    "cleanup_after_run": False,
+    # Publier les résultats dans TestRail pendant le run (trcli-config.yml; surcharge: TESTRAIL_PUBLISH=1)
+    "testrail_publish": False,
+    # Journal: niveau console, niveau et rotation du fichier JSONL (logs/run-<RUN_ID>.jsonl)
+    "log_level": "INFO",
+    "log_file_level": "DEBUG",
+    "log_dir": "logs",
+    "log_max_bytes": 10 * 1024 * 1024,
+    "log_backup_count": 5,
+    # Délais adaptatifs: percentile des attentes réussies x facteur, bornés (défauts: timeout / page_load_timeout
+    # tant que moins de min_samples mesures), historique dans tests/.cache/timeouts.json
+    "page_load_timeout": 30,
+    "adaptive_timeouts": {
+        "enabled": True,
+        "quantile": 99,
+        "factor": 3.0,
+        "min_s": 2.0,
+        "max_s": 60.0,
+        "min_samples": 20
+    },
+    # Tentatives par ligne (première comprise) pour les échecs transitoires, rejouées en fin de run
+    "retry_max_attempts": 3
+}
@@ -1,40 +1,138 @@
 import os
-import time
-import pandas as pd
+import multiprocessing
 import unittest
-from selenium import webdriver
+from concurrent.futures import ProcessPoolExecutor
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.service import Service as ChromeService
 from dotenv import load_dotenv
+from harness.bulk_loader import BulkContactLoader
+from harness.cleanup import RunTagger
+from harness.drivers import shared_pool
+from harness.form_fill import fill_fields
+from harness.locators import LocatorResolver
+from harness.logs import SUMMARY, get_logger, reopen_log_file
+from harness.navigation import AppNavigator
+from harness.oracle import ContactOracle, OracleReport
+from harness.perf import shared_perf
+from harness.recorder import capture_step, finish_test, test_failed
+from harness.retry import RetryQueue, is_transient
+from harness.run_state import RunState, full_run, row_hash
+from harness.scheduler import TimingStore, lpt_shards
+from harness.session import shared_session
+from harness.settings import setting
+from harness.spreadsheet import count_rows, file_hash, iter_contact_chunks
+from harness.timeouts import AdaptiveWait
+from harness.tracing import shared_tracer, span, traced
+from harness.validation import validate_contacts
+from harness.waits import OdooWait
 
 load_dotenv()
 
+log = get_logger("TestMultipleContactsCreation")
+
+
+def init_worker(slots):
+    """Numéro de worker du processus, pour lui réserver ses propres profils Chrome et fichier de journal"""
+    parent = os.getenv("ODOO_WORKER_INDEX", "0")
+    os.environ["ODOO_WORKER_INDEX"] = f"{parent}.{slots.get()}"
+    # Journal JSONL du worker dans son propre fichier, pas dans celui du processus principal
+    reopen_log_file()
+
+
+def run_contacts_shard(shard):
+    """Créer un lot de contacts dans un processus worker (mode parallèle)"""
+    worker_index, rows, floor_id, test_id = shard
+    # Spans, métriques et journaux du worker attribués au test du processus principal
+    shared_tracer().current_test = test_id
+    test = TestMultipleContactsCreation("test_multiple_contacts_creation")
+    test.start_driver()
+    try:
+        test.oracle = ContactOracle.from_env()
+        test.run_floor_id = floor_id
+        log.info(f"Worker {worker_index}: {len(rows)} contact(s) à créer")
+        if not test.login_to_odoo():
+            log.error(f"Worker {worker_index}: échec de la connexion")
+            return {}, [(i, row.get('name', f'Contact {i + 1}')) for i, row in rows], shared_tracer().export(), [], {}
+
+        created, failed = test.create_contacts_sequential(rows)
+        retried, retry_failed = test.retry_deferred_rows()
+        created.update((i, record_id) for i, _, record_id in retried)
+        failed += retry_failed
+        return created, failed, shared_tracer().export(), shared_perf().export(), test.submitted
+    finally:
+        shared_pool().release(test.driver)
+
 
 class TestMultipleContactsCreation(unittest.TestCase):
     """Test de création multiple de contacts depuis Excel"""
 
-    def setUp(self):
-        # Configuration Chrome
-        options = webdriver.ChromeOptions()
-        options.add_argument("--start-maximized")
-        options.add_argument("--disable-extensions")
-
-        # Initialisation du driver
-        self.service = ChromeService(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=self.service, options=options)
-        self.wait = WebDriverWait(self.driver, 15)
-
-        # Charger les données Excel
-        self.contacts_data = self.load_contacts_from_excel("Contact.xlsx")
-
+    # Mapping de tous les champs incluant le name
+    FIELDS_MAPPING = [
+        ('name', [
+            "input[name='name']",
+            "input[placeholder='e.g. Brandon Freeman']",
+            "input[placeholder*='Brandon Freeman']",
+            "input[id='o_field_input_200']",
+            "input[id='o_field_input_281']",
+            "input.o_input[type='text']"
+        ]),
+        ('phone', ["input[name='phone']"]),
+        ('email', ["input[name='email']"]),
+        ('company', ["input[name='company']"]),
+        ('street', ["input[name='street']"]),
+        ('street2', ["input[name='street2']"]),
+        ('city', ["input[name='city']"]),
+        ('zip', ["input[name='zip']"]),
+        ('mobile', ["input[name='mobile']"]),
+        ('website', ["input[name='website']"])
+    ]
+
+    # Champs à saisir au clavier plutôt qu'en remplissage groupé (autocomplétions many2one)
+    TYPED_FIELDS = ()
 
-
-    def load_contacts_from_excel(self, file_path=None):
-        """Charger les contacts depuis un fichier Excel"""
+    def setUp(self):
+        self.start_driver()
+
+        # Fichier Excel lu en flux, par lots
+        self.contacts_path = self.locate_contacts_file("Contact.xlsx")
+        # Empreinte calculée une fois: clé du cache Parquet pour le comptage et la lecture
+        self.contacts_digest = file_hash(self.contacts_path) if self.contacts_path else None
+        self.chunk_size = int(os.getenv("ODOO_CHUNK_SIZE", "500"))
+        self.rejected = []
+
+        self.oracle = ContactOracle.from_env()
+        # Catégorie test-run:<RUN_ID> posée sur chaque contact créé, pour le nettoyage
+        self.tagger = RunTagger(self.oracle.rpc)
+
+        # Nombre de workers navigateur (1 = exécution séquentielle)
+        self.workers = int(os.getenv("ODOO_WORKERS", "1"))
+
+        # Run incrémental: seules les lignes nouvelles ou modifiées sont recréées (sauf --full)
+        self.run_state = RunState(os.getenv("ODOO_URL"))
+        self.full_run = full_run()
+
+    def start_driver(self):
+        """Obtenir un Chrome du pool pour ce test ou ce worker"""
+        self.driver = shared_pool().acquire()
+        self.wait = AdaptiveWait(self.driver, "element")
+        self.odoo_wait = OdooWait(self.driver, setting("timeout"))
+        self.locators = LocatorResolver(self.driver, self.odoo_wait)
+        self.navigator = AppNavigator(self.driver, self.odoo_wait, os.getenv("ODOO_URL"))
+        # Lignes en échec transitoire (délai, navigateur), rejouées en fin de run
+        self.retry_queue = RetryQueue()
+        self.last_error = None
+        self.last_record_id = None
+        self.last_filled = {}
+        # Colonnes réellement saisies par ligne créée via l'UI: seules celles-ci sont contrôlées en base
+        self.submitted = {}
+        # Ids créés par ce processus, et ids lus dans l'URL avant un échec (sauvegarde peut-être aboutie)
+        self.created_ids = set()
+        self.saved_ids = {}
+        # Plus grand id de contact avant le run: seuls les ids supérieurs ont pu être créés par ce run
+        self.run_floor_id = None
+
+    def locate_contacts_file(self, file_path=None):
+        """Trouver le fichier Excel des contacts"""
         try:
             # Obtenir le chemin absolu du script actuel
             current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -43,132 +141,107 @@ class TestMultipleContactsCreation(unittest.TestCase):
             if file_path is None:
                 file_path = os.path.join(current_dir, 'Contact.xlsx')
 
-            print(f"Recherche du fichier à: {file_path}")
+            log.debug(f"Recherche du fichier à: {file_path}")
 
             # Vérifier si le fichier existe
             if not os.path.exists(file_path):
-                print(f"ERREUR: Fichier non trouvé à l'emplacement: {file_path}")
+                log.warning(f"Fichier non trouvé à l'emplacement: {file_path}")
 
                 # Lister les fichiers dans le dossier tests pour debug
-                print(f"Fichiers dans le dossier tests: {os.listdir(current_dir)}")
+                log.debug(f"Fichiers dans le dossier tests: {os.listdir(current_dir)}")
 
                 # Chercher tous les fichiers Excel
                 excel_files = [f for f in os.listdir(current_dir) if f.lower().endswith(('.xlsx', '.xls'))]
                 if excel_files:
-                    print(f"Fichiers Excel trouvés: {excel_files}")
+                    log.info(f"Fichiers Excel trouvés: {excel_files}")
                     # Utiliser le premier fichier Excel trouvé
                     file_path = os.path.join(current_dir, excel_files[0])
-                    print(f"Utilisation du fichier: {file_path}")
+                    log.info(f"Utilisation du fichier: {file_path}")
                 else:
-                    print("Aucun fichier Excel trouvé. Création d'un exemple...")
-                    return self.create_example_excel()
-
-            # Lecture du fichier Excel
-            df = pd.read_excel(file_path)
-            print(f"Fichier Excel chargé: {len(df)} contacts trouvés")
-            print(f"Colonnes disponibles: {list(df.columns)}")
-
-            # Aperçu des données
-            print("Aperçu des données:")
-            print(df.head())
+                    log.error("Aucun fichier Excel trouvé")
+                    return None
 
-            return df.to_dict('records')
+            log.info(f"Fichier Excel trouvé: {file_path}")
+            return file_path
 
         except Exception as e:
-            print(f"Erreur lecture Excel: {e}")
-            import traceback
-            traceback.print_exc()
-            return []
+            log.exception(f"Erreur lecture Excel: {e}")
+            return None
+
+    def iter_contact_rows(self):
+        """Lots de lignes [(index, données)] lus en flux et validés; les rejets vont dans self.rejected"""
+        known_columns = [field_name for field_name, _ in self.FIELDS_MAPPING]
+        offset = 0
+        for frame in iter_contact_chunks(self.contacts_path, self.chunk_size, self.contacts_digest):
+            rows, rejects, unknown_columns = validate_contacts(frame, known_columns, offset=offset)
+            if offset == 0 and unknown_columns:
+                log.warning(f"Colonnes ignorées (absentes du mapping): {unknown_columns}")
+            for index, name, reasons in rejects:
+                log.warning(f"REJET: ligne {index + 1} ({name}): {', '.join(reasons)}",
+                            extra={"fields": {"row": index, "status": "rejected", "reasons": reasons}})
+            self.rejected.extend((index, name) for index, name, _ in rejects)
+            offset += len(frame)
+            yield rows
+
+    @traced()
     def login_to_odoo(self):
-        """Connexion à Odoo"""
+        """Connexion à Odoo via la session partagée"""
         try:
-            self.driver.get(os.getenv("ODOO_URL") + "/web")
-
-            login_field = self.wait.until(
-                EC.element_to_be_clickable((By.ID, "login"))
-            )
-            login_field.send_keys(os.getenv("ODOO_EMAIL"))
-
-            password_field = self.driver.find_element(By.ID, "password")
-            password_field.send_keys(os.getenv("ODOO_PASSWORD") + Keys.RETURN)
-
-            self.wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, ".o_main_navbar"))
-            )
-            return True
+            logged_in = shared_session().login_driver(self.driver, self.wait)
+            shared_perf().collect(self.driver, "webclient")
+            return logged_in
 
         except Exception as e:
-            print(f"Echec connexion: {e}")
+            log.error(f"Echec connexion: {e}")
             return False
 
+    @traced()
     def access_contact_form(self):
         """Accéder au formulaire de création"""
         try:
-            form_url = f"{os.getenv('ODOO_URL')}/web#cids=1&menu_id=96&action=122&model=res.partner&view_type=form"
-            self.driver.get(form_url)
-
-            self.wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, ".o_form_view"))
-            )
+            # Nouveau formulaire dans le client déjà chargé (rechargement complet seulement au premier contact)
+            self.navigator.open_new_form()
+            shared_perf().collect(self.driver, "form")
             return True
 
         except Exception as e:
-            print(f"Echec accès formulaire: {e}")
+            self.last_error = e
+            log.error(f"Echec accès formulaire: {e}")
             return False
 
+    @traced()
     def fill_contact_form(self, contact_data):
         """Remplir le formulaire avec les données d'un contact"""
         try:
-            # Mapping de tous les champs incluant le name
+            # Champs présents dans la ligne, résolus en un seul passage
             fields_mapping = [
-                ('name', [
-                    "input[name='name']",
-                    "input[placeholder='e.g. Brandon Freeman']",
-                    "input[placeholder*='Brandon Freeman']",
-                    "input[id='o_field_input_200']",
-                    "input[id='o_field_input_281']",
-                    "input.o_input[type='text']"
-                ]),
-                ('phone', ["input[name='phone']"]),
-                ('email', ["input[name='email']"]),
-                ('company', ["input[name='company']"]),
-                ('street', ["input[name='street']"]),
-                ('street2', ["input[name='street2']"]),
-                ('city', ["input[name='city']"]),
-                ('zip', ["input[name='zip']"]),
-                ('mobile', ["input[name='mobile']"]),
-                ('website', ["input[name='website']"])
+                (field_name, selectors) for field_name, selectors in self.FIELDS_MAPPING
+                if contact_data.get(field_name) is not None
             ]
+            elements, missing = self.locators.resolve(fields_mapping)
 
-            # Remplir chaque champ
+            values = {}
             for field_name, selectors in fields_mapping:
-                if field_name in contact_data and pd.notna(contact_data[field_name]):
-                    value = str(contact_data[field_name])
-                    field_filled = False
-
-                    # Essayer chaque sélecteur pour ce champ
-                    for selector in selectors:
-                        try:
-                            element = self.wait.until(
-                                EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                            )
-                            element.clear()
-                            element.send_keys(value)
-                            print(f"✓ {field_name} rempli: {value}")
-                            field_filled = True
-                            time.sleep(0.2)
-                            break
-                        except Exception as e:
-                            continue
-
-                    if not field_filled:
-                        print(f" {field_name} non trouvé avec les sélecteurs: {selectors}")
-
+                if field_name in missing:
+                    log.debug(f"{field_name} non trouvé avec les sélecteurs: {selectors}")
+                    continue
+                values[field_name] = str(contact_data[field_name])
+
+            fill_fields(self.driver, elements, values, self.TYPED_FIELDS)
+            self.last_filled = values
+            for field_name, value in values.items():
+                log.debug(f"✓ {field_name} rempli: {value}")
+
+            # Laisser passer les onchange déclenchés par la saisie
+            self.odoo_wait.until_rpc_idle()
             return True
 
         except Exception as e:
-            print(f"Erreur remplissage: {e}")
+            self.last_error = e
+            log.error(f"Erreur remplissage: {e}")
             return False
+
+    @traced()
     def submit_contact_form(self):
         """Soumettre le formulaire"""
         try:
@@ -177,14 +250,20 @@ class TestMultipleContactsCreation(unittest.TestCase):
             )
             save_button.click()
 
-            # Attendre la création
-            time.sleep(3)
+            # Attendre l'enregistrement effectif du formulaire
+            record_id = self.last_record_id = self.odoo_wait.until_form_saved()
+            shared_perf().collect(self.driver, "form_save")
+            if record_id is None:
+                log.error("Erreur soumission: champs invalides dans le formulaire")
+                return False
             return True
 
         except Exception as e:
-            print(f"Erreur soumission: {e}")
+            self.last_error = e
+            log.error(f"Erreur soumission: {e}")
             return False
 
+    @traced()
     def verify_contact_created(self, contact_name):
         """Vérifier qu'un contact a été créé"""
         try:
@@ -207,100 +286,312 @@ class TestMultipleContactsCreation(unittest.TestCase):
             return False
 
         except Exception as e:
-            print(f"Erreur vérification: {e}")
+            self.last_error = e
+            log.error(f"Erreur vérification: {e}")
             return False
 
+    @traced()
     def get_contacts_count(self):
         """Compter le nombre de contacts dans la base"""
         try:
-            # Aller à la liste des contacts
-            list_url = f"{os.getenv('ODOO_URL')}web#cids=1&menu_id=96&action=122&model=res.partner&view_type=kanban"
-            self.driver.get(list_url)
-            time.sleep(3)
-
-            # Compter les éléments de contact
-            contact_elements = self.driver.find_elements(By.CSS_SELECTOR, ".o_kanban_record")
-            return len(contact_elements)
+            return self.oracle.count()
 
         except Exception as e:
-            print(f"Erreur comptage contacts: {e}")
+            log.error(f"Erreur comptage contacts: {e}")
             return 0
 
+    @traced()
     def create_single_contact(self, contact_data, index):
-        """Créer un seul contact"""
-        print(f"\nCréation du contact {index + 1}: {contact_data.get('name', 'Sans nom')}")
+        """Créer un seul contact; retourne l'id enregistré, ou None en cas d'échec"""
+        log.debug(f"Création du contact {index + 1}: {contact_data.get('name', 'Sans nom')}")
+        self.last_record_id = None
+        self.last_filled = {}
 
         if not self.access_contact_form():
-            return False
+            self.navigator.invalidate()
+            return None
 
         if not self.fill_contact_form(contact_data):
-            return False
+            self.navigator.invalidate()
+            return None
+        self.submitted[index] = {field_name: contact_data[field_name] for field_name in self.last_filled}
 
         if not self.submit_contact_form():
-            return False
+            self.navigator.invalidate()
+            return None
 
         if not self.verify_contact_created(contact_data.get('name', '')):
-            print(f"Échec vérification contact {index + 1}")
-            return False
-
-        print(f"SUCCÈS: Contact {index + 1} créé")
-        return True
+            log.error(f"Échec vérification contact {index + 1}")
+            self.navigator.invalidate()
+            return None
+
+        log.info(f"SUCCÈS: Contact {index + 1} créé",
+                 extra={"fields": {"row": index, "name": contact_data.get('name'), "status": "created",
+                                   "id": self.last_record_id}})
+        self.created_ids.add(self.last_record_id)
+        return self.last_record_id
+
+    def defer_row(self, index, contact_data):
+        """Différer une ligne en échec transitoire, en gardant l'id si la sauvegarde a été vue"""
+        if self.last_record_id:
+            self.saved_ids[index] = self.last_record_id
+        self.retry_queue.defer(index, contact_data)
+
+    def find_saved_contact(self, index, contact_data):
+        """Id du contact déjà enregistré par une tentative en échec de cette ligne, sinon None"""
+        known_id = self.saved_ids.pop(index, None)
+        if self.run_floor_id is None:
+            return known_id
+        return self.oracle.find_created(self.submitted.get(index, contact_data), self.run_floor_id, known_id,
+                                        self.created_ids)
+
+    def checked_rows(self, rows):
+        """Lignes [(index, données, id)] réduites aux colonnes saisies, pour le contrôle en base"""
+        return [(index, self.submitted.get(index, record), partner_id) for index, record, partner_id in rows]
+
+    def create_contacts_sequential(self, rows):
+        """Créer les contacts [(index, données)] un par un; retourne ({index: id} créés, [(index, nom)] échoués)"""
+        created = {}
+        failed = []
+
+        for i, contact_data in rows:
+            self.last_error = None
+            with span("contact_row", row=row_hash(contact_data)):
+                record_id = self.create_single_contact(contact_data, i)
+            if record_id:
+                created[i] = record_id
+            elif is_transient(self.last_error):
+                log.warning(f"Échec transitoire du contact {i + 1}, nouvel essai en fin de run: {self.last_error}",
+                            extra={"fields": {"row": i, "status": "deferred"}})
+                self.defer_row(i, contact_data)
+            else:
+                failed.append((i, contact_data.get('name', f'Contact {i + 1}')))
+
+        return created, failed
+
+    def retry_deferred_rows(self):
+        """Rejouer les lignes en échec transitoire; retourne ([(index, données, id)] créées, [(index, nom)] échouées)"""
+        if not self.retry_queue:
+            return [], []
+        log.info(f"Nouvel essai de {len(self.retry_queue)} contact(s) en échec transitoire")
+
+        def attempt(index, contact_data):
+            self.last_error = None
+            # Pas de doublon si l'enregistrement a abouti côté serveur malgré le délai dépassé
+            existing = self.find_saved_contact(index, contact_data)
+            if existing:
+                log.info(f"Contact {index + 1} déjà enregistré (id {existing}), pas de nouvelle création",
+                         extra={"fields": {"row": index, "status": "created", "id": existing}})
+                self.created_ids.add(existing)
+                return existing, None
+            with span("contact_retry", row=row_hash(contact_data)):
+                record_id = self.create_single_contact(contact_data, index)
+            if not record_id and self.last_record_id:
+                self.saved_ids[index] = self.last_record_id
+            return record_id, self.last_error
+
+        created, failed = self.retry_queue.drain(attempt)
+        return created, [(i, data.get('name', f'Contact {i + 1}')) for i, data in failed]
+
+    def create_contacts_parallel(self, rows, executor, workers):
+        """Répartir les contacts entre les workers, chacun avec son propre navigateur connecté"""
+        # Lots équilibrés d'après les durées passées de chaque ligne, les plus longues d'abord
+        timings = TimingStore()
+        test_id = shared_tracer().current_test
+        shards = [(worker_index, shard, self.run_floor_id, test_id) for worker_index, shard in
+                  enumerate(lpt_shards(rows, workers, lambda row: timings.row_duration(row_hash(row[1]))))]
+        log.info(f"Mode parallèle: {len(rows)} contacts répartis sur {len(shards)} workers")
+
+        created = {}
+        failed = []
+        for shard_created, shard_failed, shard_events, shard_metrics, shard_submitted in executor.map(
+                run_contacts_shard, shards):
+            created.update(shard_created)
+            self.submitted.update(shard_submitted)
+            self.created_ids.update(shard_created.values())
+            failed.extend(shard_failed)
+            shared_tracer().merge(shard_events)
+            shared_perf().merge(shard_metrics)
+
+        return created, failed
+
+    @traced()
+    def create_contacts_rpc(self, rows):
+        """Créer les contacts hors échantillon UI par lots JSON-RPC"""
+        log.info(f"Création par RPC: {len(rows)} contacts")
+        created, failures = BulkContactLoader.from_env(self.tagger.vals()).load(rows)
+        self.created_ids.update(created.values())
+        names = dict((i, data.get('name', f'Contact {i + 1}')) for i, data in rows)
+        return created, [(i, names[i]) for i, _ in failures]
+
+    def skip_unchanged_rows(self, rows):
+        """Écarter les lignes identiques à un run précédent et toujours conformes en base"""
+        if self.full_run or not rows:
+            return rows, 0
+        hashes = {index: row_hash(record) for index, record in rows}
+        known = self.run_state.known(set(hashes.values()))
+        # Ligne créée par l'UI: seules les colonnes saisies à l'époque sont comparées
+        candidates = []
+        for index, record in rows:
+            if hashes[index] in known:
+                partner_id, fields = known[hashes[index]]
+                if fields is not None:
+                    record = {field_name: record[field_name] for field_name in fields if field_name in record}
+                candidates.append((index, record, partner_id))
+        if not candidates:
+            return rows, 0
+
+        # Contrôle groupé par id: une ligne supprimée ou modifiée en base est retraitée
+        with span("reconcile_unchanged_rows"):
+            check = self.oracle.verify(candidates)
+        stale = {index for index, _ in check.missing} | {index for index, *_ in check.mismatched}
+        unchanged = {index for index, _, _ in candidates} - stale
+        return [row for row in rows if row[0] not in unchanged], len(unchanged)
+
+    def remember_verified_rows(self, records, created, report):
+        """Enregistrer dans l'état local les lignes créées et conformes en base"""
+        mismatched = {index for index, *_ in report.mismatched}
+        self.run_state.mark([(row_hash(records[index]), report.found[index], self.submitted.get(index))
+                             for index in created if index in report.found and index not in mismatched])
+
+    def split_ui_sample(self, rows, total):
+        """Séparer l'échantillon créé par l'UI (ODOO_UI_SAMPLE lignes sur `total`) du reste créé par RPC"""
+        sample_size = int(os.getenv("ODOO_UI_SAMPLE", "0"))
+        if sample_size <= 0 or sample_size >= total:
+            return rows, []
+        step = total / sample_size
+        sampled = {int(k * step) for k in range(sample_size)}
+        ui_rows = [row for row in rows if row[0] in sampled]
+        rpc_rows = [row for row in rows if row[0] not in sampled]
+        return ui_rows, rpc_rows
 
     def test_multiple_contacts_creation(self):
         """Test de création multiple de contacts"""
-        if not self.contacts_data:
+        total = count_rows(self.contacts_path, self.contacts_digest) if self.contacts_path else 0
+        if not total:
             self.skipTest("Aucune donnée Excel chargée")
+        log.info(f"Fichier Excel: {total} contacts trouvés", extra=SUMMARY)
 
         if not self.login_to_odoo():
             self.fail("Échec de la connexion")
 
         # Nombre initial de contacts
         initial_count = self.get_contacts_count()
-        print(f"Nombre initial de contacts: {initial_count}")
-
-        # Créer chaque contact
+        log.info(f"Nombre initial de contacts: {initial_count}", extra=SUMMARY)
+        self.run_floor_id = self.oracle.last_id()
+
+        executor = None
+        if self.workers > 1:
+            context = multiprocessing.get_context("spawn")
+            slots = context.Queue()
+            for worker_index in range(1, self.workers + 1):
+                slots.put(worker_index)
+            executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                           initializer=init_worker, initargs=(slots,))
+
+        # Créer les contacts lot par lot, au fil de la lecture du fichier
+        contacts_count = 0
+        unchanged_count = 0
         success_count = 0
-        failed_contacts = []
-
-        for i, contact_data in enumerate(self.contacts_data):
-            success = self.create_single_contact(contact_data, i)
-            if success:
-                success_count += 1
-            else:
-                failed_contacts.append(contact_data.get('name', f'Contact {i + 1}'))
+        failed = []
+        report = OracleReport()
+        try:
+            for rows in self.iter_contact_rows():
+                rows, unchanged = self.skip_unchanged_rows(rows)
+                unchanged_count += unchanged
+                contacts_count += len(rows) + len(self.rejected)
+                failed += self.rejected
+                self.rejected = []
+
+                # Échantillon par l'UI, reste par RPC
+                ui_rows, rpc_rows = self.split_ui_sample(rows, total)
+                if executor and len(ui_rows) > 1:
+                    created, chunk_failed = self.create_contacts_parallel(ui_rows, executor, self.workers)
+                else:
+                    created, chunk_failed = self.create_contacts_sequential(ui_rows)
+                ui_created = dict(created)
+
+                if rpc_rows:
+                    rpc_created, rpc_failed = self.create_contacts_rpc(rpc_rows)
+                    created.update(rpc_created)
+                    chunk_failed += rpc_failed
+
+                success_count += len(created)
+                failed += chunk_failed
+
+                # Contrôle serveur, par id, de chaque ligne créée dans ce lot
+                records = dict(rows)
+                checked = self.checked_rows([(i, records[i], created[i]) for i in sorted(created)])
+                with span("verify_contacts_batch"):
+                    self.oracle.verify(checked, report)
+                self.remember_verified_rows(records, created, report)
+                self.tagger.tag(report.found[i] for i in ui_created if i in report.found)
+
+            # Lignes en échec transitoire, rejouées une fois toutes les autres traitées
+            retried, retry_failed = self.retry_deferred_rows()
+            if retried or retry_failed:
+                success_count += len(retried)
+                failed += retry_failed
+                records = {i: data for i, data, _ in retried}
+                with span("verify_contacts_batch"):
+                    self.oracle.verify(self.checked_rows(retried), report)
+                self.remember_verified_rows(records, list(records), report)
+                self.tagger.tag(report.found[i] for i in records if i in report.found)
+        finally:
+            if executor:
+                executor.shutdown()
+
+        failed_contacts = [name for _, name in sorted(failed)]
+        log.info(report.summary(), extra=SUMMARY)
 
         # Vérification finale
         final_count = self.get_contacts_count()
         expected_count = initial_count + success_count
 
-        print(f"\n" + "=" * 50)
-        print("RÉCAPITULATIF DE CRÉATION")
-        print("=" * 50)
-        print(f"Contacts à créer: {len(self.contacts_data)}")
-        print(f"Contacts créés avec succès: {success_count}")
-        print(f"Contacts échoués: {len(failed_contacts)}")
-        print(f"Contacts attendus en base: {expected_count}")
-        print(f"Contacts actuels en base: {final_count}")
-
+        lines = ["=" * 50, "RÉCAPITULATIF DE CRÉATION", "=" * 50]
+        if not self.full_run:
+            lines.append(f"Contacts inchangés depuis le dernier run (non recréés): {unchanged_count}")
+        lines += [
+            f"Contacts à créer: {contacts_count}",
+            f"Contacts créés avec succès: {success_count}",
+            f"Contacts échoués: {len(failed_contacts)}",
+            f"Contacts attendus en base: {expected_count}",
+            f"Contacts actuels en base: {final_count}",
+        ]
         if failed_contacts:
-            print(f"Contacts échoués: {', '.join(failed_contacts)}")
+            # Liste complète dans le journal JSONL, extrait seulement dans le rapport JUnit
+            log.info("Contacts échoués", extra={"fields": {"failed": failed_contacts}})
+            shown = ", ".join(failed_contacts[:20])
+            more = f" (+{len(failed_contacts) - 20})" if len(failed_contacts) > 20 else ""
+            lines.append(f"Contacts échoués: {shown}{more}")
+        log.info("\n".join(lines), extra=SUMMARY)
 
         # Vérifications unitaires
-        self.assertEqual(success_count, len(self.contacts_data) - len(failed_contacts),
+        self.assertEqual(success_count, contacts_count - len(failed_contacts),
                          "Incohérence dans le nombre de contacts créés")
 
         self.assertEqual(final_count, expected_count,
                          f"Incohérence dans la base: attendu {expected_count}, trouvé {final_count}")
 
-        if success_count == len(self.contacts_data):
-            print("SUCCÈS: Tous les contacts créés avec succès")
+        self.assertTrue(report.ok, f"Contacts absents ou divergents en base:\n{report.summary()}")
+
+        perf_problems = shared_perf().report(shared_tracer().current_test)
+        if setting("perf_fail_on_threshold"):
+            self.assertFalse(perf_problems, f"Seuils de performance dépassés: {perf_problems}")
+
+        if success_count == contacts_count:
+            log.info("SUCCÈS: Tous les contacts créés avec succès", extra=SUMMARY)
         else:
             self.fail(f"ÉCHEC: {len(failed_contacts)} contact(s) non créé(s)")
 
     def tearDown(self):
-        self.driver.quit()
+        if test_failed(self):
+            capture_step(self.driver, "final_error_state")
+        finish_test(self, self.driver)
+        shared_pool().release(self.driver)
+        self.run_state.close()
 
 
 if __name__ == "__main__":
-    import xmlrunner
-    unittest.main(testRunner=xmlrunner.XMLTestRunner(output='reports'))
\ No newline at end of file
+    from harness.runner import main
+    main()
\ No newline at end of file
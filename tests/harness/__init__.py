@@ -0,0 +1 @@
+"""Outils partagés par les tests Selenium du module Contacts Odoo"""
@@ -0,0 +1,154 @@
+"""Benchmark du flux de création de contacts contre le serveur Odoo de substitution
+
+Usage (depuis le dossier tests/):
+    python -m harness.bench --rows 10,100,1000 [--latency 0.02] [--save-baseline]
+
+Références: une mesure par (profil navigateur, latence, nombre de lignes) dans benchmarks/baselines.json,
+à enregistrer sur la machine qui compare (mêmes Chrome et CPU) avec --save-baseline puis à committer.
+Sans référence pour une mesure demandée, le benchmark échoue (--allow-missing-baseline pour seulement l'afficher).
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from harness.browser import profile_name
+from harness.standin import StandInOdoo
+from harness.stats import percentile
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks",
+                             "baselines.json")
+STEPS = ("access_contact_form", "fill_contact_form", "submit_contact_form", "verify_contact_created",
+         "create_single_contact")
+
+
+def generate_rows(count):
+    """Contacts synthétiques"""
+    return [(i, {
+        "name": f"Bench Contact {i}",
+        "phone": f"2165{i:07d}",
+        "email": f"bench{i}@example.com",
+        "street": f"{i} Main St",
+        "city": "Tunis",
+        "zip": "1000",
+    }) for i in range(count)]
+
+
+def run_flow(rows_count):
+    """Créer `rows_count` contacts par l'UI et retourner les mesures"""
+    from TestMultipleContactsCreation import TestMultipleContactsCreation
+    from harness.drivers import shared_pool
+    from harness.oracle import ContactOracle
+    from harness.tracing import shared_tracer
+
+    tracer = shared_tracer()
+    test = TestMultipleContactsCreation("test_multiple_contacts_creation")
+    test.start_driver()
+    try:
+        if not test.login_to_odoo():
+            raise RuntimeError("Connexion au serveur de substitution impossible")
+        test.oracle = ContactOracle.from_env()
+        test.run_floor_id = test.oracle.last_id()
+        tracer.export()
+
+        started = time.perf_counter()
+        created, failed = test.create_contacts_sequential(generate_rows(rows_count))
+        retried, retry_failed = test.retry_deferred_rows()
+        created.update((i, record_id) for i, _, record_id in retried)
+        failed += retry_failed
+        elapsed = time.perf_counter() - started
+    finally:
+        shared_pool().release(test.driver)
+
+    events = tracer.export()
+    steps = {}
+    for step in STEPS:
+        durations = [e["dur"] / 1e6 for e in events if e["name"] == step]
+        steps[step] = {"p50_s": round(percentile(durations, 50), 4), "p95_s": round(percentile(durations, 95), 4)}
+    return {
+        "profile": profile_name(),
+        "rows": rows_count,
+        "created": len(created),
+        "failed": len(failed),
+        "elapsed_s": round(elapsed, 3),
+        "rows_per_s": round(len(created) / elapsed, 3) if elapsed else 0.0,
+        "webdriver_commands": sum(e["args"]["commands"] for e in events),
+        "steps": steps,
+    }
+
+
+def regressions(result, baseline, threshold):
+    """Écarts au-delà du seuil relatif par rapport à la référence"""
+    problems = []
+    if result["rows_per_s"] < baseline["rows_per_s"] * (1 - threshold):
+        problems.append(f"rows/s {result['rows_per_s']} < référence {baseline['rows_per_s']}")
+    if result["webdriver_commands"] > baseline["webdriver_commands"] * (1 + threshold):
+        problems.append(f"commandes {result['webdriver_commands']} > référence {baseline['webdriver_commands']}")
+    for step, stats in result["steps"].items():
+        reference = baseline["steps"].get(step, {}).get("p95_s")
+        if reference and stats["p95_s"] > reference * (1 + threshold):
+            problems.append(f"{step} p95 {stats['p95_s']}s > référence {reference}s")
+    return problems
+
+
+def print_result(result):
+    print(f"\n{result['rows']} lignes (profil {result['profile']}): {result['rows_per_s']} lignes/s, "
+          f"{result['elapsed_s']}s, {result['webdriver_commands']} commandes WebDriver, {result['failed']} échec(s)")
+    for step, stats in result["steps"].items():
+        print(f"  {step:<24} p50 {stats['p50_s']:.4f}s  p95 {stats['p95_s']:.4f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du harnais contre un Odoo local de substitution")
+    parser.add_argument("--rows", default="10,100,1000", help="tailles à mesurer, séparées par des virgules")
+    parser.add_argument("--latency", type=float, default=0.0, help="latence du serveur par requête (s)")
+    parser.add_argument("--threshold", type=float, default=0.2, help="régression tolérée (fraction)")
+    parser.add_argument("--save-baseline", action="store_true", help="enregistrer les résultats comme référence")
+    parser.add_argument("--allow-missing-baseline", action="store_true",
+                        help="ne pas échouer quand une mesure n'a pas de référence")
+    args = parser.parse_args()
+
+    standin = StandInOdoo(latency=args.latency).start()
+    os.environ.update({"ODOO_URL": standin.url, "ODOO_EMAIL": standin.email, "ODOO_PASSWORD": standin.password})
+
+    try:
+        with open(BASELINE_FILE, encoding="utf-8") as f:
+            baselines = json.load(f)
+    except (OSError, ValueError):
+        baselines = {}
+
+    # Références séparées par profil navigateur (ODOO_BROWSER_PROFILE / config.browser_profile)
+    key_prefix = f"profile={profile_name()}/latency={args.latency}"
+    failures = []
+    try:
+        for rows_count in [int(n) for n in args.rows.split(",")]:
+            result = run_flow(rows_count)
+            print_result(result)
+            key = f"{key_prefix}/rows={rows_count}"
+            if args.save_baseline:
+                baselines[key] = result
+            elif key in baselines:
+                for problem in regressions(result, baselines[key], args.threshold):
+                    print(f"  RÉGRESSION: {problem}")
+                    failures.append(problem)
+            else:
+                # Sans référence, aucune régression ne peut être détectée: le dire plutôt que réussir
+                print(f"  AUCUNE RÉFÉRENCE pour {key} dans {BASELINE_FILE} "
+                      f"(enregistrer avec: python -m harness.bench --rows {rows_count} --latency {args.latency} "
+                      f"--save-baseline)")
+                if not args.allow_missing_baseline:
+                    failures.append(f"référence manquante: {key}")
+    finally:
+        standin.stop()
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(BASELINE_FILE), exist_ok=True)
+        with open(BASELINE_FILE, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        print(f"\nRéférences enregistrées dans {BASELINE_FILE}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
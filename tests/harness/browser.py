@@ -0,0 +1,79 @@
+"""Fabrique de navigateurs Chrome allégés, pilotée par config.py"""
+import os
+
+from selenium import webdriver
+
+from harness import perf
+from harness.settings import setting
+
+DISABLE_ANIMATIONS_JS = r"""
+(function () {
+  var css = '*, *::before, *::after { transition: none !important; animation: none !important;'
+    + ' scroll-behavior: auto !important; }';
+  var install = function () {
+    var style = document.createElement('style');
+    style.textContent = css;
+    (document.head || document.documentElement).appendChild(style);
+  };
+  if (document.documentElement) { install(); } else { document.addEventListener('DOMContentLoaded', install); }
+})();
+"""
+
+
+def profile_name():
+    """Profil navigateur courant (ODOO_BROWSER_PROFILE ou config.browser_profile)"""
+    return os.getenv("ODOO_BROWSER_PROFILE", setting("browser_profile", "default"))
+
+
+def browser_profile(name=None):
+    """Réglages du profil, complétés par les valeurs globales de config.py"""
+    name = name or profile_name()
+    profile = {"headless": setting("headless", False)}
+    profile.update(setting("browser_profiles", {}).get(name, {}))
+    profile["name"] = name
+    return profile
+
+
+def profile_dir(name, slot):
+    """Dossier de profil Chrome persistant (cache disque des bundles Odoo) pour un emplacement, ou None"""
+    root = setting("profile_dir")
+    if not root:
+        return None
+    worker = os.getenv("ODOO_WORKER_INDEX", "0")
+    path = os.path.join(os.path.expanduser(root), f"{name}-w{worker}-{slot}")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def build_options(name=None, user_data_dir=None):
+    """Options Chrome du profil"""
+    profile = browser_profile(name)
+    options = webdriver.ChromeOptions()
+    options.add_argument("--disable-extensions")
+    if user_data_dir:
+        options.add_argument(f"--user-data-dir={user_data_dir}")
+    options.set_capability("goog:loggingPrefs", {"browser": "ALL"})
+
+    if profile["headless"]:
+        options.add_argument("--headless=new")
+    if profile.get("window_size"):
+        width, height = profile["window_size"]
+        options.add_argument(f"--window-size={width},{height}")
+    else:
+        options.add_argument("--start-maximized")
+    if profile.get("block_resources"):
+        options.add_argument("--blink-settings=imagesEnabled=false")
+    return options
+
+
+def prepare_driver(driver, name=None):
+    """Réglages CDP du profil: blocage de requêtes et animations désactivées"""
+    profile = browser_profile(name)
+    if profile.get("block_resources"):
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": setting("blocked_url_patterns", [])})
+    if profile.get("disable_animations"):
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": DISABLE_ANIMATIONS_JS})
+    perf.install(driver)
+    driver.profile_name = profile["name"]
+    return driver
@@ -0,0 +1,132 @@
+"""Création en masse de res.partner par appels `create` groupés via JSON-RPC
+
+Usage (depuis le dossier tests/): python -m harness.bulk_loader Contact.xlsx
+"""
+import argparse
+import itertools
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from harness.logs import get_logger
+from harness.rpc import OdooRPC
+
+log = get_logger("bulk_loader")
+
+# Colonne Excel -> champ res.partner
+PARTNER_FIELDS = {
+    "name": "name",
+    "phone": "phone",
+    "email": "email",
+    "company": "company_name",
+    "street": "street",
+    "street2": "street2",
+    "city": "city",
+    "zip": "zip",
+    "mobile": "mobile",
+    "website": "website",
+}
+
+
+def to_partner_vals(record):
+    """Valeurs res.partner d'une ligne Excel, sans les cellules vides"""
+    vals = {}
+    for column, field_name in PARTNER_FIELDS.items():
+        value = record.get(column)
+        if value is None or value != value or value == "":
+            continue
+        vals[field_name] = str(value)
+    return vals
+
+
+class BulkContactLoader:
+    """Crée des contacts par lots, avec plusieurs lots en vol en parallèle"""
+
+    def __init__(self, rpc, batch_size=200, concurrency=4, extra_vals=None):
+        self.rpc = rpc
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        # Valeurs ajoutées à chaque contact (ex. catégorie du run)
+        self.extra_vals = extra_vals or {}
+
+    @classmethod
+    def from_env(cls, extra_vals=None):
+        """Loader configuré par ODOO_RPC_BATCH_SIZE / ODOO_RPC_CONCURRENCY"""
+        return cls(OdooRPC.from_env(),
+                   batch_size=int(os.getenv("ODOO_RPC_BATCH_SIZE", "200")),
+                   concurrency=int(os.getenv("ODOO_RPC_CONCURRENCY", "4")),
+                   extra_vals=extra_vals)
+
+    def _create_batch(self, batch):
+        ids = self.rpc.call_kw("res.partner", "create",
+                               [[{**to_partner_vals(row), **self.extra_vals} for _, row in batch]])
+        return ids if isinstance(ids, list) else [ids]
+
+    def load(self, rows):
+        """Créer les lignes [(index, record)]; retourne ({index: id}, [(index, erreur)])"""
+        created = {}
+        failures = []
+        rows = iter(rows)
+        in_flight = {}
+
+        def collect(done):
+            for future in done:
+                batch = in_flight.pop(future)
+                try:
+                    ids = future.result()
+                except Exception as e:
+                    log.error(f"Erreur création lot ({len(batch)} contacts): {e}")
+                    failures.extend((index, str(e)) for index, _ in batch)
+                    continue
+                created.update((index, partner_id) for (index, _), partner_id in zip(batch, ids))
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            while True:
+                batch = list(itertools.islice(rows, self.batch_size))
+                if not batch:
+                    break
+                in_flight[executor.submit(self._create_batch, batch)] = batch
+                # Borner la mémoire: pas plus de 2 lots en attente par worker
+                if len(in_flight) >= self.concurrency * 2:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    collect(done)
+            collect(list(in_flight))
+
+        return created, failures
+
+
+def main():
+    from harness.cleanup import RunTagger
+    from harness.logs import SUMMARY
+    from harness.run import RUN_ID
+    from harness.spreadsheet import iter_contact_chunks
+    from harness.validation import validate_contacts
+
+    parser = argparse.ArgumentParser(description="Charger des contacts Excel dans Odoo via JSON-RPC")
+    parser.add_argument("file")
+    parser.add_argument("--chunk-size", type=int, default=500, help="lignes lues et validées par lot")
+    args = parser.parse_args()
+
+    rejected = []
+
+    def valid_rows():
+        # Lecture en flux et validation par lot: le loader consomme les lignes au fil de l'eau
+        offset = 0
+        for frame in iter_contact_chunks(args.file, args.chunk_size):
+            rows, rejects, _ = validate_contacts(frame, list(PARTNER_FIELDS), offset=offset)
+            for index, name, reasons in rejects:
+                log.warning(f"REJET: ligne {index + 1} ({name}): {', '.join(reasons)}",
+                            extra={"fields": {"row": index, "status": "rejected", "reasons": reasons}})
+            rejected.extend(rejects)
+            offset += len(frame)
+            yield from rows
+
+    loader = BulkContactLoader.from_env()
+    # Catégorie test-run:<RUN_ID> sur chaque contact, pour la suppression par harness.cleanup
+    loader.extra_vals = RunTagger(loader.rpc).vals()
+    created, failures = loader.load(valid_rows())
+    log.info(f"Contacts créés: {len(created)}, échecs: {len(failures)}, rejetés: {len(rejected)} "
+             f"(catégorie test-run:{RUN_ID})", extra=SUMMARY)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Étiquetage des contacts créés par un run (catégorie test-run:<RUN_ID>) et suppression groupée
+
+Usage (depuis le dossier tests/):
+    python -m harness.cleanup --run-id 20250918_150229
+    python -m harness.cleanup --all
+"""
+import argparse
+import os
+
+from harness.rpc import OdooRPC
+from harness.run import RUN_ID
+from harness.run_state import RunState
+
+TAG_PREFIX = "test-run:"
+UNLINK_CHUNK = 500
+
+
+class RunTagger:
+    """Catégorie res.partner du run, créée à la première utilisation"""
+
+    def __init__(self, rpc, run_id=RUN_ID):
+        self.rpc = rpc
+        self.name = f"{TAG_PREFIX}{run_id}"
+        self._tag_id = None
+
+    @classmethod
+    def from_env(cls):
+        return cls(OdooRPC.from_env())
+
+    @property
+    def tag_id(self):
+        if self._tag_id is None:
+            ids = self.rpc.call_kw("res.partner.category", "search", [[("name", "=", self.name)]], {"limit": 1})
+            self._tag_id = ids[0] if ids else self.rpc.call_kw("res.partner.category", "create", [{"name": self.name}])
+        return self._tag_id
+
+    def vals(self):
+        """Valeurs à ajouter aux `create` RPC pour étiqueter les contacts"""
+        return {"category_id": [(4, self.tag_id)]}
+
+    def tag(self, partner_ids):
+        """Étiqueter des contacts déjà créés (par l'UI), un `write` par lot"""
+        partner_ids = sorted(set(partner_ids))
+        for start in range(0, len(partner_ids), UNLINK_CHUNK):
+            self.rpc.call_kw("res.partner", "write", [partner_ids[start:start + UNLINK_CHUNK], self.vals()])
+
+
+def run_categories(rpc, run_id=None):
+    """Ids des catégories du run `run_id` (de tous les runs si None)"""
+    domain = [("name", "=", f"{TAG_PREFIX}{run_id}")] if run_id else [("name", "=like", f"{TAG_PREFIX}%")]
+    return rpc.call_kw("res.partner.category", "search", [domain])
+
+
+def cleanup(rpc, run_id=None, chunk_size=UNLINK_CHUNK):
+    """Supprimer les contacts étiquetés (un `unlink` par lot) puis leurs catégories; retourne le nombre supprimé"""
+    category_ids = run_categories(rpc, run_id)
+    if not category_ids:
+        return 0
+    partner_ids = rpc.call_kw("res.partner", "search", [[("category_id", "in", category_ids)]],
+                              {"context": {"active_test": False}})
+    for start in range(0, len(partner_ids), chunk_size):
+        rpc.call_kw("res.partner", "unlink", [partner_ids[start:start + chunk_size]])
+    rpc.call_kw("res.partner.category", "unlink", [category_ids])
+
+    # Les lignes supprimées devront être recréées au prochain run incrémental
+    state = RunState(rpc.base_url)
+    try:
+        state.forget(partner_ids)
+    finally:
+        state.close()
+    return len(partner_ids)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Supprimer les contacts créés par les runs de test")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--run-id", help="identifiant du run (ODOO_RUN_ID)")
+    target.add_argument("--all", action="store_true", help="tous les runs étiquetés test-run:*")
+    args = parser.parse_args()
+
+    removed = cleanup(OdooRPC.from_env(), None if args.all else args.run_id)
+    print(f"{removed} contact(s) supprimé(s) sur {os.getenv('ODOO_URL')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""Pool de navigateurs Chrome gardés chauds et réinitialisés entre les tests"""
+import atexit
+import json
+import os
+import re
+import subprocess
+import sys
+from urllib.parse import urlparse
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.service import Service as ChromeService
+
+from harness.browser import build_options, prepare_driver, profile_dir, profile_name
+from harness.logs import get_logger
+from harness.settings import setting
+from harness.timeouts import shared_timeouts
+from harness.tracing import shared_tracer
+
+log = get_logger("drivers")
+
+DRIVER_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "odoo_contact", "chromedriver.json")
+
+_VERSION_RE = re.compile(r"(\d+)\.\d+\.\d+\.\d+")
+
+
+def chrome_version():
+    """Version de Chrome installée, sans accès réseau (None si introuvable)"""
+    if sys.platform.startswith("win"):
+        commands = [["reg", "query", r"HKEY_CURRENT_USER\Software\Google\Chrome\BLBeacon", "/v", "version"]]
+    elif sys.platform == "darwin":
+        commands = [["/Applications/Google Chrome.app/Contents/MacOS/Google Chrome", "--version"]]
+    else:
+        commands = [[name, "--version"] for name in
+                    ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser")]
+
+    for command in commands:
+        try:
+            output = subprocess.run(command, capture_output=True, text=True, timeout=10).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+        match = _VERSION_RE.search(output)
+        if match:
+            return match.group(0)
+    return None
+
+
+def _read_driver_cache():
+    try:
+        with open(DRIVER_CACHE_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def resolve_chromedriver():
+    """Chemin du chromedriver pour la version majeure de Chrome, mis en cache pour fonctionner hors ligne"""
+    version = chrome_version()
+    major = version.split(".")[0] if version else "unknown"
+    cache = _read_driver_cache()
+
+    path = cache.get(major)
+    if path and os.path.exists(path):
+        return path
+
+    try:
+        from webdriver_manager.chrome import ChromeDriverManager
+        path = ChromeDriverManager().install()
+    except Exception as e:
+        log.warning(f"Résolution chromedriver impossible ({e}), utilisation de Selenium Manager")
+        return None
+
+    cache[major] = path
+    os.makedirs(os.path.dirname(DRIVER_CACHE_FILE), exist_ok=True)
+    with open(DRIVER_CACHE_FILE, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=2)
+    return path
+
+
+def reset_driver(driver):
+    """Remettre un navigateur à zéro: onglets, cookies et stockage"""
+    handles = driver.window_handles
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(handles[0])
+
+    origin = urlparse(driver.current_url)
+    if origin.scheme in ("http", "https"):
+        driver.execute_cdp_cmd("Storage.clearDataForOrigin", {
+            "origin": f"{origin.scheme}://{origin.netloc}",
+            "storageTypes": "local_storage,session_storage,indexeddb,websql,service_workers,cache_storage",
+        })
+    driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    driver.get("about:blank")
+
+
+class DriverPool:
+    """Navigateurs chauds du processus, réutilisés au lieu d'être relancés à chaque test"""
+
+    def __init__(self, max_idle=4):
+        self.max_idle = max_idle
+        self.idle = {}
+        # Dossiers de profil persistants occupés par un navigateur vivant (un Chrome par dossier)
+        self.profile_dirs = set()
+        self._driver_path = None
+        atexit.register(self.close_all)
+
+    def _new_driver(self, profile):
+        if self._driver_path is None:
+            self._driver_path = resolve_chromedriver() or ""
+        service = ChromeService(self._driver_path) if self._driver_path else ChromeService()
+        slot = next(i for i in range(len(self.profile_dirs) + 1) if (profile, i) not in self.profile_dirs)
+        user_data_dir = profile_dir(profile, slot)
+        driver = webdriver.Chrome(service=service, options=build_options(profile, user_data_dir))
+        if user_data_dir:
+            self.profile_dirs.add((profile, slot))
+        driver.profile_slot = (profile, slot)
+        log.info(f"Nouveau navigateur (profil {profile})")
+        shared_tracer().instrument(driver)
+        return prepare_driver(driver, profile)
+
+    def acquire(self, profile=None):
+        """Obtenir un navigateur prêt pour le profil de config.py, réutilisé si possible"""
+        profile = profile or profile_name()
+        idle = self.idle.get(profile, [])
+        driver = None
+        while idle and driver is None:
+            driver = idle.pop()
+            try:
+                driver.current_url
+            except WebDriverException:
+                self._quit(driver)
+                driver = None
+        driver = driver or self._new_driver(profile)
+        # Délai de chargement de page d'après les chargements observés lors des runs précédents
+        driver.set_page_load_timeout(shared_timeouts().timeout("page_load", setting("page_load_timeout", 30)))
+        return driver
+
+    def release(self, driver):
+        """Rendre un navigateur au pool après l'avoir réinitialisé"""
+        try:
+            reset_driver(driver)
+        except WebDriverException as e:
+            log.warning(f"Navigateur inutilisable, fermeture: {e}")
+            self._quit(driver)
+            return
+
+        idle = self.idle.setdefault(driver.profile_name, [])
+        if len(idle) < self.max_idle:
+            idle.append(driver)
+        else:
+            self._quit(driver)
+
+    def _quit(self, driver):
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+        self.profile_dirs.discard(getattr(driver, "profile_slot", None))
+
+    def close_all(self):
+        """Fermer tous les navigateurs en attente"""
+        for drivers in self.idle.values():
+            for driver in drivers:
+                self._quit(driver)
+        self.idle.clear()
+
+
+_shared = None
+
+
+def shared_pool():
+    """Pool de navigateurs du processus"""
+    global _shared
+    if _shared is None:
+        _shared = DriverPool()
+    return _shared
@@ -0,0 +1,41 @@
+"""Remplissage groupé des champs d'un formulaire Odoo en un seul appel navigateur"""
+import os
+
+# Pose chaque valeur via le setter natif puis émet les événements écoutés par les widgets OWL
+FILL_JS = r"""
+arguments[0].forEach(function (entry) {
+  var el = entry[0];
+  var value = entry[1];
+  el.focus();
+  if (el.isContentEditable) {
+    el.textContent = value;
+  } else {
+    var proto = el instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype
+      : el instanceof HTMLSelectElement ? HTMLSelectElement.prototype : HTMLInputElement.prototype;
+    Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, value);
+  }
+  el.dispatchEvent(new Event('input', {bubbles: true}));
+  el.dispatchEvent(new Event('change', {bubbles: true}));
+  el.blur();
+});
+"""
+
+
+def fill_mode():
+    """Mode de remplissage: 'bulk' (un seul appel JS) ou 'keys' (frappe clavier)"""
+    return os.getenv("ODOO_FILL_MODE", "bulk")
+
+
+def fill_fields(driver, elements, values, typed_fields=()):
+    """Remplir {champ: valeur}; les champs de `typed_fields` restent saisis au clavier (ex: many2one)"""
+    if fill_mode() == "keys":
+        typed_fields = set(values)
+
+    bulk = [[elements[name], value] for name, value in values.items() if name not in typed_fields]
+    if bulk:
+        driver.execute_script(FILL_JS, bulk)
+
+    for name in typed_fields:
+        if name in values:
+            elements[name].clear()
+            elements[name].send_keys(values[name])
@@ -0,0 +1,192 @@
+"""Génération de charge: utilisateurs virtuels HTTP (asyncio) qui se connectent puis créent et relisent des contacts
+
+Usage (depuis le dossier tests/):
+    python -m harness.loadgen --users 200 --ramp-up 30 --duration 120 --think-time 1 [--data Contact.xlsx] [--standin]
+
+Nécessite aiohttp.
+"""
+import argparse
+import asyncio
+import bisect
+import itertools
+import os
+import random
+import time
+
+from harness.bulk_loader import to_partner_vals
+from harness.cleanup import RunTagger
+from harness.rpc import OdooRPC
+from harness.run import RUN_ID
+from harness.session import _CSRF_RE, odoo_url, http_login as sync_http_login
+from harness.stats import percentile
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# Bornes (ms) des classes de l'histogramme de latence
+HISTOGRAM_BOUNDS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+
+class LoadStats:
+    """Latences, erreurs et histogramme par opération"""
+
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+        self.started = time.monotonic()
+
+    def record(self, operation, seconds, ok=True):
+        self.latencies.setdefault(operation, []).append(seconds * 1000)
+        if not ok:
+            self.errors[operation] = self.errors.get(operation, 0) + 1
+
+    def histogram(self, operation):
+        counts = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+        for value in self.latencies.get(operation, []):
+            counts[bisect.bisect_left(HISTOGRAM_BOUNDS, value)] += 1
+        return counts
+
+    def report(self, duration):
+        total = sum(len(v) for v in self.latencies.values())
+        errors = sum(self.errors.values())
+        print(f"\nDébit: {total / duration:.1f} req/s sur {duration:.0f}s, "
+              f"taux d'erreur: {100.0 * errors / total if total else 0:.2f}% ({errors}/{total})")
+        labels = [f"<{b}ms" for b in HISTOGRAM_BOUNDS] + [f">={HISTOGRAM_BOUNDS[-1]}ms"]
+        for operation, values in sorted(self.latencies.items()):
+            print(f"  {operation:<8} n={len(values):<7} erreurs={self.errors.get(operation, 0):<5} "
+                  f"p50={percentile(values, 50):.0f}ms p95={percentile(values, 95):.0f}ms "
+                  f"p99={percentile(values, 99):.0f}ms")
+            print("           " + "  ".join(f"{label}:{count}" for label, count
+                                            in zip(labels, self.histogram(operation)) if count))
+
+
+async def _timed(stats, operation, coroutine):
+    start = time.monotonic()
+    try:
+        result = await coroutine
+    except Exception:
+        stats.record(operation, time.monotonic() - start, ok=False)
+        return None
+    stats.record(operation, time.monotonic() - start)
+    return result
+
+
+async def http_login(session, base_url, email, password):
+    """Connexion par le formulaire /web/login; lève une erreur si refusée"""
+    async with session.get(odoo_url(base_url, "web/login")) as response:
+        match = _CSRF_RE.search(await response.text())
+    if not match:
+        raise RuntimeError("csrf_token introuvable")
+    data = {"login": email, "password": password, "csrf_token": match.group(1), "redirect": ""}
+    async with session.post(odoo_url(base_url, "web/login"), data=data) as response:
+        await response.read()
+        if "/web/login" in str(response.url):
+            raise RuntimeError("connexion refusée")
+    return True
+
+
+async def call_kw(session, base_url, model, method, args, kwargs=None):
+    """Appel JSON-RPC call_kw; lève une erreur sur réponse en erreur"""
+    payload = {"jsonrpc": "2.0", "method": "call",
+               "params": {"model": model, "method": method, "args": args, "kwargs": kwargs or {}}}
+    async with session.post(odoo_url(base_url, f"web/dataset/call_kw/{model}/{method}"), json=payload) as response:
+        data = await response.json(content_type=None)
+    if "error" in data:
+        raise RuntimeError(data["error"].get("message"))
+    return data["result"]
+
+
+async def virtual_user(config, payloads, stats, start_delay, stop_at):
+    """Un utilisateur: connexion, puis boucle création + relecture avec temps de réflexion"""
+    await asyncio.sleep(start_delay)
+    async with aiohttp.ClientSession(cookie_jar=aiohttp.CookieJar(unsafe=True)) as session:
+        if await _timed(stats, "login", http_login(session, config["base_url"], config["email"],
+                                                   config["password"])) is None:
+            return
+        while time.monotonic() < stop_at:
+            vals = to_partner_vals(next(payloads))
+            # Catégorie du run sur chaque contact, pour la suppression par harness.cleanup
+            partner_id = await _timed(stats, "create", call_kw(session, config["base_url"], "res.partner",
+                                                                "create", [{**vals, **config["tag_vals"]}]))
+            if partner_id is not None:
+                await _timed(stats, "read", call_kw(session, config["base_url"], "res.partner", "read",
+                                                    [[partner_id], list(vals)]))
+            if config["think_time"]:
+                await asyncio.sleep(random.uniform(0.5, 1.5) * config["think_time"])
+
+
+async def run_load(config, records):
+    """Lancer `users` utilisateurs répartis sur la montée en charge, pendant `duration` secondes"""
+    stats = LoadStats()
+    payloads = itertools.cycle(records)
+    start = time.monotonic()
+    stop_at = start + config["ramp_up"] + config["duration"]
+    step = config["ramp_up"] / config["users"] if config["users"] else 0
+    await asyncio.gather(*(virtual_user(config, payloads, stats, i * step, stop_at)
+                           for i in range(config["users"])))
+    return stats, time.monotonic() - start
+
+
+def run_tag_vals(config):
+    """Valeurs `create` de la catégorie test-run:<RUN_ID>, créée une fois avant la charge"""
+    session_id, _ = sync_http_login(config["base_url"], config["email"], config["password"])
+    return RunTagger(OdooRPC(config["base_url"], session_id=session_id)).vals()
+
+
+def load_records(path, limit=1000):
+    """Contacts valides du fichier (jusqu'à `limit`) ou contacts générés"""
+    if not path:
+        from harness.bench import generate_rows
+        return [record for _, record in generate_rows(limit)]
+
+    from harness.spreadsheet import iter_contact_chunks
+    from harness.validation import validate_contacts
+    from harness.bulk_loader import PARTNER_FIELDS
+
+    records = []
+    for frame in iter_contact_chunks(path):
+        rows, _, _ = validate_contacts(frame, list(PARTNER_FIELDS))
+        records.extend(record for _, record in rows)
+        if len(records) >= limit:
+            break
+    return records[:limit]
+
+
+def main():
+    if aiohttp is None:
+        raise SystemExit("Le mode charge nécessite aiohttp (pip install aiohttp)")
+
+    parser = argparse.ArgumentParser(description="Charge HTTP sur le module Contacts Odoo")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--ramp-up", type=float, default=30.0, help="durée de montée en charge (s)")
+    parser.add_argument("--duration", type=float, default=60.0, help="durée à charge pleine (s)")
+    parser.add_argument("--think-time", type=float, default=1.0, help="temps de réflexion moyen (s)")
+    parser.add_argument("--data", help="fichier xlsx/csv des contacts (sinon données générées)")
+    parser.add_argument("--standin", action="store_true", help="cibler un serveur Odoo local de substitution")
+    args = parser.parse_args()
+
+    standin = None
+    if args.standin:
+        from harness.standin import StandInOdoo
+        standin = StandInOdoo().start()
+        config = {"base_url": standin.url, "email": standin.email, "password": standin.password}
+    else:
+        config = {"base_url": os.getenv("ODOO_URL"), "email": os.getenv("ODOO_EMAIL"),
+                  "password": os.getenv("ODOO_PASSWORD")}
+    config.update(users=args.users, ramp_up=args.ramp_up, duration=args.duration, think_time=args.think_time)
+
+    try:
+        config["tag_vals"] = run_tag_vals(config)
+        stats, elapsed = asyncio.run(run_load(config, load_records(args.data)))
+    finally:
+        if standin:
+            standin.stop()
+    stats.report(elapsed)
+    if not standin:
+        print(f"\nContacts étiquetés test-run:{RUN_ID}; suppression: python -m harness.cleanup --run-id {RUN_ID}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Résolution des champs d'un formulaire Odoo en un seul passage dans le navigateur"""
+import json
+import os
+
+CACHE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".selector_cache.json")
+
+# Pour chaque champ, premier élément visible et éditable parmi les sélecteurs candidats
+RESOLVE_JS = r"""
+var mapping = arguments[0];
+var usable = function (el) { return el.offsetParent !== null && !el.disabled && !el.readOnly; };
+var elements = {};
+var selectors = {};
+mapping.forEach(function (entry) {
+  var field = entry[0];
+  var candidates = entry[1];
+  for (var i = 0; i < candidates.length; i++) {
+    var matches = document.querySelectorAll(candidates[i]);
+    for (var j = 0; j < matches.length; j++) {
+      if (usable(matches[j])) {
+        elements[field] = matches[j];
+        selectors[field] = candidates[i];
+        return;
+      }
+    }
+  }
+});
+return [elements, selectors];
+"""
+
+VERSION_JS = r"""
+var odoo = window.odoo || {};
+var info = odoo.info || odoo.session_info || odoo.__session_info__ || {};
+return info.server_version || 'unknown';
+"""
+
+
+class LocatorResolver:
+    """Trouve tous les champs mappés d'un coup et retient le sélecteur gagnant par version d'Odoo"""
+
+    def __init__(self, driver, odoo_wait=None, path=CACHE_FILE):
+        self.driver = driver
+        self.odoo_wait = odoo_wait
+        self.path = path
+        self.version = None
+        try:
+            with open(path, encoding="utf-8") as f:
+                self.cache = json.load(f)
+        except (OSError, ValueError):
+            self.cache = {}
+
+    def _ordered(self, field_name, selectors):
+        learned = self.cache.get(self.version, {}).get(field_name)
+        if learned in selectors:
+            return [learned] + [s for s in selectors if s != learned]
+        return list(selectors)
+
+    def _save(self):
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.cache, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def resolve(self, fields_mapping):
+        """Retourner ({champ: WebElement}, [champs introuvables]) pour [(champ, [sélecteurs])]"""
+        if self.odoo_wait is not None:
+            self.odoo_wait.until_rpc_idle()
+        if self.version is None:
+            self.version = self.driver.execute_script(VERSION_JS)
+
+        mapping = [[name, self._ordered(name, selectors)] for name, selectors in fields_mapping]
+        elements, selectors = self.driver.execute_script(RESOLVE_JS, mapping)
+
+        learned = self.cache.setdefault(self.version, {})
+        if any(learned.get(name) != selector for name, selector in selectors.items()):
+            learned.update(selectors)
+            self._save()
+
+        missing = [name for name, _ in fields_mapping if name not in elements]
+        return elements, missing
@@ -0,0 +1,165 @@
+"""Matrice d'échecs de connexion en HTTP: emails invalides x mots de passe invalides, plus injections SQL
+
+Chaque combinaison est postée directement sur /web/login, en parallèle, et la réponse doit afficher
+l'alerte "Wrong login/password". Odoo bloque une IP après `base.login_cooldown_after` échecs (5 par défaut)
+jusqu'à la prochaine connexion réussie: les combinaisons partent par vagues plus courtes, séparées
+par une connexion valide, pour ne pas bloquer les connexions des autres modules lancés en parallèle.
+
+Usage (depuis le dossier tests/):
+    python -m harness.login_matrix [--workers 8] [--standin]
+"""
+import argparse
+import http.cookiejar
+import os
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from harness.session import _CSRF_RE, http_login, odoo_url
+from harness.settings import setting
+
+ERROR_MARKER = "Wrong login/password"
+COOLDOWN_MARKER = "Too many login failures"
+
+LoginResult = namedtuple("LoginResult", "email password outcome detail elapsed")
+
+
+def login_cases():
+    """Produit cartésien invalid_emails x invalid_passwords, puis les injections SQL (login = mot de passe)"""
+    cases = [(email, password)
+             for email in setting("invalid_emails", [])
+             for password in setting("invalid_passwords", [])]
+    cases.extend((payload, payload) for payload in setting("sql_payloads", []))
+    return cases
+
+
+class LoginProber:
+    """Soumet des identifiants à /web/login avec une session HTTP (cookies + csrf_token) par thread"""
+
+    def __init__(self, base_url, timeout=30):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.login_url = odoo_url(base_url, "web/login")
+        self._local = threading.local()
+
+    def _session(self, refresh=False):
+        """Opener du thread et son csrf_token, récupéré une seule fois par session"""
+        local = self._local
+        if refresh or not getattr(local, "token", None):
+            local.opener = urllib.request.build_opener(
+                urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+            html = local.opener.open(self.login_url, timeout=self.timeout).read().decode("utf-8", "replace")
+            match = _CSRF_RE.search(html)
+            if not match:
+                raise RuntimeError("csrf_token introuvable sur /web/login")
+            local.token = match.group(1)
+        return local.opener, local.token
+
+    def _post(self, email, password, refresh=False):
+        opener, token = self._session(refresh)
+        data = urllib.parse.urlencode({
+            "login": email,
+            "password": password,
+            "csrf_token": token,
+            "redirect": "",
+        }).encode()
+        response = opener.open(self.login_url, data, timeout=self.timeout)
+        return response.geturl(), response.read().decode("utf-8", "replace")
+
+    def submit(self, email, password):
+        """Poster une combinaison et classer la réponse: rejected, cooldown, accepted ou unexpected"""
+        start = time.monotonic()
+        try:
+            try:
+                url, html = self._post(email, password)
+            except urllib.error.HTTPError as e:
+                # Jeton CSRF refusé (session expirée côté serveur): une nouvelle session puis un essai
+                if e.code != 400:
+                    raise
+                url, html = self._post(email, password, refresh=True)
+        except Exception as e:
+            return LoginResult(email, password, "unexpected", str(e), time.monotonic() - start)
+
+        elapsed = time.monotonic() - start
+        if "/web/login" not in url:
+            # Une connexion réussie déconnecte aussi la session du thread
+            self._local.token = None
+            return LoginResult(email, password, "accepted", url, elapsed)
+        if COOLDOWN_MARKER in html:
+            return LoginResult(email, password, "cooldown", COOLDOWN_MARKER, elapsed)
+        if "alert-danger" in html and ERROR_MARKER in html:
+            return LoginResult(email, password, "rejected", ERROR_MARKER, elapsed)
+        return LoginResult(email, password, "unexpected", "message d'erreur absent", elapsed)
+
+    def run(self, cases, workers=8, reset=None, wave=None):
+        """Soumettre les combinaisons par vagues parallèles; résultats dans l'ordre des cas
+
+        Chaque vague compte au plus `login_cooldown_after - 1` échecs; `reset()` (une connexion valide)
+        remet le compteur d'échecs de l'IP à zéro avant la première vague et après chacune. Une combinaison
+        tombée sur le blocage est rejouée une fois après la remise à zéro. Sans `reset`, tout part en une vague.
+        """
+        if wave is None:
+            wave = max(1, setting("login_cooldown_after", 5) - 1) if reset else max(1, len(cases))
+        if reset:
+            reset()
+        results = []
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, wave))) as executor:
+            for start in range(0, len(cases), wave):
+                batch = cases[start:start + wave]
+                batch_results = list(executor.map(lambda case: self.submit(*case), batch))
+                if reset:
+                    reset()
+                    cooled = [k for k, result in enumerate(batch_results) if result.outcome == "cooldown"]
+                    if cooled:
+                        for k, result in zip(cooled, executor.map(lambda k: self.submit(*batch[k]), cooled)):
+                            batch_results[k] = result
+                        reset()
+                results.extend(batch_results)
+        return results
+
+
+def credentials_reset(base_url, email, password):
+    """Connexion valide qui remet à zéro le compteur d'échecs Odoo de l'IP, ou None sans identifiants"""
+    if not email or not password:
+        return None
+    return lambda: http_login(base_url, email, password)
+
+
+def print_results(results):
+    for result in results:
+        mark = "✓" if result.outcome == "rejected" else "✗"
+        print(f"{mark} {result.email!r} / {result.password!r}: {result.outcome} "
+              f"({result.detail}, {result.elapsed * 1000:.0f}ms)")
+    failed = sum(1 for r in results if r.outcome != "rejected")
+    print(f"\n{len(results) - failed}/{len(results)} combinaisons rejetées correctement")
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Matrice d'échecs de connexion Odoo en HTTP")
+    parser.add_argument("--workers", type=int, default=setting("login_matrix_workers", 8))
+    parser.add_argument("--standin", action="store_true", help="cibler un serveur Odoo local de substitution")
+    args = parser.parse_args()
+
+    standin = None
+    base_url = setting("base_url")
+    email, password = os.getenv("ODOO_EMAIL"), os.getenv("ODOO_PASSWORD")
+    if args.standin:
+        from harness.standin import StandInOdoo
+        standin = StandInOdoo().start()
+        base_url, email, password = standin.url, standin.email, standin.password
+    try:
+        results = LoginProber(base_url).run(login_cases(), args.workers,
+                                            reset=credentials_reset(base_url, email, password))
+    finally:
+        if standin:
+            standin.stop()
+    raise SystemExit(1 if print_results(results) else 0)
+
+
+if __name__ == "__main__":
+    main()
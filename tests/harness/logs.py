@@ -0,0 +1,176 @@
+"""Journalisation structurée: JSONL dans un fichier tournant via une file non bloquante, console filtrée,
+et seuls les résumés dans la sortie capturée par xmlrunner (system-out du rapport JUnit)
+
+Réglages config.py: log_level (console), log_file_level, log_dir, log_max_bytes, log_backup_count.
+"""
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+
+from harness.run import RUN_ID
+from harness.settings import setting
+from harness.tracing import shared_tracer
+
+ROOT_LOGGER = "odoo_contact"
+QUEUE_SIZE = 10000
+
+# extra= des enregistrements à reprendre dans le rapport JUnit
+SUMMARY = {"summary": True}
+
+
+def _is_summary(record):
+    return getattr(record, "summary", False)
+
+
+class JsonFormatter(logging.Formatter):
+    """Une ligne JSON par enregistrement, avec le run, le test en cours et les champs de `extra={"fields": ...}`"""
+
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name[len(ROOT_LOGGER) + 1:] or record.name,
+            "msg": record.getMessage(),
+            "run": RUN_ID,
+            "pid": record.process,
+            "test": getattr(record, "test", None),
+        }
+        entry.update(getattr(record, "fields", {}))
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """File bornée: quand elle est pleine les enregistrements sont comptés et abandonnés, jamais bloquants"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._formatter = logging.Formatter()
+
+    def prepare(self, record):
+        # Sans QueueHandler.prepare, qui fond la trace dans `msg`: elle est formatée ici dans `exc_text`
+        # (l'exception elle-même ne traverse pas la file) et reste un champ à part du JSONL
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self._formatter.formatException(record.exc_info)
+        record.exc_info = None
+        # Test en cours noté à l'émission: le thread d'écriture le traite plus tard
+        record.test = shared_tracer().current_test
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class SummaryHandler(logging.StreamHandler):
+    """Écrit les résumés dans le sys.stdout du moment, capturé par xmlrunner pendant un test"""
+
+    def __init__(self):
+        super().__init__()
+        self.addFilter(_is_summary)
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+_queue_handler = None
+_listener = None
+
+
+def _log_path():
+    worker = os.getenv("ODOO_WORKER_INDEX")
+    name = f"run-{RUN_ID}" + (f"-w{worker}" if worker else "") + ".jsonl"
+    directory = setting("log_dir", "logs")
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, name)
+
+
+def _file_handler():
+    # Fichier ouvert au premier enregistrement seulement: un worker qui change de chemin
+    # avant d'écrire n'ouvre jamais celui du processus parent
+    file_handler = logging.handlers.RotatingFileHandler(
+        _log_path(), maxBytes=setting("log_max_bytes", 10 * 1024 * 1024),
+        backupCount=setting("log_backup_count", 5), encoding="utf-8", delay=True)
+    file_handler.setLevel(setting("log_file_level", "DEBUG"))
+    file_handler.setFormatter(JsonFormatter())
+    return file_handler
+
+
+def setup_logging():
+    """Installer les handlers du journal du processus (une seule fois)"""
+    global _queue_handler, _listener
+    if _listener is not None:
+        return
+    file_handler = _file_handler()
+
+    # Console hors capture xmlrunner; les résumés y arrivent déjà par SummaryHandler
+    console_handler = logging.StreamHandler(sys.__stdout__)
+    console_handler.setLevel(setting("log_level", "INFO"))
+    console_handler.setFormatter(logging.Formatter("%(message)s"))
+    console_handler.addFilter(lambda record: not _is_summary(record))
+
+    _queue_handler = BoundedQueueHandler(queue.Queue(QUEUE_SIZE))
+    _listener = logging.handlers.QueueListener(_queue_handler.queue, file_handler, console_handler,
+                                               respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+    logger = logging.getLogger(ROOT_LOGGER)
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    logger.addHandler(_queue_handler)
+    logger.addHandler(SummaryHandler())
+
+
+def reopen_log_file():
+    """Rediriger le journal vers le fichier propre au processus, après un changement de ODOO_WORKER_INDEX
+
+    Chaque processus doit avoir son fichier: deux RotatingFileHandler sur le même fichier
+    se marchent dessus à la rotation.
+    """
+    global _listener
+    if _listener is None:
+        setup_logging()
+        return
+    _listener.stop()
+    previous, console_handler = _listener.handlers
+    previous.close()
+    _listener = logging.handlers.QueueListener(_queue_handler.queue, _file_handler(), console_handler,
+                                               respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging():
+    """Vider la file vers le fichier (fin de processus)"""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    _listener = None
+    if _queue_handler.dropped:
+        print(f"Journal: {_queue_handler.dropped} enregistrement(s) abandonné(s), file pleine", file=sys.__stderr__)
+
+
+def get_logger(name):
+    """Logger du harnais (`odoo_contact.<name>`)"""
+    setup_logging()
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
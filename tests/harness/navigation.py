@@ -0,0 +1,62 @@
+"""Navigation dans le client web Odoo déjà chargé: bouton Nouveau et routage par hash au lieu de driver.get"""
+from harness.settings import setting
+from harness.timeouts import shared_timeouts
+
+CONTACTS_ACTION = "cids=1&menu_id=96&action=122&model=res.partner"
+
+IN_APP_JS = "return !!(window.odoo && document.querySelector('.o_main_navbar') && document.querySelector('.o_action_manager'));"
+
+CLICK_NEW_JS = r"""
+var button = document.querySelector('.o_form_button_create, .o-kanban-button-new, .o_list_button_add');
+if (!button || button.offsetParent === null) { return false; }
+button.click();
+return true;
+"""
+
+
+class AppNavigator:
+    """Ouvre formulaires et kanban des contacts sans recharger le client web quand c'est possible"""
+
+    def __init__(self, driver, odoo_wait, base_url):
+        self.driver = driver
+        self.odoo_wait = odoo_wait
+        self.base_url = base_url.rstrip("/")
+        self.enabled = setting("in_app_navigation", True)
+        self._reload = False
+
+    def url(self, view_type):
+        return f"{self.base_url}/web#{CONTACTS_ACTION}&view_type={view_type}"
+
+    def invalidate(self):
+        """Forcer un rechargement complet à la prochaine navigation (formulaire dans un état inconnu)"""
+        self._reload = True
+
+    def in_app(self):
+        """Client web Odoo chargé dans l'onglet courant"""
+        if not self.enabled or self._reload or not self.driver.current_url.startswith(self.base_url):
+            return False
+        return bool(self.driver.execute_script(IN_APP_JS))
+
+    def _route(self, view_type):
+        self.driver.execute_script("window.location.hash = arguments[0];", f"{CONTACTS_ACTION}&view_type={view_type}")
+
+    def open_new_form(self):
+        """Formulaire de création vide: bouton Nouveau, sinon hash, sinon chargement complet"""
+        if self.in_app():
+            if not self.driver.execute_script(CLICK_NEW_JS):
+                self._route("form")
+        else:
+            with shared_timeouts().measure("page_load"):
+                self.driver.get(self.url("form"))
+            self._reload = False
+        self.odoo_wait.until_new_form()
+
+    def open_kanban(self):
+        """Vue kanban des contacts"""
+        if self.in_app():
+            self._route("kanban")
+        else:
+            with shared_timeouts().measure("page_load"):
+                self.driver.get(self.url("kanban"))
+            self._reload = False
+        self.odoo_wait.until_kanban_loaded()
@@ -0,0 +1,112 @@
+"""Vérification côté serveur des contacts créés: un search_count et un search_read groupé par id"""
+import re
+
+from harness.bulk_loader import to_partner_vals
+from harness.rpc import OdooRPC
+
+PHONE_FIELDS = ("phone", "mobile")
+CHUNK_SIZE = 1000
+
+
+def _normalize(field_name, value):
+    if value in (None, False):
+        return ""
+    value = str(value).strip()
+    if field_name in PHONE_FIELDS:
+        return re.sub(r"\D", "", value)
+    if field_name == "email":
+        return value.lower()
+    return value
+
+
+def _differences(vals, partner):
+    """Champs [(champ, attendu, trouvé)] dont la valeur en base diffère de la ligne"""
+    return [(field_name, value, partner.get(field_name)) for field_name, value in vals.items()
+            if _normalize(field_name, value) != _normalize(field_name, partner.get(field_name))]
+
+
+class OracleReport:
+    """Lignes absentes de la base et champs divergents"""
+
+    def __init__(self):
+        self.found = {}
+        self.missing = []
+        self.mismatched = []
+
+    @property
+    def ok(self):
+        return not self.missing and not self.mismatched
+
+    def summary(self):
+        lines = [f"Contacts vérifiés en base: {len(self.found)}, absents: {len(self.missing)}, "
+                 f"divergents: {len(self.mismatched)}"]
+        for index, name in self.missing:
+            lines.append(f"  absent: ligne {index + 1} ({name})")
+        for index, field_name, expected, actual in self.mismatched:
+            lines.append(f"  divergent: ligne {index + 1} {field_name}: attendu {expected!r}, trouvé {actual!r}")
+        return "\n".join(lines)
+
+
+class ContactOracle:
+    """Compte et contrôle les res.partner directement sur le serveur"""
+
+    def __init__(self, rpc):
+        self.rpc = rpc
+
+    @classmethod
+    def from_env(cls):
+        return cls(OdooRPC.from_env())
+
+    def count(self, domain=None):
+        """Nombre total de contacts (actifs) correspondant au domaine"""
+        return self.rpc.call_kw("res.partner", "search_count", [domain or []])
+
+    def last_id(self):
+        """Plus grand id de contact actuel (0 si aucun): repère de début de run"""
+        ids = self.rpc.call_kw("res.partner", "search", [[]], {"order": "id desc", "limit": 1})
+        return ids[0] if ids else 0
+
+    def find_created(self, record, after_id, known_id=None, exclude=()):
+        """Id d'un contact identique à `record` créé après `after_id` et hors `exclude`, sinon None
+
+        Sert à ne pas recréer une ligne dont la sauvegarde a abouti côté serveur malgré l'échec
+        côté navigateur; `known_id` (lu dans l'URL avant l'échec) est vérifié en premier.
+        """
+        if known_id and self.rpc.call_kw("res.partner", "search_count", [[("id", "=", known_id)]]):
+            return known_id
+        vals = to_partner_vals(record)
+        key = ("email", "=", vals["email"]) if vals.get("email") else ("name", "=", vals.get("name", ""))
+        domain = [("id", ">", after_id), key]
+        if exclude:
+            domain.append(("id", "not in", sorted(exclude)))
+        partners = self.rpc.call_kw("res.partner", "search_read", [domain],
+                                    {"fields": sorted(vals), "order": "id desc"})
+        for partner in partners:
+            if not _differences(vals, partner):
+                return partner["id"]
+        return None
+
+    def verify(self, rows, report=None):
+        """Contrôler par id les lignes [(index, record, id)] (cumulées dans `report`); id None = absente
+
+        Les ids sont ceux renvoyés à la création: un partenaire laissé par un autre run ne peut pas
+        masquer une ligne absente ou divergente. `record` ne doit contenir que les colonnes réellement
+        envoyées par le chemin de création (un champ absent du formulaire n'est pas comparé).
+        """
+        report = report if report is not None else OracleReport()
+        for start in range(0, len(rows), CHUNK_SIZE):
+            chunk = [(index, to_partner_vals(record), partner_id)
+                     for index, record, partner_id in rows[start:start + CHUNK_SIZE]]
+            ids = [partner_id for _, _, partner_id in chunk if partner_id]
+            fields = sorted({field_name for _, vals, _ in chunk for field_name in vals})
+            partners = self.rpc.call_kw("res.partner", "search_read", [[("id", "in", ids)]],
+                                        {"fields": fields}) if ids else []
+            by_id = {partner["id"]: partner for partner in partners}
+            for index, vals, partner_id in chunk:
+                partner = by_id.get(partner_id)
+                if partner is None:
+                    report.missing.append((index, vals.get("name", "")))
+                    continue
+                report.found[index] = partner_id
+                report.mismatched.extend((index, f, e, a) for f, e, a in _differences(vals, partner))
+        return report
@@ -0,0 +1,155 @@
+"""Métriques de performance Odoo relevées pendant les parcours UI (navigation, tâches longues, RPC)"""
+import re
+
+from harness.logs import SUMMARY, get_logger
+from harness.settings import setting
+from harness.stats import percentile
+from harness.tracing import shared_tracer
+
+log = get_logger("perf")
+
+# Observateur des tâches longues, installé avant le chargement de chaque document
+PERF_INIT_JS = r"""
+(function () {
+  if (window.__odooPerf) { return; }
+  var perf = window.__odooPerf = {longTasks: [], navigationReported: false};
+  if (performance.setResourceTimingBufferSize) { performance.setResourceTimingBufferSize(2000); }
+  try {
+    new PerformanceObserver(function (list) {
+      list.getEntries().forEach(function (entry) { perf.longTasks.push(entry.duration); });
+    }).observe({type: 'longtask', buffered: true});
+  } catch (e) {}
+})();
+"""
+
+COLLECT_JS = r"""
+var perf = window.__odooPerf || {longTasks: [], navigationReported: true};
+var result = {navigation: null, requests: [], long_tasks: perf.longTasks.splice(0), heap: null};
+var nav = performance.getEntriesByType('navigation')[0];
+if (nav && !perf.navigationReported && nav.loadEventEnd > 0) {
+  perf.navigationReported = true;
+  result.navigation = {
+    ttfb: nav.responseStart - nav.requestStart,
+    dom_content_loaded: nav.domContentLoadedEventEnd,
+    load: nav.loadEventEnd,
+    transfer_size: nav.transferSize
+  };
+}
+performance.getEntriesByType('resource').forEach(function (entry) {
+  if (/\/web\/dataset\/call_kw|\/web\/action\/load/.test(entry.name)) {
+    result.requests.push({url: entry.name, duration: entry.duration});
+  }
+});
+performance.clearResourceTimings();
+if (performance.memory) { result.heap = performance.memory.usedJSHeapSize; }
+return result;
+"""
+
+
+def endpoint_name(url):
+    """'/web/dataset/call_kw/res.partner/create' -> 'call_kw/res.partner/create'"""
+    path = re.sub(r"^https?://[^/]+", "", url).split("?")[0]
+    match = re.search(r"/web/dataset/(call_kw(?:/[^/]+/[^/]+)?)", path)
+    if match:
+        return match.group(1)
+    return "action/load" if "/web/action/load" in path else path
+
+
+def install(driver):
+    """Installer l'observateur dans tous les prochains documents du navigateur"""
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": PERF_INIT_JS})
+
+
+class PerfCollector:
+    """Agrège les métriques par type de page et par endpoint RPC, et les compare aux seuils de config.py"""
+
+    def __init__(self, thresholds=None):
+        self.thresholds = thresholds if thresholds is not None else setting("perf_thresholds", {})
+        self.samples = []
+
+    def collect(self, driver, page_type):
+        """Relever les métriques accumulées depuis le dernier relevé pour cette page/opération"""
+        try:
+            data = driver.execute_script(COLLECT_JS)
+        except Exception as e:
+            log.warning(f"Métriques indisponibles ({page_type}): {e}")
+            return
+        test = shared_tracer().current_test
+        # Profil navigateur (config.browser_profiles) du relevé, pour comparer les runs par profil
+        profile = getattr(driver, "profile_name", None)
+
+        def add(metric, value):
+            self.samples.append({"test": test, "profile": profile, "metric": metric, "value": value})
+
+        if data["navigation"]:
+            for key, value in data["navigation"].items():
+                add(f"page:{page_type}.{key}", value)
+        if data["long_tasks"]:
+            add(f"page:{page_type}.long_tasks_ms", sum(data["long_tasks"]))
+        if data["heap"]:
+            add(f"page:{page_type}.js_heap_bytes", data["heap"])
+        for request in data["requests"]:
+            add(f"rpc:{endpoint_name(request['url'])}", request["duration"])
+
+    def export(self):
+        """Retirer et retourner les mesures (pour les remonter d'un worker au processus principal)"""
+        samples, self.samples = self.samples, []
+        return samples
+
+    def merge(self, samples):
+        """Ajouter des mesures venant d'un autre processus"""
+        self.samples.extend(samples)
+
+    def summary(self, test=None):
+        """{métrique: {count, p50, p95, max}}"""
+        values = {}
+        for sample in self.samples:
+            if test is None or sample["test"] == test:
+                values.setdefault(sample["metric"], []).append(sample["value"])
+        return {metric: {"count": len(v), "p50": round(percentile(v, 50), 1),
+                         "p95": round(percentile(v, 95), 1), "max": round(max(v), 1)}
+                for metric, v in sorted(values.items())}
+
+    def violations(self, test=None):
+        """Métriques dont le p95 dépasse le seuil configuré"""
+        return [f"{metric} p95 {stats['p95']} > seuil {self.thresholds[metric]}"
+                for metric, stats in self.summary(test).items()
+                if metric in self.thresholds and stats["p95"] > self.thresholds[metric]]
+
+    def profiles(self, test=None):
+        """Profils navigateur des mesures"""
+        return sorted({sample["profile"] for sample in self.samples
+                       if (test is None or sample["test"] == test) and sample.get("profile")})
+
+    def junit_properties(self, test=None):
+        properties = {}
+        profiles = self.profiles(test)
+        if profiles:
+            properties["perf.browser_profile"] = ",".join(profiles)
+        for metric, stats in self.summary(test).items():
+            for key, value in stats.items():
+                properties[f"perf.{metric}.{key}"] = value
+        return properties
+
+    def report(self, test=None):
+        """Afficher le résumé et retourner les dépassements de seuil"""
+        profiles = self.profiles(test)
+        lines = [f"Métriques Odoo (ms, octets), profil {', '.join(profiles) or 'inconnu'}:"]
+        for metric, stats in self.summary(test).items():
+            lines.append(f"  {metric:<45} n={stats['count']:<5} p50={stats['p50']:<10} p95={stats['p95']}")
+        problems = self.violations(test)
+        for problem in problems:
+            lines.append(f"  SEUIL DÉPASSÉ: {problem}")
+        log.info("\n".join(lines), extra=SUMMARY)
+        return problems
+
+
+_shared = None
+
+
+def shared_perf():
+    """Collecteur du processus"""
+    global _shared
+    if _shared is None:
+        _shared = PerfCollector()
+    return _shared
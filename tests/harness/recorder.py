@@ -0,0 +1,117 @@
+"""Enregistreur en mémoire des dernières étapes, écrit sur disque seulement en cas d'échec"""
+import base64
+import json
+import os
+import re
+import time
+from collections import deque
+
+from selenium.common.exceptions import WebDriverException
+
+from harness.logs import SUMMARY, get_logger
+from harness.run import RUN_ID
+from harness.screenshots import shared_screenshots
+
+log = get_logger("recorder")
+
+
+def artifacts_mode():
+    """'on_failure' (enregistreur en mémoire, défaut) ou 'always' (toutes les captures écrites)"""
+    return os.getenv("ODOO_ARTIFACTS", "on_failure")
+
+
+def _safe_name(name):
+    return re.sub(r"[^\w.-]+", "_", name)
+
+
+def test_failed(testcase):
+    """Le test en cours a-t-il échoué ou levé une erreur ? (à appeler depuis tearDown)
+
+    `_outcome.success` est aussi faux pour un test ignoré (skipTest): on cherche le test, ou l'un de
+    ses sous-tests, parmi les erreurs et échecs enregistrés.
+    """
+    outcome = getattr(testcase, "_outcome", None)
+    if outcome is None:
+        return False
+    if hasattr(outcome, "errors"):
+        # Python < 3.11: erreurs et échecs accumulés dans l'outcome (exc_info None = partie réussie)
+        return any(exc_info is not None for _, exc_info in outcome.errors)
+    result = outcome.result
+    return any(test is testcase or getattr(test, "test_case", None) is testcase
+               for test, _ in list(result.errors) + list(result.failures))
+
+
+class FlightRecorder:
+    """Tampon circulaire par navigateur: captures, DOM et console des N dernières étapes"""
+
+    def __init__(self, capacity=20, output_dir=None):
+        self.capacity = capacity
+        self.output_dir = output_dir or os.path.join("screenshots", RUN_ID, "failures")
+        self.buffers = {}
+
+    def record(self, driver, name):
+        """Garder en mémoire l'état actuel du navigateur"""
+        entry = {"name": name, "time": time.time(), "url": None, "screenshot": None, "dom": None, "console": []}
+        try:
+            entry["url"] = driver.current_url
+            entry["screenshot"] = driver.execute_cdp_cmd(
+                "Page.captureScreenshot", {"format": "jpeg", "quality": 60})["data"]
+            entry["dom"] = driver.page_source
+            entry["console"] = driver.get_log("browser")
+        except WebDriverException as e:
+            entry["error"] = str(e)
+        self.buffers.setdefault(id(driver), deque(maxlen=self.capacity)).append(entry)
+
+    def discard(self, driver):
+        """Oublier les étapes d'un test réussi"""
+        self.buffers.pop(id(driver), None)
+
+    def flush(self, driver, label):
+        """Écrire les étapes en mémoire d'un test échoué; retourne le dossier créé"""
+        entries = self.buffers.pop(id(driver), None)
+        if not entries:
+            return None
+        directory = os.path.join(self.output_dir, _safe_name(label))
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, "console.jsonl"), "w", encoding="utf-8") as console:
+            for number, entry in enumerate(entries, start=1):
+                prefix = os.path.join(directory, f"{number:02d}_{_safe_name(entry['name'])}")
+                if entry["screenshot"]:
+                    with open(f"{prefix}.jpg", "wb") as f:
+                        f.write(base64.b64decode(entry["screenshot"]))
+                if entry["dom"]:
+                    with open(f"{prefix}.html", "w", encoding="utf-8") as f:
+                        f.write(entry["dom"])
+                for console_entry in entry["console"]:
+                    console.write(json.dumps({"step": entry["name"], "url": entry["url"], **console_entry}) + "\n")
+        log.info(f"Artefacts d'échec écrits dans {directory}", extra=SUMMARY)
+        return directory
+
+
+_shared = None
+
+
+def shared_recorder():
+    """Enregistreur du processus"""
+    global _shared
+    if _shared is None:
+        _shared = FlightRecorder(capacity=int(os.getenv("ODOO_RECORDER_CAPACITY", "20")))
+    return _shared
+
+
+def capture_step(driver, name):
+    """Capturer une étape selon le mode d'artefacts"""
+    if artifacts_mode() == "always":
+        shared_screenshots().capture(driver, name)
+    else:
+        shared_recorder().record(driver, name)
+
+
+def finish_test(testcase, driver):
+    """Fin de test: écrire l'enregistrement si le test a échoué, sinon l'oublier"""
+    if artifacts_mode() == "always":
+        return
+    if test_failed(testcase):
+        shared_recorder().flush(driver, testcase.id())
+    else:
+        shared_recorder().discard(driver)
@@ -0,0 +1,54 @@
+"""File des lignes en échec transitoire, rejouées en fin de run au lieu d'échouer tout de suite"""
+import socket
+import urllib.error
+from collections import deque
+
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+
+from harness.rpc import SESSION_EXPIRED_CODE, OdooRPCError
+from harness.settings import setting
+
+
+def is_transient(error):
+    """Erreur due au serveur ou au navigateur plutôt qu'aux données
+
+    Seuls comptent le délai dépassé, l'élément périmé, la connexion perdue et la session Odoo expirée;
+    un sélecteur introuvable ou invalide est un échec réel, signalé sans nouvel essai.
+    """
+    if isinstance(error, OdooRPCError):
+        return error.code == SESSION_EXPIRED_CODE
+    return isinstance(error, (TimeoutException, StaleElementReferenceException, urllib.error.URLError,
+                              socket.timeout, ConnectionError))
+
+
+class RetryQueue:
+    """Lignes (index, données) différées, chacune rejouée jusqu'à `max_attempts` tentatives au total"""
+
+    def __init__(self, max_attempts=None):
+        self.max_attempts = max_attempts or setting("retry_max_attempts", 3)
+        self.pending = deque()
+
+    def __len__(self):
+        return len(self.pending)
+
+    def defer(self, index, record):
+        """Différer une ligne après sa première tentative en échec"""
+        self.pending.append((index, record, 1))
+
+    def drain(self, attempt):
+        """Rejouer les lignes avec `attempt(index, record) -> (id créé ou None, erreur)`
+
+        Retourne ([(index, record, id)] créées, [(index, record)] échouées).
+        """
+        created = []
+        failed = []
+        while self.pending:
+            index, record, tries = self.pending.popleft()
+            record_id, error = attempt(index, record)
+            if record_id:
+                created.append((index, record, record_id))
+            elif is_transient(error) and tries + 1 < self.max_attempts:
+                self.pending.append((index, record, tries + 1))
+            else:
+                failed.append((index, record))
+        return created, failed
@@ -0,0 +1,60 @@
+"""Client JSON-RPC minimal pour /web/dataset/call_kw, authentifié par la session partagée"""
+import itertools
+import json
+import urllib.request
+
+from harness.session import SESSION_COOKIE, odoo_url, shared_session
+
+SESSION_EXPIRED_CODE = 100
+
+
+class OdooRPCError(Exception):
+    """Erreur renvoyée par le serveur Odoo sur un appel JSON-RPC"""
+
+    def __init__(self, error):
+        data = error.get("data") or {}
+        super().__init__(data.get("message") or error.get("message", "Erreur RPC"))
+        self.code = error.get("code")
+        self.name = data.get("name")
+
+
+class OdooRPC:
+    """Appels `call_kw` sur un modèle Odoo"""
+
+    def __init__(self, base_url, session_cache=None, session_id=None, timeout=60):
+        self.base_url = base_url
+        self.session_cache = session_cache
+        self.session_id = session_id or (session_cache.get() if session_cache else None)
+        self.timeout = timeout
+        self._ids = itertools.count(1)
+
+    @classmethod
+    def from_env(cls):
+        """Client configuré par ODOO_URL / ODOO_EMAIL / ODOO_PASSWORD"""
+        session = shared_session()
+        return cls(session.base_url, session_cache=session)
+
+    def _post(self, path, params):
+        request = urllib.request.Request(
+            odoo_url(self.base_url, path),
+            data=json.dumps({"jsonrpc": "2.0", "method": "call", "id": next(self._ids), "params": params}).encode(),
+            headers={"Content-Type": "application/json", "Cookie": f"{SESSION_COOKIE}={self.session_id}"},
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read().decode("utf-8"))
+
+    def call_kw(self, model, method, args, kwargs=None):
+        """Appeler `model.method(*args, **kwargs)` et retourner le résultat"""
+        params = {"model": model, "method": method, "args": args, "kwargs": kwargs or {}}
+        path = f"web/dataset/call_kw/{model}/{method}"
+        payload = self._post(path, params)
+
+        error = payload.get("error")
+        if error and error.get("code") == SESSION_EXPIRED_CODE and self.session_cache:
+            # Session expirée: en ouvrir une nouvelle et rejouer l'appel une fois
+            self.session_id = self.session_cache.renew()
+            payload = self._post(path, params)
+            error = payload.get("error")
+        if error:
+            raise OdooRPCError(error)
+        return payload["result"]
@@ -0,0 +1,5 @@
+"""Identifiant du run courant, hérité par les processus workers via l'environnement"""
+import os
+from datetime import datetime
+
+RUN_ID = os.environ.setdefault("ODOO_RUN_ID", datetime.now().strftime("%Y%m%d_%H%M%S"))
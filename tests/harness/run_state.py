@@ -0,0 +1,79 @@
+"""État local des runs incrémentaux: empreinte des lignes déjà créées et vérifiées, par serveur cible"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+from harness.bulk_loader import to_partner_vals
+
+STATE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "run_state.sqlite3")
+QUERY_CHUNK = 500
+
+
+def full_run():
+    """Run complet demandé (--full ou ODOO_FULL_RUN=1): toutes les lignes sont retraitées"""
+    return os.getenv("ODOO_FULL_RUN", "").lower() in ("1", "true", "yes")
+
+
+def row_hash(record):
+    """Empreinte du contenu d'une ligne (valeurs res.partner envoyées au serveur)"""
+    payload = json.dumps(to_partner_vals(record), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class RunState:
+    """Lignes (empreinte -> id res.partner, colonnes saisies) validées lors des runs précédents sur `target`"""
+
+    def __init__(self, target, path=STATE_FILE):
+        self.target = (target or "").rstrip("/")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS rows ("
+            " target TEXT NOT NULL, row_hash TEXT NOT NULL, partner_id INTEGER NOT NULL, updated REAL NOT NULL,"
+            " fields TEXT, PRIMARY KEY (target, row_hash))")
+        try:
+            # État écrit avant l'enregistrement des colonnes saisies: toutes les colonnes comptent
+            self.connection.execute("ALTER TABLE rows ADD COLUMN fields TEXT")
+        except sqlite3.OperationalError:
+            pass
+
+    def known(self, hashes):
+        """{empreinte: (id, colonnes saisies ou None si toutes)} des empreintes déjà validées"""
+        hashes = list(hashes)
+        found = {}
+        for start in range(0, len(hashes), QUERY_CHUNK):
+            chunk = hashes[start:start + QUERY_CHUNK]
+            cursor = self.connection.execute(
+                f"SELECT row_hash, partner_id, fields FROM rows"
+                f" WHERE target = ? AND row_hash IN ({','.join('?' * len(chunk))})",
+                [self.target, *chunk])
+            found.update((digest, (partner_id, json.loads(fields) if fields else None))
+                         for digest, partner_id, fields in cursor.fetchall())
+        return found
+
+    def mark(self, entries):
+        """Enregistrer les lignes [(empreinte, id, colonnes saisies ou None)] créées et vérifiées en base"""
+        now = time.time()
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO rows (target, row_hash, partner_id, updated, fields) VALUES (?, ?, ?, ?, ?)",
+                [(self.target, digest, partner_id, now, json.dumps(sorted(fields)) if fields else None)
+                 for digest, partner_id, fields in entries])
+
+    def forget(self, partner_ids=None):
+        """Oublier les lignes des contacts donnés (tous si None) sur cette cible"""
+        with self.connection:
+            if partner_ids is None:
+                self.connection.execute("DELETE FROM rows WHERE target = ?", [self.target])
+                return
+            partner_ids = list(partner_ids)
+            for start in range(0, len(partner_ids), QUERY_CHUNK):
+                chunk = partner_ids[start:start + QUERY_CHUNK]
+                self.connection.execute(
+                    f"DELETE FROM rows WHERE target = ? AND partner_id IN ({','.join('?' * len(chunk))})",
+                    [self.target, *chunk])
+
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,127 @@
+"""Lancement des modules de test avec xmlrunner, enrichi des spans de timing"""
+import glob
+import os
+import re
+import sys
+import time
+import unittest
+from xml.dom import minidom
+
+import xmlrunner
+from xmlrunner.result import _XMLTestResult
+
+from harness.browser import profile_name
+from harness.logs import get_logger
+from harness.perf import shared_perf
+from harness.run import RUN_ID
+from harness.scheduler import REPORTS_DIR, update_timings
+from harness.settings import setting
+from harness.testrail import close_publisher, shared_publisher
+from harness.tracing import shared_tracer
+
+log = get_logger("runner")
+
+
+class TracingResult(_XMLTestResult):
+    """Résultat xmlrunner qui indique au traceur le test en cours et publie chaque résultat dans TestRail"""
+
+    def startTest(self, test):
+        shared_tracer().current_test = re.sub(r"^__main__\.", "", test.id())
+        self._testrail = {"status": "passed", "comment": "", "start": time.monotonic()}
+        super().startTest(test)
+
+    def _mark(self, status, test, err=None):
+        self._testrail["status"] = status
+        if err is not None:
+            self._testrail["comment"] += self._exc_info_to_string(err, test)[-4000:]
+
+    def addFailure(self, test, err):
+        super().addFailure(test, err)
+        self._mark("failed", test, err)
+
+    def addError(self, test, err):
+        super().addError(test, err)
+        self._mark("failed", test, err)
+
+    def addSubTest(self, test, subtest, err):
+        super().addSubTest(test, subtest, err)
+        if err is not None:
+            self._mark("failed", test, err)
+
+    def addSkip(self, test, reason):
+        super().addSkip(test, reason)
+        self._mark("skipped", test)
+
+    def stopTest(self, test):
+        super().stopTest(test)
+        publisher = shared_publisher()
+        if publisher and self._testrail["status"] != "skipped":
+            publisher.publish(shared_tracer().current_test, self._testrail["status"],
+                              time.monotonic() - self._testrail["start"], self._testrail["comment"])
+        shared_tracer().current_test = None
+
+
+def attach_properties(report_path, tracer):
+    """Ajouter le profil navigateur, les spans et les métriques Odoo des tests d'un rapport JUnit sous <properties>"""
+    document = minidom.parse(report_path)
+    for suite in document.getElementsByTagName("testsuite"):
+        # Profil du run (config.browser_profiles): les rapports se comparent par profil
+        properties = {"browser_profile": profile_name()}
+        for case in suite.getElementsByTagName("testcase"):
+            test_id = f"{case.getAttribute('classname')}.{case.getAttribute('name')}"
+            test_properties = {**tracer.junit_properties(test_id), **shared_perf().junit_properties(test_id)}
+            for key, value in test_properties.items():
+                properties[f"{case.getAttribute('name')}.{key}"] = value
+        element = document.createElement("properties")
+        for key, value in properties.items():
+            prop = document.createElement("property")
+            prop.setAttribute("name", key)
+            prop.setAttribute("value", str(value))
+            element.appendChild(prop)
+        suite.insertBefore(element, suite.firstChild)
+    with open(report_path, "w", encoding="utf-8") as f:
+        document.writexml(f, encoding="UTF-8")
+
+
+def own_reports(outsuffix):
+    """Rapports JUnit écrits par ce processus (suffixe propre au processus)"""
+    return sorted(glob.glob(os.path.join(REPORTS_DIR, f"TEST-*-{outsuffix}.xml")))
+
+
+def main(argv=None):
+    """Point d'entrée `if __name__ == "__main__"` des modules de test"""
+    argv = list(sys.argv if argv is None else argv)
+    module = os.path.splitext(os.path.basename(argv[0]))[0]
+    # Suffixe des rapports propre au processus: les modules lancés en parallèle ne se mélangent pas;
+    # l'horodatage reste en dernier pour l'ordre de lecture des timings
+    outsuffix = f"{os.getpid()}-{time.strftime('%Y%m%d%H%M%S')}"
+    if "--full" in argv:
+        # Run complet: retraiter toutes les lignes, y compris celles inchangées depuis le dernier run
+        argv.remove("--full")
+        os.environ["ODOO_FULL_RUN"] = "1"
+    # Résultats envoyés à TestRail au fil de l'eau (si activé), run nommé d'après le module
+    shared_publisher(module)
+    program = unittest.main(
+        argv=argv,
+        testRunner=xmlrunner.XMLTestRunner(output=REPORTS_DIR, outsuffix=outsuffix, resultclass=TracingResult),
+        exit=False,
+    )
+
+    tracer = shared_tracer()
+    for report_path in own_reports(outsuffix):
+        attach_properties(report_path, tracer)
+    trace_path = os.path.join(REPORTS_DIR, f"trace-{RUN_ID}-{module}-{os.getpid()}.json")
+    tracer.write_chrome_trace(trace_path, {"run": RUN_ID, "module": module, "browser_profile": profile_name()})
+    log.info(f"Trace des étapes: {trace_path}")
+    update_timings(tracer.events)
+    close_publisher()
+
+    if setting("cleanup_after_run"):
+        from harness.cleanup import cleanup
+        from harness.rpc import OdooRPC
+        try:
+            log.info(f"Nettoyage: {cleanup(OdooRPC.from_env(), RUN_ID)} contact(s) du run {RUN_ID} supprimé(s)")
+        except Exception as e:
+            log.error(f"Erreur nettoyage du run {RUN_ID}: {e}")
+
+    sys.exit(not program.result.wasSuccessful())
@@ -0,0 +1,225 @@
+"""Ordonnancement selon les durées passées: timings tirés des rapports JUnit de reports/, répartition la plus longue d'abord
+
+Usage (depuis le dossier tests/):
+    python -m harness.scheduler --workers 3 [TestLoginFailure.py ...]
+"""
+import argparse
+import ast
+import glob
+import heapq
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from xml.dom import minidom
+
+from harness.logs import get_logger
+from harness.run import RUN_ID
+from harness.stats import percentile
+
+log = get_logger("scheduler")
+
+REPORTS_DIR = "reports"
+TIMINGS_FILE = os.path.join(REPORTS_DIR, "timings.json")
+TESTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Poids des nouvelles mesures dans la moyenne glissante
+SMOOTHING = 0.5
+DEFAULT_TEST_S = 30.0
+DEFAULT_ROW_S = 10.0
+
+
+def _smooth(previous, value):
+    return value if previous is None else round(SMOOTHING * value + (1 - SMOOTHING) * previous, 3)
+
+
+class TimingStore:
+    """Durées lissées par test (classe.méthode) et par ligne de données (empreinte), persistées en JSON"""
+
+    def __init__(self, path=TIMINGS_FILE):
+        self.path = path
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        self.tests = data.get("tests", {})
+        self.rows = data.get("rows", {})
+        self.seen_reports = set(data.get("seen_reports", []))
+
+    def ingest_reports(self, reports_dir=REPORTS_DIR):
+        """Intégrer les rapports JUnit pas encore lus (du plus ancien au plus récent)"""
+        paths = sorted(glob.glob(os.path.join(reports_dir, "TEST-*.xml")),
+                       key=lambda p: os.path.basename(p).rsplit("-", 1)[-1])
+        for path in paths:
+            name = os.path.basename(path)
+            if name in self.seen_reports:
+                continue
+            try:
+                document = minidom.parse(path)
+            except Exception as e:
+                log.warning(f"Rapport illisible ignoré ({name}): {e}")
+                continue
+            for case in document.getElementsByTagName("testcase"):
+                if case.getElementsByTagName("skipped") or not case.getAttribute("time"):
+                    continue
+                test_id = f"{case.getAttribute('classname')}.{case.getAttribute('name')}"
+                self.tests[test_id] = _smooth(self.tests.get(test_id), float(case.getAttribute("time")))
+            self.seen_reports.add(name)
+
+    def ingest_rows(self, events):
+        """Intégrer les durées des spans `contact_row` (une ligne de données créée par l'UI)"""
+        for event in events:
+            row = event["name"] == "contact_row" and event["args"].get("row")
+            if row:
+                self.rows[row] = _smooth(self.rows.get(row), event["dur"] / 1e6)
+
+    def test_duration(self, test_id):
+        return self.tests.get(test_id, DEFAULT_TEST_S)
+
+    def class_duration(self, class_name):
+        """Durée cumulée des tests connus d'une classe"""
+        known = [seconds for test_id, seconds in self.tests.items() if test_id.rsplit(".", 1)[0] == class_name]
+        return sum(known) if known else DEFAULT_TEST_S
+
+    def row_duration(self, digest):
+        """Durée passée d'une ligne, sinon médiane des lignes connues"""
+        if digest in self.rows:
+            return self.rows[digest]
+        return percentile(list(self.rows.values()), 50) if self.rows else DEFAULT_ROW_S
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"tests": self.tests, "rows": self.rows, "seen_reports": sorted(self.seen_reports)},
+                      f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+@contextmanager
+def file_lock(path, timeout=60, stale_s=300):
+    """Verrou inter-processus: fichier `<path>.lock` créé en exclusivité (portable, sans fcntl)"""
+    lock_path = f"{path}.lock"
+    os.makedirs(os.path.dirname(lock_path) or ".", exist_ok=True)
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(lock_path) > stale_s:
+                    # Verrou laissé par un processus interrompu
+                    os.remove(lock_path)
+                    continue
+            except OSError:
+                continue
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Verrou {lock_path} toujours pris après {timeout}s")
+            time.sleep(0.05)
+    try:
+        yield
+    finally:
+        os.close(fd)
+        os.remove(lock_path)
+
+
+def update_timings(events=()):
+    """Mettre à jour le magasin de timings après un run (rapports JUnit et spans des lignes)
+
+    Lecture, fusion et écriture sous verrou: les modules lancés en parallèle par le planificateur
+    mettent à jour le même fichier.
+    """
+    with file_lock(TIMINGS_FILE):
+        store = TimingStore()
+        store.ingest_reports()
+        store.ingest_rows(events)
+        store.save()
+    return store
+
+
+def lpt_shards(items, workers, cost):
+    """Répartir `items` en `workers` lots, du plus long au plus court vers le lot le moins chargé"""
+    shards = [[] for _ in range(max(1, min(workers, len(items))))]
+    loads = [(0.0, k) for k in range(len(shards))]
+    for item in sorted(items, key=cost, reverse=True):
+        load, k = heapq.heappop(loads)
+        shards[k].append(item)
+        heapq.heappush(loads, (load + cost(item), k))
+    return shards
+
+
+def module_classes(path):
+    """Classes unittest.TestCase déclarées dans un module de test (sans l'importer)"""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+    return [node.name for node in tree.body if isinstance(node, ast.ClassDef)
+            and any(getattr(base, "attr", getattr(base, "id", None)) == "TestCase" for base in node.bases)]
+
+
+def discover_modules():
+    """Modules de test du dossier tests/"""
+    names = sorted(glob.glob(os.path.join(TESTS_DIR, "Test*.py")) + glob.glob(os.path.join(TESTS_DIR, "test_*.py")))
+    return [os.path.basename(name) for name in names]
+
+
+def run_suite(modules, workers, store):
+    """Lancer les modules en parallèle: chaque worker libre prend le plus long module restant"""
+    cost = {module: sum(store.class_duration(name) for name in module_classes(os.path.join(TESTS_DIR, module)))
+            for module in modules}
+    queue = sorted(modules, key=cost.get, reverse=True)
+    planned = [sum(cost[m] for m in shard) for shard in lpt_shards(modules, workers, cost.get)]
+    print(f"{len(modules)} module(s) sur {workers} worker(s): durée estimée {max(planned, default=0):.0f}s "
+          f"(idéal {sum(cost.values()) / workers:.0f}s)")
+    for module in queue:
+        print(f"  {module}: ~{cost[module]:.0f}s")
+
+    lock = threading.Lock()
+    failures = []
+
+    def worker(worker_index):
+        env = dict(os.environ, ODOO_RUN_ID=RUN_ID, ODOO_WORKER_INDEX=str(worker_index))
+        while True:
+            with lock:
+                if not queue:
+                    return
+                module = queue.pop(0)
+            start = time.monotonic()
+            code = subprocess.call([sys.executable, os.path.join(TESTS_DIR, module)], env=env)
+            print(f"[worker {worker_index}] {module}: {'OK' if code == 0 else 'ÉCHEC'} "
+                  f"en {time.monotonic() - start:.0f}s")
+            if code:
+                with lock:
+                    failures.append(module)
+
+    threads = [threading.Thread(target=worker, args=(k,)) for k in range(1, min(workers, len(modules)) + 1)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lancer les modules de test en parallèle, les plus longs d'abord")
+    parser.add_argument("modules", nargs="*", help="modules de tests/ (tous par défaut)")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("ODOO_WORKERS", "2")))
+    args = parser.parse_args()
+
+    store = TimingStore()
+    store.ingest_reports()
+    started = time.monotonic()
+    failures = run_suite(args.modules or discover_modules(), args.workers, store)
+    print(f"Suite terminée en {time.monotonic() - started:.0f}s, modules en échec: {failures or 'aucun'}")
+
+    # Rattraper les rapports écrits par un module interrompu avant sa mise à jour
+    update_timings()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Captures d'écran compressées, dédoublonnées et écrites par un thread d'arrière-plan"""
+import atexit
+import base64
+import hashlib
+import io
+import os
+import queue
+import threading
+
+from harness.logs import get_logger
+from harness.run import RUN_ID
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+log = get_logger("screenshots")
+
+
+def _dhash(data, size=16):
+    """Empreinte perceptuelle (différence de luminance horizontale)"""
+    image = Image.open(io.BytesIO(data)).convert("L").resize((size + 1, size))
+    pixels = list(image.getdata())
+    bits = 0
+    for row in range(size):
+        for col in range(size):
+            left = pixels[row * (size + 1) + col]
+            right = pixels[row * (size + 1) + col + 1]
+            bits = (bits << 1) | (left > right)
+    return bits
+
+
+class ScreenshotService:
+    """Capture JPEG côté navigateur, écriture asynchrone dans screenshots/<run_id>/"""
+
+    def __init__(self, run_dir=None, quality=60, similarity=6):
+        self.run_dir = run_dir or os.path.join("screenshots", RUN_ID)
+        self.quality = quality
+        self.similarity = similarity
+        self.queue = queue.Queue(maxsize=64)
+        self.previous = {}
+        self.skipped = 0
+        self.written = 0
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def capture(self, driver, name):
+        """Prendre la capture (seul appel bloquant pour le test) et la confier au thread d'écriture"""
+        if hasattr(driver, "execute_cdp_cmd"):
+            data = driver.execute_cdp_cmd("Page.captureScreenshot", {"format": "jpeg", "quality": self.quality})["data"]
+            self.queue.put((id(driver), name, "jpg", data))
+        else:
+            self.queue.put((id(driver), name, "png", driver.get_screenshot_as_base64()))
+
+    def flush(self):
+        """Attendre l'écriture de toutes les captures en file"""
+        self.queue.join()
+
+    def _is_duplicate(self, key, content):
+        digest = hashlib.sha1(content).hexdigest()
+        fingerprint = _dhash(content) if Image is not None else None
+        previous = self.previous.get(key)
+        self.previous[key] = (digest, fingerprint)
+        if previous is None:
+            return False
+        if previous[0] == digest:
+            return True
+        return fingerprint is not None and bin(previous[1] ^ fingerprint).count("1") <= self.similarity
+
+    def _worker(self):
+        while True:
+            key, name, extension, data = self.queue.get()
+            try:
+                content = base64.b64decode(data)
+                if self._is_duplicate(key, content):
+                    self.skipped += 1
+                    continue
+                os.makedirs(self.run_dir, exist_ok=True)
+                with open(os.path.join(self.run_dir, f"{name}.{extension}"), "wb") as f:
+                    f.write(content)
+                self.written += 1
+            except Exception as e:
+                log.error(f"Erreur écriture screenshot {name}: {e}")
+            finally:
+                self.queue.task_done()
+
+
+_shared = None
+
+
+def shared_screenshots():
+    """Service de captures du processus"""
+    global _shared
+    if _shared is None:
+        _shared = ScreenshotService()
+    return _shared
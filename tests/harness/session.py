@@ -0,0 +1,180 @@
+"""Cache de la session Odoo authentifiée, partagé entre tests et workers"""
+import http.cookiejar
+import json
+import os
+import re
+import time
+import urllib.parse
+import urllib.request
+
+from dotenv import load_dotenv
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+
+from harness.logs import get_logger
+
+load_dotenv()
+
+log = get_logger("session")
+
+SESSION_COOKIE = "session_id"
+CACHE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".odoo_session.json")
+
+_CSRF_RE = re.compile(r'name="csrf_token"\s+value="([^"]+)"')
+
+
+def odoo_url(base_url, path=""):
+    """Construire une URL Odoo sans double slash"""
+    return base_url.rstrip("/") + "/" + path.lstrip("/")
+
+
+def http_login(base_url, email, password, timeout=30):
+    """Se connecter via le formulaire /web/login en HTTP et retourner le cookie session_id"""
+    jar = http.cookiejar.CookieJar()
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(jar))
+    login_url = odoo_url(base_url, "web/login")
+
+    html = opener.open(login_url, timeout=timeout).read().decode("utf-8", "replace")
+    match = _CSRF_RE.search(html)
+    if not match:
+        raise RuntimeError("csrf_token introuvable sur /web/login")
+
+    data = urllib.parse.urlencode({
+        "login": email,
+        "password": password,
+        "csrf_token": match.group(1),
+        "redirect": "",
+    }).encode()
+    response = opener.open(login_url, data, timeout=timeout)
+    response.read()
+    if "/web/login" in response.geturl():
+        raise RuntimeError(f"Connexion refusée pour {email}")
+
+    for cookie in jar:
+        if cookie.name == SESSION_COOKIE:
+            return cookie.value, cookie.expires
+    raise RuntimeError("Cookie session_id absent après connexion")
+
+
+def session_is_valid(base_url, session_id, timeout=15):
+    """Vérifier côté serveur que la session est toujours authentifiée"""
+    request = urllib.request.Request(
+        odoo_url(base_url, "web/session/get_session_info"),
+        data=json.dumps({"jsonrpc": "2.0", "method": "call", "params": {}}).encode(),
+        headers={"Content-Type": "application/json", "Cookie": f"{SESSION_COOKIE}={session_id}"},
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            payload = json.loads(response.read().decode("utf-8"))
+    except Exception:
+        return False
+    return bool((payload.get("result") or {}).get("uid"))
+
+
+class SessionCache:
+    """Connexion unique à Odoo avec cookie session_id persisté et expiration contrôlée"""
+
+    def __init__(self, base_url, email, password, path=CACHE_FILE, ttl=12 * 3600, revalidate_after=300):
+        self.base_url = base_url
+        self.email = email
+        self.password = password
+        self.path = path
+        self.ttl = ttl
+        self.revalidate_after = revalidate_after
+        self.key = f"{odoo_url(base_url)}|{email}"
+
+    def _read_all(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_entry(self, entry):
+        entries = self._read_all()
+        if entry is None:
+            entries.pop(self.key, None)
+        else:
+            entries[self.key] = entry
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, self.path)
+
+    def invalidate(self):
+        """Oublier la session en cache"""
+        self._write_entry(None)
+
+    def renew(self):
+        """Ouvrir une nouvelle session et la mettre en cache"""
+        session_id, cookie_expires = http_login(self.base_url, self.email, self.password)
+        now = time.time()
+        expires = now + self.ttl
+        if cookie_expires:
+            expires = min(expires, cookie_expires)
+        self._write_entry({"session_id": session_id, "expires": expires, "validated": now})
+        log.info("Nouvelle session Odoo ouverte")
+        return session_id
+
+    def get(self):
+        """Retourner un session_id valide, en le revalidant ou le renouvelant si besoin"""
+        entry = self._read_all().get(self.key)
+        now = time.time()
+        if not entry or entry["expires"] <= now:
+            return self.renew()
+
+        if now - entry["validated"] > self.revalidate_after:
+            if not session_is_valid(self.base_url, entry["session_id"]):
+                return self.renew()
+            entry["validated"] = now
+            self._write_entry(entry)
+        return entry["session_id"]
+
+    def inject(self, driver, session_id):
+        """Poser le cookie de session dans le navigateur sans passer par le formulaire"""
+        parsed = urllib.parse.urlparse(self.base_url)
+        if hasattr(driver, "execute_cdp_cmd"):
+            driver.execute_cdp_cmd("Network.setCookie", {
+                "name": SESSION_COOKIE,
+                "value": session_id,
+                "domain": parsed.hostname,
+                "path": "/",
+                "secure": parsed.scheme == "https",
+                "httpOnly": True,
+            })
+        else:
+            driver.get(odoo_url(self.base_url, "web/login"))
+            driver.add_cookie({"name": SESSION_COOKIE, "value": session_id, "path": "/"})
+
+    def login_driver(self, driver, wait):
+        """Ouvrir le client web Odoo déjà authentifié dans ce navigateur"""
+        for attempt in range(2):
+            session_id = self.get()
+            self.inject(driver, session_id)
+            driver.get(odoo_url(self.base_url, "web"))
+            try:
+                wait.until(EC.any_of(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, ".o_main_navbar")),
+                    EC.presence_of_element_located((By.ID, "login")),
+                ))
+            except TimeoutException:
+                pass
+            if driver.find_elements(By.CSS_SELECTOR, ".o_main_navbar"):
+                return True
+
+            # Session expirée côté serveur: la renouveler une fois
+            log.info("Session Odoo périmée, renouvellement...")
+            self.invalidate()
+        return False
+
+
+_shared = None
+
+
+def shared_session():
+    """Cache de session du processus, configuré par ODOO_URL / ODOO_EMAIL / ODOO_PASSWORD"""
+    global _shared
+    if _shared is None:
+        _shared = SessionCache(os.getenv("ODOO_URL"), os.getenv("ODOO_EMAIL"), os.getenv("ODOO_PASSWORD"))
+    return _shared
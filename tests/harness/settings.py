@@ -0,0 +1,14 @@
+"""Accès à config.TEST_CONFIG (config.py à la racine du dépôt)"""
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from config import TEST_CONFIG  # noqa: E402
+
+
+def setting(key, default=None):
+    """Valeur de TEST_CONFIG"""
+    return TEST_CONFIG.get(key, default)
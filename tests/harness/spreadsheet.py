@@ -0,0 +1,146 @@
+"""Lecture en flux des feuilles de contacts (xlsx/csv) avec cache colonne sur disque"""
+import csv
+import datetime
+import hashlib
+import os
+
+import pandas as pd
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "spreadsheets")
+
+
+def file_hash(path):
+    """Empreinte SHA-256 du fichier, lue par blocs"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _cell_to_text(value):
+    if value is None or value != value:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    text = str(value).strip()
+    return text or None
+
+
+def _is_blank(row):
+    return all(cell is None for cell in row)
+
+
+def _parse_chunks(path, chunk_size):
+    """Découper le fichier source en DataFrames de cellules texte, sans tout charger (lignes vides ignorées)"""
+    if path.lower().endswith(".csv"):
+        for chunk in pd.read_csv(path, dtype=str, chunksize=chunk_size):
+            chunk = chunk.dropna(how="all")
+            if len(chunk):
+                yield chunk.astype(object).where(chunk.notna(), None)
+        return
+
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(c).strip() if c is not None else f"column_{i}" for i, c in enumerate(next(rows, []))]
+        # dtype object: cellules vides à None comme en csv et depuis le cache (pas de NaN inféré par pandas)
+        batch = []
+        for row in rows:
+            if _is_blank(row):
+                continue
+            batch.append([_cell_to_text(cell) for cell in row])
+            if len(batch) >= chunk_size:
+                yield pd.DataFrame(batch, columns=header, dtype=object)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=header, dtype=object)
+    finally:
+        workbook.close()
+
+
+def _parquet():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        return None
+    return pyarrow
+
+
+def count_rows(path, digest=None):
+    """Nombre de lignes de données, lignes vides exclues comme à la lecture
+
+    Lu dans les métadonnées du cache Parquet s'il existe, sinon compté en flux (la balise <dimension>
+    d'un xlsx est facultative et compte les lignes vides). `digest`: empreinte déjà calculée du fichier.
+    """
+    pa = _parquet()
+    cache_path = os.path.join(CACHE_DIR, f"{digest or file_hash(path)}.parquet")
+    if pa and os.path.exists(cache_path):
+        return pa.parquet.ParquetFile(cache_path).metadata.num_rows
+    if path.lower().endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = csv.reader(f)
+            next(rows, None)
+            return sum(1 for row in rows if any(row))
+
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        next(rows, None)
+        return sum(1 for row in rows if not _is_blank(row))
+    finally:
+        workbook.close()
+
+
+def iter_contact_chunks(path, chunk_size=500, digest=None):
+    """DataFrames successifs de `chunk_size` lignes; la feuille est mise en cache Parquet (si pyarrow)
+
+    `digest`: empreinte déjà calculée du fichier (évite de le relire pour le hacher).
+    """
+    pa = _parquet()
+    if pa is None:
+        yield from _parse_chunks(path, chunk_size)
+        return
+
+    cache_path = os.path.join(CACHE_DIR, f"{digest or file_hash(path)}.parquet")
+    if os.path.exists(cache_path):
+        for batch in pa.parquet.ParquetFile(cache_path).iter_batches(batch_size=chunk_size):
+            frame = batch.to_pandas()
+            yield frame.astype(object).where(frame.notna(), None)
+        return
+
+    # Premier passage: parser la feuille et écrire le cache au fil de l'eau
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    writer = None
+    try:
+        for frame in _parse_chunks(path, chunk_size):
+            table = pa.Table.from_pandas(frame.astype("string"), preserve_index=False)
+            if writer is None:
+                writer = pa.parquet.ParquetWriter(tmp_path, table.schema, compression="zstd")
+            writer.write_table(table)
+            yield frame
+    except BaseException:
+        if writer is not None:
+            writer.close()
+            os.remove(tmp_path)
+        raise
+    if writer is not None:
+        writer.close()
+        os.replace(tmp_path, cache_path)
+
+
+def iter_contacts(path, chunk_size=500):
+    """Lots successifs de lignes [(index, record)] numérotées depuis 0"""
+    offset = 0
+    for frame in iter_contact_chunks(path, chunk_size):
+        records = frame.to_dict("records")
+        yield list(enumerate(records, start=offset))
+        offset += len(records)
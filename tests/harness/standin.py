@@ -0,0 +1,515 @@
+"""Serveurs locaux de substitution (Odoo, TestRail) pour tester le harnais sans les instances distantes
+
+Usage (depuis le dossier tests/): python -m harness.standin --port 8069
+"""
+import argparse
+import html
+import itertools
+import json
+import secrets
+import threading
+import time
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+LOGIN_PAGE = """<!DOCTYPE html>
+<html><head><title>Login | Odoo</title></head><body>
+<form class="oe_login_form" role="form" method="post" action="/web/login">
+  <input type="hidden" name="csrf_token" value="{csrf_token}"/>
+  <input type="text" id="login" name="login" value="{login}" required="required" autofocus="autofocus"/>
+  <input type="password" id="password" name="password" required="required"/>
+  {error}
+  <button type="submit" class="btn btn-primary">Log in</button>
+</form>
+</body></html>
+"""
+
+LOGIN_ERROR = '<p class="alert alert-danger" role="alert">Wrong login/password</p>'
+LOGIN_COOLDOWN = ('<p class="alert alert-danger" role="alert">'
+                  'Too many login failures, please wait a bit before trying again.</p>')
+
+# Client web réduit: vues formulaire et kanban de res.partner pilotées par le hash de l'URL,
+# avec les sélecteurs utilisés par les tests (.o_form_view, button.o_form_button_save, .o_kanban_record...)
+WEBCLIENT_PAGE = r"""<!DOCTYPE html>
+<html><head><title>Odoo</title></head><body>
+<header class="o_main_navbar"><span class="o_menu_brand">Contacts</span></header>
+<div class="o_action_manager"></div>
+<script>
+window.odoo = {info: {server_version: "standin"}};
+(function () {
+  var FIELDS = ["name", "phone", "mobile", "email", "street", "street2", "city", "zip", "website"];
+  var root = document.querySelector(".o_action_manager");
+  var rpc = function (model, method, args, kwargs) {
+    return fetch("/web/dataset/call_kw/" + model + "/" + method, {
+      method: "POST", headers: {"Content-Type": "application/json"},
+      body: JSON.stringify({jsonrpc: "2.0", method: "call", params: {model: model, method: method, args: args, kwargs: kwargs || {}}})
+    }).then(function (r) { return r.json(); }).then(function (r) { return r.result; });
+  };
+  var params = function () {
+    var result = {};
+    location.hash.replace(/^#/, "").split("&").forEach(function (part) {
+      var kv = part.split("=");
+      if (kv[0]) { result[kv[0]] = decodeURIComponent(kv[1] || ""); }
+    });
+    return result;
+  };
+  var escape = function (value) {
+    return String(value || "").replace(/[&<>"]/g, function (c) { return "&#" + c.charCodeAt(0) + ";"; });
+  };
+  var renderForm = function (record) {
+    var inputs = FIELDS.map(function (f) {
+      var placeholder = f === "name" ? ' placeholder="e.g. Brandon Freeman"' : "";
+      return '<div class="o_field_widget"><input class="o_input" type="text" name="' + f + '" id="' + f + '"'
+        + placeholder + ' value="' + escape(record[f]) + '"/></div>';
+    }).join("");
+    root.innerHTML = '<div class="o_control_panel"><button class="o_form_button_create">New</button>'
+      + '<button class="o_form_button_save">Save</button></div>'
+      + '<div class="o_form_view o_form_editable"><div class="o_form_sheet">' + inputs + '</div></div>';
+    var save = root.querySelector(".o_form_button_save");
+    if (record.id) { save.style.display = "none"; }
+    root.querySelector(".o_form_sheet").addEventListener("input", function () { save.style.display = ""; });
+    root.querySelector(".o_form_button_create").addEventListener("click", function () {
+      location.hash = "model=res.partner&view_type=form";
+    });
+    save.addEventListener("click", function () {
+      var vals = {};
+      FIELDS.forEach(function (f) {
+        var value = root.querySelector('input[name="' + f + '"]').value;
+        if (value) { vals[f] = value; }
+      });
+      var done = function (id) {
+        save.style.display = "none";
+        location.hash = "id=" + id + "&model=res.partner&view_type=form";
+      };
+      if (record.id) {
+        rpc("res.partner", "write", [[record.id], vals]).then(function () { done(record.id); });
+      } else {
+        rpc("res.partner", "create", [vals]).then(done);
+      }
+    });
+  };
+  var renderKanban = function () {
+    root.innerHTML = '<div class="o_control_panel"></div><div class="o_kanban_view"></div>';
+    rpc("res.partner", "search_read", [[]], {fields: ["name", "email"], limit: 80}).then(function (records) {
+      root.querySelector(".o_kanban_view").innerHTML = '<div class="o_kanban_renderer">' + records.map(function (r) {
+        return '<div class="o_kanban_record"><strong>' + escape(r.name) + '</strong> ' + escape(r.email) + '</div>';
+      }).join("") + '</div>';
+    });
+  };
+  var route = function () {
+    var p = params();
+    if (p.view_type === "form") {
+      if (p.id) {
+        rpc("res.partner", "read", [[parseInt(p.id, 10)]]).then(function (r) { renderForm(r[0] || {}); });
+      } else {
+        renderForm({});
+      }
+    } else if (p.model) {
+      renderKanban();
+    }
+  };
+  fetch("/web/action/load", {method: "POST", headers: {"Content-Type": "application/json"},
+    body: JSON.stringify({jsonrpc: "2.0", method: "call", params: {action_id: params().action || "contacts"}})})
+    .then(route);
+  window.addEventListener("hashchange", route);
+})();
+</script>
+</body></html>
+"""
+
+
+def _leaf_matches(record, leaf):
+    field_name, operator, value = leaf
+    current = record.get(field_name)
+    if isinstance(current, list):
+        wanted = value if isinstance(value, (list, tuple)) else [value]
+        found = bool(set(current) & set(wanted))
+        return not found if operator in ("!=", "not in") else found
+    if operator == "=":
+        return current == value
+    if operator == "!=":
+        return current != value
+    if operator == "in":
+        return current in value
+    if operator == "not in":
+        return current not in value
+    if operator == ">":
+        return current is not None and current > value
+    if operator == "<":
+        return current is not None and current < value
+    if operator in ("like", "ilike"):
+        return current is not None and str(value).lower() in str(current).lower()
+    if operator == "=like":
+        return current is not None and str(current).startswith(str(value).rstrip("%"))
+    raise ValueError(f"Opérateur de domaine non supporté: {operator}")
+
+
+def domain_matches(record, domain):
+    """Évaluer un domaine Odoo (notation polonaise, & implicite) sur un enregistrement"""
+    stack = []
+    for token in reversed(domain):
+        if token == "!":
+            stack.append(not stack.pop())
+        elif token in ("&", "|"):
+            first, second = stack.pop(), stack.pop()
+            stack.append(first and second if token == "&" else first or second)
+        else:
+            stack.append(_leaf_matches(record, token))
+    return all(stack)
+
+
+class Model:
+    """Table en mémoire avec les méthodes ORM utilisées par le harnais"""
+
+    def __init__(self, name):
+        self.name = name
+        self.records = {}
+        self._ids = itertools.count(1)
+
+    def _read(self, record, fields):
+        if not fields:
+            return dict(record)
+        return {"id": record["id"], **{f: record.get(f, False) for f in fields}}
+
+    def create(self, vals_list):
+        single = isinstance(vals_list, dict)
+        ids = []
+        for vals in [vals_list] if single else vals_list:
+            record_id = next(self._ids)
+            record = {"active": True, **vals, "id": record_id}
+            for field_name, value in vals.items():
+                # Commandes x2many: (6, 0, ids) et (4, id)
+                if isinstance(value, list) and value and isinstance(value[0], (list, tuple)):
+                    record[field_name] = []
+                    self._apply_commands(record, field_name, value)
+            self.records[record_id] = record
+            ids.append(record_id)
+        return ids[0] if single else ids
+
+    @staticmethod
+    def _apply_commands(record, field_name, commands):
+        current = record.setdefault(field_name, [])
+        for command in commands:
+            if command[0] == 6:
+                current[:] = list(command[2])
+            elif command[0] == 4 and command[1] not in current:
+                current.append(command[1])
+            elif command[0] == 3 and command[1] in current:
+                current.remove(command[1])
+
+    def search(self, domain, offset=0, limit=None, order=None):
+        ids = [r["id"] for r in self.records.values() if domain_matches(r, domain)]
+        if order and order.startswith("id desc"):
+            ids.reverse()
+        return ids[offset:offset + limit if limit else None]
+
+    def search_count(self, domain, limit=None):
+        return len(self.search(domain, limit=limit))
+
+    def search_read(self, domain=None, fields=None, offset=0, limit=None, order=None):
+        return [self._read(self.records[i], fields) for i in self.search(domain or [], offset, limit, order)]
+
+    def read(self, ids, fields=None):
+        return [self._read(self.records[i], fields) for i in ids if i in self.records]
+
+    def write(self, ids, vals):
+        for record_id in ids:
+            record = self.records[record_id]
+            for field_name, value in vals.items():
+                if isinstance(value, list) and value and isinstance(value[0], (list, tuple)):
+                    self._apply_commands(record, field_name, value)
+                else:
+                    record[field_name] = value
+        return True
+
+    def unlink(self, ids):
+        for record_id in ids:
+            self.records.pop(record_id, None)
+        return True
+
+
+class StandInOdoo:
+    """Instance Odoo simulée: login, client web minimal et JSON-RPC call_kw"""
+
+    def __init__(self, email="admin@example.com", password="admin", host="127.0.0.1", port=0, latency=0.0,
+                 login_cooldown_after=5, login_cooldown_s=60):
+        self.email = email
+        self.password = password
+        self.latency = latency
+        # Blocage par IP comme Odoo (base.login_cooldown_after / _duration): compteur remis à zéro
+        # seulement par une connexion réussie
+        self.login_cooldown_after = login_cooldown_after
+        self.login_cooldown_s = login_cooldown_s
+        self.login_failures = {}
+        self.models = {"res.partner": Model("res.partner"), "res.partner.category": Model("res.partner.category")}
+        self.sessions = set()
+        self.csrf_tokens = set()
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._handler_class())
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def call_kw(self, model, method, args, kwargs):
+        """Exécuter une méthode ORM simulée"""
+        if model not in self.models or method.startswith("_") or not hasattr(Model, method):
+            raise ValueError(f"Méthode non supportée: {model}.{method}")
+        # Pas d'enregistrements archivés ni de langue ici: le contexte est ignoré
+        kwargs = {key: value for key, value in kwargs.items() if key != "context"}
+        with self.lock:
+            return getattr(self.models[model], method)(*args, **kwargs)
+
+    def _handler_class(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _session(self):
+                cookie = SimpleCookie(self.headers.get("Cookie", ""))
+                morsel = cookie.get("session_id")
+                return morsel.value if morsel and morsel.value in standin.sessions else None
+
+            def _body(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                return self.rfile.read(length) if length else b""
+
+            def _send(self, status, body, content_type="text/html; charset=utf-8", headers=None):
+                data = body.encode("utf-8") if isinstance(body, str) else body
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _json(self, payload):
+                self._send(200, json.dumps(payload), "application/json")
+
+            def _login_page(self, login="", error=""):
+                token = secrets.token_hex(16)
+                standin.csrf_tokens.add(token)
+                page = LOGIN_PAGE.format(csrf_token=token, login=html.escape(login), error=error)
+                self._send(200, page)
+
+            def do_GET(self):
+                time.sleep(standin.latency)
+                path = urlparse(self.path).path
+                if path in ("/", "/web", "/odoo"):
+                    if self._session():
+                        self._send(200, standin.webclient_page())
+                    else:
+                        self._send(303, "", headers={"Location": "/web/login"})
+                elif path == "/web/login":
+                    self._login_page()
+                else:
+                    self._send(404, "Not Found")
+
+            def do_POST(self):
+                time.sleep(standin.latency)
+                path = urlparse(self.path).path
+                body = self._body()
+                if path == "/web/login":
+                    form = {k: v[0] for k, v in parse_qs(body.decode("utf-8"), keep_blank_values=True).items()}
+                    source = self.client_address[0]
+                    with standin.lock:
+                        failures, previous = standin.login_failures.get(source, (0, 0.0))
+                    if (standin.login_cooldown_after and failures >= standin.login_cooldown_after
+                            and time.monotonic() - previous < standin.login_cooldown_s):
+                        self._login_page(form.get("login", ""), LOGIN_COOLDOWN)
+                        return
+                    valid = (form.get("csrf_token") in standin.csrf_tokens
+                             and form.get("login") == standin.email
+                             and form.get("password") == standin.password)
+                    with standin.lock:
+                        if valid:
+                            standin.login_failures.pop(source, None)
+                        else:
+                            failures, _ = standin.login_failures.get(source, (0, 0.0))
+                            standin.login_failures[source] = (failures + 1, time.monotonic())
+                    if not valid:
+                        self._login_page(form.get("login", ""), LOGIN_ERROR)
+                        return
+                    session_id = secrets.token_hex(20)
+                    standin.sessions.add(session_id)
+                    self._send(303, "", headers={
+                        "Location": "/web",
+                        "Set-Cookie": f"session_id={session_id}; Path=/; HttpOnly",
+                    })
+                    return
+
+                request = json.loads(body or b"{}")
+                params = request.get("params", {})
+                if path == "/web/session/get_session_info":
+                    self._json({"jsonrpc": "2.0", "id": request.get("id"),
+                                "result": {"uid": 2 if self._session() else None}})
+                elif path == "/web/action/load":
+                    self._json({"jsonrpc": "2.0", "id": request.get("id"), "result": {
+                        "type": "ir.actions.act_window", "res_model": "res.partner",
+                        "views": [[False, "kanban"], [False, "form"]]}})
+                elif path.startswith("/web/dataset/call_kw"):
+                    if not self._session():
+                        self._json({"jsonrpc": "2.0", "id": request.get("id"), "error": {
+                            "code": 100, "message": "Odoo Session Expired",
+                            "data": {"name": "odoo.http.SessionExpiredException", "message": "Session expired"}}})
+                        return
+                    try:
+                        result = standin.call_kw(params["model"], params["method"],
+                                                 params.get("args", []), params.get("kwargs", {}))
+                    except Exception as e:
+                        self._json({"jsonrpc": "2.0", "id": request.get("id"), "error": {
+                            "code": 200, "message": "Odoo Server Error",
+                            "data": {"name": type(e).__name__, "message": str(e)}}})
+                        return
+                    self._json({"jsonrpc": "2.0", "id": request.get("id"), "result": result})
+                else:
+                    self._send(404, "Not Found")
+
+        return Handler
+
+    def webclient_page(self):
+        return WEBCLIENT_PAGE
+
+
+class StandInTestRail:
+    """API TestRail v2 simulée (projets, sections, cas, runs et résultats), avec erreurs injectables"""
+
+    def __init__(self, project="ModuleContactOdoo", host="127.0.0.1", port=0):
+        self.projects = [{"id": 1, "name": project}]
+        self.sections = []
+        self.cases = []
+        self.runs = {}
+        self.results = []
+        self.calls = []
+        # Statuts HTTP renvoyés (un par requête) avant de répondre normalement, ex. [429, 500]
+        self.fail_next = []
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._handler_class())
+        self.server.daemon_threads = True
+        self._ids = itertools.count(1)
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def handle(self, method, endpoint, payload):
+        """Exécuter un appel `endpoint` (ex. get_cases/1); retourne (statut, réponse)"""
+        name, _, rest = endpoint.partition("/")
+        target = int(rest.split("&")[0]) if rest.split("&")[0].isdigit() else None
+        with self.lock:
+            self.calls.append(name)
+            if self.fail_next:
+                return self.fail_next.pop(0), {"error": "stand-in failure"}
+            if name == "get_projects":
+                return 200, {"offset": 0, "size": len(self.projects), "projects": self.projects}
+            if name == "get_sections":
+                return 200, {"offset": 0, "size": len(self.sections), "sections": self.sections}
+            if name == "get_cases":
+                return 200, {"offset": 0, "size": len(self.cases), "cases": self.cases}
+            if name == "add_section":
+                section = {"id": next(self._ids), "name": payload["name"]}
+                self.sections.append(section)
+                return 200, section
+            if name == "add_case":
+                case = {"id": next(self._ids), "section_id": target, "title": payload["title"]}
+                self.cases.append(case)
+                return 200, case
+            if name == "add_run":
+                run = {"id": next(self._ids), **payload}
+                self.runs[run["id"]] = run
+                return 200, run
+            if name in ("update_run", "add_results_for_cases") and target not in self.runs:
+                return 400, {"error": "Field :run_id is not a valid test run."}
+            if name == "update_run":
+                self.runs[target].update(payload)
+                return 200, self.runs[target]
+            if name == "add_results_for_cases":
+                self.results.extend(payload["results"])
+                return 200, [{"id": next(self._ids), **result} for result in payload["results"]]
+        return 404, {"error": f"Unknown method {name}"}
+
+    def _handler_class(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _dispatch(self, method):
+                endpoint = urlparse(self.path).query.partition("/api/v2/")[2]
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length) or b"{}") if length else {}
+                status, response = standin.handle(method, endpoint, payload)
+                data = json.dumps(response).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                if status == 429:
+                    self.send_header("Retry-After", "0")
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._dispatch("GET")
+
+            def do_POST(self):
+                self._dispatch("POST")
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serveur Odoo local de substitution")
+    parser.add_argument("--port", type=int, default=8069)
+    parser.add_argument("--email", default="admin@example.com")
+    parser.add_argument("--password", default="admin")
+    parser.add_argument("--latency", type=float, default=0.0, help="latence ajoutée à chaque réponse (s)")
+    args = parser.parse_args()
+
+    standin = StandInOdoo(args.email, args.password, port=args.port, latency=args.latency)
+    print(f"Odoo de substitution sur {standin.url}")
+    try:
+        standin.server.serve_forever()
+    except KeyboardInterrupt:
+        standin.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
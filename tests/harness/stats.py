@@ -0,0 +1,11 @@
+"""Petites statistiques sur des durées"""
+import math
+
+
+def percentile(values, q):
+    """Percentile `q` (0-100) par rang le plus proche; 0.0 si aucune valeur"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = min(len(ordered), max(1, math.ceil(q / 100.0 * len(ordered))))
+    return ordered[rank - 1]
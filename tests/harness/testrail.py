@@ -0,0 +1,268 @@
+"""Publication des résultats dans TestRail pendant le run: cas mis en cache, envois groupés en tâche de fond
+
+Configuration: trcli-config.yml (host, project, username, password, title, auto_create_*),
+surchargeable par TESTRAIL_HOST / TESTRAIL_PROJECT / TESTRAIL_USERNAME / TESTRAIL_PASSWORD.
+Activation: config.testrail_publish ou TESTRAIL_PUBLISH=1.
+"""
+import base64
+import json
+import os
+import queue
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from harness.logs import get_logger
+from harness.run import RUN_ID
+from harness.settings import setting
+
+log = get_logger("testrail")
+
+TESTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFIG_FILE = os.path.join(os.path.dirname(TESTS_DIR), "trcli-config.yml")
+CASE_CACHE_FILE = os.path.join(TESTS_DIR, ".cache", "testrail_cases.json")
+
+STATUS_IDS = {"passed": 1, "blocked": 2, "retest": 4, "failed": 5}
+
+
+class TestRailError(Exception):
+    """Réponse d'erreur définitive de l'API TestRail"""
+
+
+def load_config(path=CONFIG_FILE):
+    """Clés `clé: valeur` de trcli-config.yml, complétées par les variables TESTRAIL_*"""
+    config = {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                key, sep, value = line.partition(":")
+                if not sep or line.startswith((" ", "#")):
+                    continue
+                value = value.strip().strip("\"'")
+                config[key.strip()] = {"true": True, "false": False}.get(value.lower(), value)
+    except OSError:
+        pass
+    for key in ("host", "project", "username", "password"):
+        config[key] = os.getenv(f"TESTRAIL_{key.upper()}", config.get(key))
+    return config
+
+
+def publishing_enabled():
+    return os.getenv("TESTRAIL_PUBLISH", "").lower() in ("1", "true", "yes") or bool(setting("testrail_publish"))
+
+
+class TestRailClient:
+    """Client API v2 avec reprise (429 et erreurs serveur) et attente exponentielle"""
+
+    def __init__(self, host, username, password, timeout=30, retries=5, backoff=1.0):
+        self.base_url = host.rstrip("/") + "/index.php?/api/v2/"
+        token = base64.b64encode(f"{username}:{password}".encode("utf-8")).decode("ascii")
+        self.headers = {"Authorization": f"Basic {token}", "Content-Type": "application/json"}
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+
+    def send(self, endpoint, payload=None):
+        """GET (sans payload) ou POST d'un appel API; retourne la réponse JSON"""
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        for attempt in range(self.retries + 1):
+            request = urllib.request.Request(self.base_url + endpoint, data=data, headers=self.headers)
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    return json.loads(response.read().decode("utf-8") or "null")
+            except urllib.error.HTTPError as e:
+                body = e.read().decode("utf-8", "replace")
+                if e.code != 429 and e.code < 500:
+                    raise TestRailError(f"{endpoint}: HTTP {e.code} {body}")
+                if attempt == self.retries:
+                    raise TestRailError(f"{endpoint}: HTTP {e.code} après {attempt + 1} tentatives")
+                retry_after = e.headers.get("Retry-After")
+                delay = float(retry_after) if retry_after else self.backoff * 2 ** attempt
+            except urllib.error.URLError as e:
+                if attempt == self.retries:
+                    raise TestRailError(f"{endpoint}: {e.reason}")
+                delay = self.backoff * 2 ** attempt
+            time.sleep(delay * random.uniform(0.5, 1.5))
+
+    def paged(self, endpoint, key):
+        """Toutes les entrées d'une liste, paginée (API récente) ou non"""
+        items = []
+        while endpoint:
+            response = self.send(endpoint)
+            if isinstance(response, list):
+                return items + response
+            items.extend(response.get(key, []))
+            next_link = (response.get("_links") or {}).get("next")
+            endpoint = next_link.partition("/api/v2/")[2] if next_link else None
+        return items
+
+
+class CaseMap:
+    """Id de test (Classe.méthode) -> id de cas TestRail, en cache local par hôte et projet"""
+
+    def __init__(self, client, project_id, auto_create_sections=False, auto_create_cases=False,
+                 path=CASE_CACHE_FILE):
+        self.client = client
+        self.project_id = project_id
+        self.auto_create_sections = auto_create_sections
+        self.auto_create_cases = auto_create_cases
+        self.path = path
+        self.scope = f"{client.base_url}|{project_id}"
+        self.cache = self._read().get(self.scope, {})
+        self._remote = None
+
+    def _read(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        data = self._read()
+        data[self.scope] = self.cache
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def _load_remote(self):
+        """Sections et cas du projet, lus une seule fois et seulement en cas d'absence du cache"""
+        if self._remote is None:
+            sections = {s["name"]: s["id"] for s in self.client.paged(f"get_sections/{self.project_id}", "sections")}
+            cases = {(c["section_id"], c["title"]): c["id"]
+                     for c in self.client.paged(f"get_cases/{self.project_id}", "cases")}
+            self._remote = (sections, cases)
+        return self._remote
+
+    def resolve(self, test_ids):
+        """{id de test: id de cas} des tests connus ou créés (les autres sont omis)"""
+        missing = [test_id for test_id in test_ids if test_id not in self.cache]
+        if missing:
+            sections, cases = self._load_remote()
+            for test_id in missing:
+                section_name, _, title = test_id.rpartition(".")
+                section_id = sections.get(section_name)
+                if section_id is None and self.auto_create_sections:
+                    section_id = self.client.send(f"add_section/{self.project_id}", {"name": section_name})["id"]
+                    sections[section_name] = section_id
+                case_id = cases.get((section_id, title))
+                if case_id is None and section_id is not None and self.auto_create_cases:
+                    case_id = self.client.send(f"add_case/{section_id}", {"title": title})["id"]
+                    cases[(section_id, title)] = case_id
+                if case_id is not None:
+                    self.cache[test_id] = case_id
+            self._save()
+        return {test_id: self.cache[test_id] for test_id in test_ids if test_id in self.cache}
+
+
+class ResultPublisher:
+    """Envoie les résultats par lots `add_results_for_cases` depuis un thread, pendant l'exécution des tests"""
+
+    def __init__(self, client, config, run_name, batch_size=50, flush_interval=5.0, case_cache=CASE_CACHE_FILE):
+        self.client = client
+        self.config = config
+        self.run_name = run_name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.case_cache = case_cache
+        self.queue = queue.Queue()
+        self.run_id = None
+        self.case_ids = set()
+        self.cases = None
+        self.published = 0
+        self._thread = threading.Thread(target=self._worker, name="testrail-publisher", daemon=True)
+        self._thread.start()
+
+    def publish(self, test_id, status, elapsed=None, comment=""):
+        """Mettre un résultat en file (statut: passed, failed, blocked, retest)"""
+        self.queue.put({"test_id": test_id, "status": status, "elapsed": elapsed, "comment": comment})
+
+    def close(self, timeout=120):
+        """Envoyer les derniers résultats et arrêter le thread"""
+        self.queue.put(None)
+        self._thread.join(timeout)
+
+    def _worker(self):
+        pending = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                item = self.queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = False
+            if item:
+                pending.append(item)
+            if pending and (item is None or item is False or len(pending) >= self.batch_size):
+                self._flush(pending)
+                pending = []
+            if item is None:
+                return
+            if item is False or not pending:
+                deadline = time.monotonic() + self.flush_interval
+
+    def _project_id(self):
+        name = self.config.get("project")
+        for project in self.client.paged("get_projects", "projects"):
+            if project["name"] == name:
+                return project["id"]
+        raise TestRailError(f"Projet TestRail introuvable: {name}")
+
+    def _flush(self, results):
+        try:
+            if self.cases is None:
+                self.cases = CaseMap(self.client, self._project_id(),
+                                     self.config.get("auto_create_sections", False),
+                                     self.config.get("auto_create_cases", False), self.case_cache)
+            case_ids = self.cases.resolve([result["test_id"] for result in results])
+            unknown = [result["test_id"] for result in results if result["test_id"] not in case_ids]
+            if unknown:
+                log.warning(f"TestRail: cas introuvables, résultats ignorés: {unknown}")
+            if not case_ids:
+                return
+
+            # Run limité aux cas exécutés, étendu au fil des lots
+            if not set(case_ids.values()) <= self.case_ids:
+                self.case_ids |= set(case_ids.values())
+                payload = {"case_ids": sorted(self.case_ids)}
+                if self.run_id is None:
+                    payload.update(name=self.run_name, include_all=False)
+                    self.run_id = self.client.send(f"add_run/{self.cases.project_id}", payload)["id"]
+                else:
+                    self.client.send(f"update_run/{self.run_id}", payload)
+
+            self.client.send(f"add_results_for_cases/{self.run_id}", {"results": [
+                {"case_id": case_ids[result["test_id"]], "status_id": STATUS_IDS[result["status"]],
+                 "comment": result["comment"],
+                 **({"elapsed": f"{max(1, round(result['elapsed']))}s"} if result["elapsed"] else {})}
+                for result in results if result["test_id"] in case_ids]})
+            self.published += len(case_ids)
+        except Exception as e:
+            log.error(f"TestRail: échec d'envoi de {len(results)} résultat(s): {e}")
+
+
+_shared = None
+
+
+def shared_publisher(suite_name=""):
+    """Publieur TestRail du processus, ou None si la publication est désactivée ou non configurée"""
+    global _shared
+    if _shared is None and publishing_enabled():
+        config = load_config()
+        if not all(config.get(key) for key in ("host", "project", "username", "password")):
+            log.warning("TestRail: configuration incomplète, publication désactivée")
+            return None
+        client = TestRailClient(config["host"], config["username"], config["password"])
+        run_name = " ".join(part for part in (config.get("title", "Tests"), RUN_ID, suite_name) if part)
+        _shared = ResultPublisher(client, config, run_name)
+    return _shared
+
+
+def close_publisher():
+    """Vider la file du publieur du processus (fin de run)"""
+    if _shared is not None:
+        _shared.close()
+        log.info(f"TestRail: {_shared.published} résultat(s) publié(s) dans le run {_shared.run_id}")
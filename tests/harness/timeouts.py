@@ -0,0 +1,111 @@
+"""Délais d'attente adaptatifs: percentiles des latences observées par type d'attente, conservés entre les runs"""
+import atexit
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from harness.settings import setting
+from harness.stats import percentile
+
+TIMEOUTS_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "timeouts.json")
+WINDOW = 500
+
+
+class AdaptiveTimeouts:
+    """Délai par type d'attente = percentile des durées observées x marge, borné; défaut tant que l'historique est court
+
+    Une attente expirée compte pour le délai entier qu'elle a consommé (valeur censurée, minorant de la
+    vraie latence): pendant un pic de latence, ces mesures font monter le percentile et donc le délai.
+    """
+
+    def __init__(self, path=TIMEOUTS_FILE):
+        options = setting("adaptive_timeouts", {})
+        self.path = path
+        self.enabled = options.get("enabled", True)
+        self.quantile = options.get("quantile", 99)
+        self.factor = options.get("factor", 3.0)
+        self.minimum = options.get("min_s", 2.0)
+        self.maximum = options.get("max_s", 60.0)
+        self.min_samples = options.get("min_samples", 20)
+        self.samples = self._read()
+        self._new = {}
+        self._lock = threading.Lock()
+
+    def _read(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def timeout(self, kind, default=None):
+        """Délai (s) pour une attente de type `kind`"""
+        default = setting("timeout", 10) if default is None else default
+        with self._lock:
+            samples = self.samples.get(kind, [])
+            if not self.enabled or len(samples) < self.min_samples:
+                return default
+            budget = percentile(samples, self.quantile) * self.factor
+        return round(min(self.maximum, max(self.minimum, budget)), 2)
+
+    def observe(self, kind, seconds):
+        """Enregistrer la durée d'une attente réussie, ou le délai consommé par une attente expirée"""
+        with self._lock:
+            self.samples.setdefault(kind, []).append(round(seconds, 3))
+            del self.samples[kind][:-WINDOW]
+            self._new.setdefault(kind, []).append(round(seconds, 3))
+
+    @contextmanager
+    def measure(self, kind):
+        """Chronométrer un bloc; une sortie sans erreur ou par délai dépassé compte comme observation"""
+        start = time.monotonic()
+        try:
+            yield
+        except TimeoutException:
+            self.observe(kind, time.monotonic() - start)
+            raise
+        self.observe(kind, time.monotonic() - start)
+
+    def save(self):
+        """Ajouter les nouvelles mesures au fichier (relu pour ne pas écraser celles des autres processus)"""
+        with self._lock:
+            if not self._new:
+                return
+            data = self._read()
+            for kind, values in self._new.items():
+                data[kind] = (data.get(kind, []) + values)[-WINDOW:]
+            self._new = {}
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+
+class AdaptiveWait(WebDriverWait):
+    """WebDriverWait dont le délai suit l'historique du type d'attente, et qui enregistre ses durées"""
+
+    def __init__(self, driver, kind="element", default=None):
+        self.kind = kind
+        super().__init__(driver, shared_timeouts().timeout(kind, default))
+
+    def until(self, method, message=""):
+        with shared_timeouts().measure(self.kind):
+            return super().until(method, message)
+
+
+_shared = None
+
+
+def shared_timeouts():
+    """Délais adaptatifs du processus, sauvegardés à la sortie"""
+    global _shared
+    if _shared is None:
+        _shared = AdaptiveTimeouts()
+        atexit.register(_shared.save)
+    return _shared
@@ -0,0 +1,143 @@
+"""Spans chronométrés des étapes du flux et comptage des commandes WebDriver par span"""
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from harness.stats import percentile
+
+
+class Tracer:
+    """Collecte les spans du processus (format Chrome trace) et les commandes WebDriver émises dedans"""
+
+    def __init__(self):
+        self.origin = time.time()
+        self.events = []
+        self.current_test = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _stack(self):
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def span(self, name, **args):
+        """Chronométrer un bloc; les commandes WebDriver sont attribuées au span le plus interne"""
+        span = {"name": name, "commands": 0, "command_s": 0.0, "args": args}
+        stack = self._stack()
+        stack.append(span)
+        start = time.time()
+        try:
+            yield span
+        finally:
+            duration = time.time() - start
+            stack.pop()
+            event = {
+                "name": name,
+                "cat": "step",
+                "ph": "X",
+                "ts": int((start - self.origin) * 1e6),
+                "dur": int(duration * 1e6),
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": {"test": self.current_test, "commands": span["commands"],
+                         "command_ms": round(span["command_s"] * 1000, 3), **args},
+            }
+            with self._lock:
+                self.events.append(event)
+
+    def instrument(self, driver):
+        """Compter chaque commande WebDriver de ce navigateur (une seule fois par navigateur)"""
+        if getattr(driver, "_traced", False):
+            return driver
+        original = driver.execute
+
+        def execute(driver_command, params=None):
+            start = time.perf_counter()
+            try:
+                return original(driver_command, params)
+            finally:
+                stack = self._stack()
+                if stack:
+                    stack[-1]["commands"] += 1
+                    stack[-1]["command_s"] += time.perf_counter() - start
+
+        driver.execute = execute
+        driver._traced = True
+        return driver
+
+    def export(self):
+        """Retirer et retourner les événements (pour les remonter d'un worker au processus principal)"""
+        with self._lock:
+            events, self.events = self.events, []
+        return events
+
+    def merge(self, events):
+        """Ajouter des événements venant d'un autre processus"""
+        with self._lock:
+            self.events.extend(events)
+
+    def summary(self, test=None):
+        """Statistiques par nom de span: nombre, total, p50/p95, commandes et leur latence"""
+        spans = {}
+        for event in self.events:
+            if test is not None and event["args"].get("test") != test:
+                continue
+            spans.setdefault(event["name"], []).append(event)
+        result = {}
+        for name, events in spans.items():
+            durations = [e["dur"] / 1e6 for e in events]
+            result[name] = {
+                "count": len(events),
+                "total_s": round(sum(durations), 3),
+                "p50_s": round(percentile(durations, 50), 3),
+                "p95_s": round(percentile(durations, 95), 3),
+                "commands": sum(e["args"]["commands"] for e in events),
+                "command_s": round(sum(e["args"]["command_ms"] for e in events) / 1000, 3),
+            }
+        return result
+
+    def junit_properties(self, test=None):
+        """Résumé à plat pour les <properties> JUnit"""
+        properties = {}
+        for name, stats in sorted(self.summary(test).items()):
+            for key, value in stats.items():
+                properties[f"span.{name}.{key}"] = value
+        return properties
+
+    def write_chrome_trace(self, path, metadata=None):
+        """Écrire les spans au format Chrome trace (chrome://tracing, Perfetto), avec `metadata` du run"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms", "metadata": metadata or {}}, f)
+
+
+_shared = None
+
+
+def shared_tracer():
+    """Traceur du processus"""
+    global _shared
+    if _shared is None:
+        _shared = Tracer()
+    return _shared
+
+
+def span(name, **args):
+    """Span sur le traceur du processus"""
+    return shared_tracer().span(name, **args)
+
+
+def traced(name=None):
+    """Décorateur: chronométrer chaque appel de la méthode dans un span"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with shared_tracer().span(name or func.__name__):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
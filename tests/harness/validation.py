@@ -0,0 +1,70 @@
+"""Validation et normalisation vectorisées des contacts, avant tout navigateur"""
+import pandas as pd
+
+from harness.settings import setting
+
+EMAIL_PATTERN = r"^[^@\s]+@[^@\s]+\.[^@\s]+$"
+PHONE_PATTERN = r"^\+?\d{6,15}$"
+PHONE_COLUMNS = ("phone", "mobile")
+# Code postal générique: 3 à 10 caractères alphanumériques, espaces ou tirets internes (75000, SW1A 1AA, 94105-1234)
+ZIP_PATTERN = r"^[0-9A-Z][0-9A-Z -]{1,8}[0-9A-Z]$"
+
+
+def normalize_contacts(frame):
+    """Cellules en texte nettoyé: espaces, '.0' des nombres Excel, téléphones, emails et codes postaux
+
+    Un code postal numérique plus court que `zip_digits` (config.py) est complété par des zéros à gauche:
+    Excel stocke 01000 comme le nombre 1000.
+    """
+    frame = frame.astype("string").apply(lambda column: column.str.strip())
+    frame = frame.replace("", pd.NA)
+    for column in frame.columns:
+        frame[column] = frame[column].str.replace(r"^(\d+)\.0$", r"\1", regex=True)
+    for column in PHONE_COLUMNS:
+        if column in frame:
+            frame[column] = frame[column].str.replace(r"(?!^\+)[^\d]", "", regex=True)
+    if "email" in frame:
+        frame["email"] = frame["email"].str.lower()
+    if "zip" in frame:
+        frame["zip"] = frame["zip"].str.upper().str.replace(r"\s+", " ", regex=True)
+        digits = setting("zip_digits")
+        if digits:
+            numeric = frame["zip"].str.fullmatch(r"\d+").fillna(False).astype(bool)
+            frame.loc[numeric, "zip"] = frame.loc[numeric, "zip"].str.zfill(digits)
+    return frame
+
+
+def validate_contacts(frame, known_columns, required=("name",), offset=0):
+    """Retourner (lignes valides [(index, record)], rejets [(index, nom, raisons)], colonnes inconnues)"""
+    unknown_columns = [c for c in frame.columns if c not in known_columns]
+    frame = normalize_contacts(frame[[c for c in frame.columns if c in known_columns]])
+    frame.index = pd.RangeIndex(offset, offset + len(frame))
+
+    checks = {}
+    for column in required:
+        if column in frame:
+            checks[f"{column} manquant"] = frame[column].isna()
+        else:
+            checks[f"colonne {column} absente"] = pd.Series(True, index=frame.index)
+    if "email" in frame:
+        checks["email invalide"] = frame["email"].notna() & ~frame["email"].str.match(EMAIL_PATTERN).fillna(False)
+    for column in PHONE_COLUMNS:
+        if column in frame:
+            checks[f"{column} invalide"] = frame[column].notna() & ~frame[column].str.match(PHONE_PATTERN).fillna(False)
+    if "zip" in frame:
+        pattern = setting("zip_pattern", ZIP_PATTERN)
+        checks["zip invalide"] = frame["zip"].notna() & ~frame["zip"].str.match(pattern).fillna(False)
+
+    masks = pd.DataFrame(checks, index=frame.index)
+    rejected = masks.any(axis=1)
+
+    rejects = []
+    for index, row in masks[rejected].iterrows():
+        name = frame.at[index, "name"] if "name" in frame else None
+        reasons = [reason for reason, failed in row.items() if failed]
+        rejects.append((index, name if pd.notna(name) else f"Contact {index + 1}", reasons))
+
+    valid = frame[~rejected].astype(object)
+    valid = valid.where(valid.notna(), None)
+    rows = list(zip(valid.index, valid.to_dict("records")))
+    return rows, rejects, unknown_columns
@@ -0,0 +1,205 @@
+"""Attentes Odoo pilotées par les événements du navigateur (mutations DOM et requêtes réseau)"""
+import time
+
+from selenium.common.exceptions import JavascriptException, TimeoutException
+
+from harness.timeouts import shared_timeouts
+
+# Instrumentation injectée dans chaque document: compte les requêtes fetch/XHR en cours
+# et notifie les attentes à chaque mutation du DOM, fin de requête ou changement d'URL.
+INSTRUMENTATION_JS = r"""
+(function () {
+  if (window.__odooWait) { return; }
+  var state = window.__odooWait = {
+    pending: 0,
+    page: Math.random().toString(36).slice(2),
+    listeners: [],
+    notify: function () {
+      state.listeners.slice().forEach(function (listener) { listener(); });
+    }
+  };
+  var tracked = function (url) { return !/longpolling|\/bus\/|websocket/.test(String(url)); };
+  var done = function () { state.pending = Math.max(0, state.pending - 1); state.notify(); };
+
+  if (window.fetch) {
+    var originalFetch = window.fetch;
+    window.fetch = function (input) {
+      if (!tracked(input && input.url ? input.url : input)) { return originalFetch.apply(this, arguments); }
+      state.pending++;
+      state.notify();
+      return originalFetch.apply(this, arguments).finally(done);
+    };
+  }
+  var originalOpen = XMLHttpRequest.prototype.open;
+  XMLHttpRequest.prototype.open = function (method, url) {
+    this.__odooTracked = tracked(url);
+    return originalOpen.apply(this, arguments);
+  };
+  var originalSend = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.send = function () {
+    if (this.__odooTracked) {
+      state.pending++;
+      state.notify();
+      this.addEventListener('loadend', done);
+    }
+    return originalSend.apply(this, arguments);
+  };
+
+  var observe = function () {
+    new MutationObserver(state.notify).observe(document.documentElement, {
+      childList: true, subtree: true, attributes: true
+    });
+  };
+  if (document.documentElement) { observe(); } else { document.addEventListener('DOMContentLoaded', observe); }
+  window.addEventListener('hashchange', state.notify);
+  window.addEventListener('popstate', state.notify);
+  window.addEventListener('load', state.notify);
+})();
+"""
+
+# Résout dès que le prédicat reste vrai pendant quiet_ms sans nouvelle activité. L'écouteur se retire
+# de lui-même à l'expiration du délai (Selenium abandonne alors l'attente sans prévenir la page), et
+# chaque attente retire d'abord ceux qu'une attente précédente aurait laissés.
+WAIT_JS = INSTRUMENTATION_JS + r"""
+var predicate = new Function('state', arguments[0]);
+var quietMs = arguments[1];
+var timeoutMs = arguments[2];
+var callback = arguments[arguments.length - 1];
+var state = window.__odooWait;
+state.waits = state.waits || [];
+state.waits.splice(0).forEach(function (stop) { stop(); });
+var timer = null;
+var expiry = null;
+var evaluate = function () {
+  try { return predicate(state); } catch (e) { return null; }
+};
+var listener = function () {
+  clearTimeout(timer);
+  if (!evaluate()) { return; }
+  timer = setTimeout(function () {
+    var value = evaluate();
+    if (value) {
+      stop();
+      callback(value);
+    }
+  }, quietMs);
+};
+var stop = function () {
+  clearTimeout(timer);
+  clearTimeout(expiry);
+  var position = state.listeners.indexOf(listener);
+  if (position >= 0) { state.listeners.splice(position, 1); }
+  position = state.waits.indexOf(stop);
+  if (position >= 0) { state.waits.splice(position, 1); }
+};
+state.waits.push(stop);
+expiry = setTimeout(stop, timeoutMs);
+state.listeners.push(listener);
+listener();
+"""
+
+RPC_IDLE = "return state.pending === 0 && document.readyState === 'complete';"
+
+FORM_SAVED = r"""
+if (state.pending) { return false; }
+if (document.querySelector('.o_form_view .o_field_invalid')) { return 'invalid'; }
+var form = document.querySelector('.o_form_view');
+if (!form) { return false; }
+var save = document.querySelector('.o_form_button_save');
+if (save && save.offsetParent !== null && !form.classList.contains('o_form_readonly')) { return false; }
+var match = /[#&?]id=(\d+)/.exec(location.href) || /\/(\d+)(?:[/?#]|$)/.exec(location.pathname);
+return match ? match[1] : false;
+"""
+
+NEW_FORM = r"""
+if (state.pending) { return false; }
+var form = document.querySelector('.o_form_view');
+if (!form || /[#&?]id=\d/.test(location.href)) { return false; }
+var name = form.querySelector("div[name='name'] input, input[name='name']");
+return !name || !name.value;
+"""
+
+KANBAN_LOADED = r"""
+if (state.pending || document.readyState !== 'complete') { return false; }
+if (document.querySelector('.o_view_sample_data, .o_blockUI')) { return false; }
+return document.querySelector('.o_kanban_renderer, .o_kanban_view') || false;
+"""
+
+
+class OdooWait:
+    """Conditions d'attente propres au client web Odoo"""
+
+    def __init__(self, driver, timeout=15):
+        self.driver = driver
+        self.timeout = timeout
+
+    def install(self):
+        """Injecter l'instrumentation dans tous les prochains documents du navigateur"""
+        if getattr(self.driver, "_odoo_wait_installed", False):
+            return
+        self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": INSTRUMENTATION_JS})
+        self.driver._odoo_wait_installed = True
+
+    def until(self, predicate_js, quiet_ms=0, timeout=None, kind="odoo"):
+        """Attendre qu'un prédicat JS (recevant `state`) devienne vrai, et retourner sa valeur
+
+        Sans `timeout` explicite, le délai vient de l'historique des attentes du même `kind`;
+        une attente expirée y est alors enregistrée avec le délai entier consommé.
+        """
+        self.install()
+        timeouts = shared_timeouts()
+        adaptive = timeout is None
+        timeout = timeouts.timeout(kind, self.timeout) if adaptive else timeout
+        start = time.monotonic()
+        deadline = start + timeout
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutException(f"Condition Odoo non atteinte en {timeout}s")
+                self.driver.set_script_timeout(remaining)
+                try:
+                    value = self.driver.execute_async_script(WAIT_JS, predicate_js, quiet_ms, int(remaining * 1000))
+                    timeouts.observe(kind, time.monotonic() - start)
+                    return value
+                except JavascriptException as e:
+                    # Le document a été remplacé pendant l'attente: reprendre dans le nouveau
+                    if "unload" not in str(e).lower():
+                        raise
+        except TimeoutException:
+            if adaptive:
+                timeouts.observe(kind, time.monotonic() - start)
+            raise
+
+    def page_token(self):
+        """Identifiant du document courant, pour détecter un rechargement complet"""
+        self.install()
+        return self.driver.execute_script(INSTRUMENTATION_JS + "return window.__odooWait.page;")
+
+    def until_rpc_idle(self, quiet_ms=150, timeout=None):
+        """File RPC vide et page chargée"""
+        return self.until(RPC_IDLE, quiet_ms, timeout, "rpc_idle")
+
+    def until_present(self, css, timeout=None):
+        """Élément présent dans le DOM"""
+        return self.until(f"return document.querySelector({css!r});", 0, timeout, "present")
+
+    def until_form_saved(self, timeout=None):
+        """Formulaire enregistré (plus de modification en attente, id dans l'URL); retourne l'id ou None"""
+        record_id = self.until(FORM_SAVED, 100, timeout, "form_saved")
+        return None if record_id == "invalid" else int(record_id)
+
+    def until_new_form(self, timeout=None):
+        """Formulaire de création vide affiché (pas d'id dans l'URL)"""
+        return self.until(NEW_FORM, 100, timeout, "new_form")
+
+    def until_kanban_loaded(self, timeout=None):
+        """Vue kanban rechargée et stable"""
+        return self.until(KANBAN_LOADED, 150, timeout, "kanban_loaded")
+
+    def until_new_page(self, token, predicate_js="return true;", timeout=None):
+        """Nouveau document chargé (différent de `token`) vérifiant le prédicat"""
+        return self.until(
+            f"if (state.page === {token!r} || document.readyState !== 'complete') {{ return false; }}\n"
+            + predicate_js,
+            0, timeout, "new_page")
@@ -1,32 +1,42 @@
 import os
-import time
 import unittest
-from selenium import webdriver
 from datetime import datetime
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.service import Service as ChromeService
 from dotenv import load_dotenv
+from harness.cleanup import RunTagger
+from harness.drivers import shared_pool
+from harness.form_fill import fill_fields
+from harness.locators import LocatorResolver
+from harness.logs import SUMMARY, get_logger
+from harness.navigation import AppNavigator
+from harness.oracle import ContactOracle
+from harness.perf import shared_perf
+from harness.recorder import capture_step, finish_test
+from harness.session import shared_session
+from harness.settings import setting
+from harness.timeouts import AdaptiveWait
+from harness.tracing import shared_tracer, traced
+from harness.waits import OdooWait
 
 load_dotenv()
 
+log = get_logger("TestContactCreation")
+
 
 class TestContactCreation(unittest.TestCase):
     """Complete contact creation test with real navigation flow"""
 
     def setUp(self):
-        # Chrome configuration
-        options = webdriver.ChromeOptions()
-        options.add_argument("--start-maximized")
-
-        # Driver initialization
-        self.service = ChromeService(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=self.service, options=options)
-        self.wait = WebDriverWait(self.driver, 15)
+        # Driver from the shared warm pool
+        self.driver = shared_pool().acquire()
+        self.wait = AdaptiveWait(self.driver, "element")
+        self.odoo_wait = OdooWait(self.driver, setting("timeout"))
+        self.locators = LocatorResolver(self.driver, self.odoo_wait)
+        self.navigator = AppNavigator(self.driver, self.odoo_wait, os.getenv("ODOO_URL"))
         self.test_start_time = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # Id du contact enregistré, lu dans l'URL après la sauvegarde
+        self.record_id = None
 
 
         self.contact_info = {
@@ -50,64 +60,48 @@ class TestContactCreation(unittest.TestCase):
 
     def take_screenshot(self, name):
         """Prend un screenshot avec nom timestampé"""
-        screenshot_name = f"screenshot_{self.test_start_time}_{name}.png"
-        self.driver.save_screenshot(screenshot_name)
-        print(f"Screenshot sauvegardé : {screenshot_name}")
+        screenshot_name = f"{self.test_start_time}_{name}"
+        capture_step(self.driver, screenshot_name)
+        log.debug(f"Screenshot enregistré : {screenshot_name}")
+    @traced()
     def login(self):
-        """Login to Odoo with verification"""
+        """Login to Odoo by reusing the shared authenticated session"""
         try:
-            self.driver.get(os.getenv("ODOO_URL") + "/web")
-
-            # Fill credentials
-            self.wait.until(EC.presence_of_element_located(
-                (By.ID, "login")
-            )).send_keys(os.getenv("ODOO_EMAIL"))
-
-            self.driver.find_element(By.ID, "password").send_keys(
-                os.getenv("ODOO_PASSWORD") + Keys.RETURN
-            )
-
-            # Verify login
-            self.wait.until(EC.presence_of_element_located(
-                (By.CSS_SELECTOR, ".o_main_navbar")
-            ))
-            return True
+            logged_in = shared_session().login_driver(self.driver, self.wait)
+            shared_perf().collect(self.driver, "webclient")
+            return logged_in
 
         except Exception as e:
-            print(f"Login failed: {str(e)}")
+            log.error(f"Login failed: {str(e)}")
             return False
 
+    @traced()
     def navigate_to_contacts(self):
         """Navigate to Contacts module"""
         try:
-            self.driver.get(
-                os.getenv("ODOO_URL") + "/web#cids=1&menu_id=96&action=122&model=res.partner&view_type=kanban")
-            self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, ".o_control_panel")))
+            self.navigator.open_kanban()
+            shared_perf().collect(self.driver, "kanban")
             return True
         except Exception as e:
-            print(f"Échec d'accès aux contacts : {str(e)}")
+            log.error(f"Échec d'accès aux contacts : {str(e)}")
             return False
 
+    @traced()
     def open_create_form(self):
-            """Accès DIRECT au formulaire de création via URL"""
+            """Accès au formulaire de création dans le client web déjà chargé"""
             try:
-                # URL directe pour créer un nouveau contact
-                create_url = os.getenv(
-                    "ODOO_URL") + "/web#cids=1&menu_id=96&action=122&model=res.partner&view_type=form"
-                self.driver.get(create_url)
-
-                # Vérification que le formulaire est chargé
-                self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, ".o_form_view")))
+                # Bouton Nouveau ou routage par hash, sans recharger l'application
+                self.navigator.open_new_form()
+                shared_perf().collect(self.driver, "form")
                 return True
             except Exception as e:
-                print(f"Échec d'accès au formulaire: {str(e)}")
+                log.error(f"Échec d'accès au formulaire: {str(e)}")
                 return False
 
+    @traced()
     def fill_and_submit_form(self):
         """Version très précise basée sur le code source"""
         try:
-            print("Remplissage du champ name...")
-
             # Sélecteur exact basé sur votre code source
             name_selectors = [
                 "input[placeholder='e.g. Brandon Freeman']",
@@ -118,50 +112,50 @@ class TestContactCreation(unittest.TestCase):
                 "input[name='name']"
             ]
 
-            # Essayer chaque sélecteur jusqu'à ce que ça marche
-            for selector in name_selectors:
-                try:
-                    name_field = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    name_field.clear()
-                    name_field.send_keys("Flora Marie")
-                    print(f" Nom rempli avec sélecteur: {selector}")
-                    time.sleep(1)
-                    break
-                except Exception as e:
-                    print(f" Échec avec {selector}: {e}")
-                    continue
-            else:
-                print(" Aucun sélecteur name n'a fonctionné")
-                return False
-
             # Les champs exacts de votre HTML
             fields = [
-                ("input[name='phone']", "+216 52 369 827"),
-                ("input[name='mobile']", "+216 52 369 828"),
-                ("input[name='email']", "flohair@example.com"),
-                ("input[name='street']", "123 Main St"),
-                ("input[name='street2']", "Suite 400"),
-                ("input[name='city']", "Tunis"),
-                ("input[name='zip']", "1000"),
-                ("input[name='website']", "https://example.com"),
+                ("phone", "+216 52 369 827"),
+                ("mobile", "+216 52 369 828"),
+                ("email", "flohair@example.com"),
+                ("street", "123 Main St"),
+                ("street2", "Suite 400"),
+                ("city", "Tunis"),
+                ("zip", "1000"),
+                ("website", "https://example.com"),
             ]
 
-            for selector, value in fields:
-                try:
-                    element = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    element.clear()
-                    element.send_keys(value)
-                    print(f"Rempli: {selector} = {value}")
-                except:
-                    print(f"Non trouvé: {selector}")
+            # Résoudre tous les champs en un seul passage
+            fields_mapping = [("name", name_selectors)] + [
+                (field_name, [f"input[name='{field_name}']"]) for field_name, _ in fields]
+            elements, missing = self.locators.resolve(fields_mapping)
+
+            log.debug("Remplissage du champ name...")
+            if "name" in missing:
+                log.error("Aucun sélecteur name n'a fonctionné")
+                return False
+
+            values = {"name": "Flora Marie"}
+            for field_name, value in fields:
+                if field_name in missing:
+                    log.debug(f"Non trouvé: input[name='{field_name}']")
                     continue
+                values[field_name] = value
 
+            # Tous les champs en un seul appel navigateur
+            fill_fields(self.driver, elements, values)
+            for field_name, value in values.items():
+                log.debug(f"Rempli: {field_name} = {value}")
+            self.submitted_contact = values
+
+            # Laisser passer les onchange déclenchés par la saisie
+            self.odoo_wait.until_rpc_idle()
             return True
 
         except Exception as e:
-            print(f"Erreur: {e}")
+            log.error(f"Erreur: {e}")
             return False
 
+    @traced()
     def submit_contact_form(self):
 
         """Soumission du formulaire """
@@ -172,57 +166,57 @@ class TestContactCreation(unittest.TestCase):
                     EC.element_to_be_clickable((By.CSS_SELECTOR, "button.o_form_button_save"))
                 )
                 save_button.click()
-                print("Bouton Save cliqué")
-                time.sleep(5)
+                log.debug("Bouton Save cliqué")
+                self.record_id = self.odoo_wait.until_form_saved()
             except Exception as e:
-                print(f"Bouton Save non trouvé: {e}")
+                log.warning(f"Bouton Save non trouvé: {e}")
                 # Essayer d'autres sélecteurs de bouton
                 try:
                     other_buttons = self.driver.find_elements(By.CSS_SELECTOR, "button")
                     for button in other_buttons:
                         if "save" in button.text.lower() or "enregistrer" in button.text.lower():
                             button.click()
-                            print("Bouton trouvé par texte")
-                            time.sleep(5)
+                            log.debug("Bouton trouvé par texte")
+                            self.record_id = self.odoo_wait.until_form_saved()
                             break
                 except:
-                    print("Aucun bouton trouvé")
+                    log.warning("Aucun bouton trouvé")
 
-            print("Formulaire rempli avec succès - soumission assumée réussie")
+            shared_perf().collect(self.driver, "form_save")
+            log.info("Formulaire rempli avec succès - soumission assumée réussie")
             return True
         except Exception as e:
-            print(f"Erreur lors de la soumission: {e}")
+            log.error(f"Erreur lors de la soumission: {e}")
             return False
 
+    @traced()
     def verify_contact_in_database(self):
         """Vérifier que le contact est bien enregistré dans la base"""
         try:
-            # Aller à la liste des contacts
-            contacts_list_url = f"{os.getenv('ODOO_URL')}/web#action=contacts.action_contacts&model=res.partner&view_type=kanban"
-            self.driver.get(contacts_list_url)
-            time.sleep(8)
-
-            # Rechercher le contact dans la liste
-            contact_name = "Flora M"  # Le nom que vous avez utilisé
-            page_source = self.driver.page_source
-
-            if contact_name in page_source:
-                print(f"SUCCÈS: Contact '{contact_name}' trouvé dans la liste")
+            # Un seul search_read côté serveur sur l'id enregistré, champ par champ
+            oracle = ContactOracle.from_env()
+            report = oracle.verify([(0, self.submitted_contact, self.record_id)])
+            log.info(report.summary(), extra=SUMMARY)
+            if report.found:
+                RunTagger(oracle.rpc).tag(report.found.values())
+
+            contact_name = self.submitted_contact["name"]
+            if report.ok:
+                log.info(f"SUCCÈS: Contact '{contact_name}' trouvé dans la base")
                 return True
             else:
-                print(f"ÉCHEC: Contact '{contact_name}' non trouvé dans la liste")
+                log.error(f"ÉCHEC: Contact '{contact_name}' absent ou incorrect dans la base")
                 return False
 
         except Exception as e:
-            print(f"Erreur vérification base de données: {e}")
+            log.error(f"Erreur vérification base de données: {e}")
             return False
 
     def test_complete_flow(self):
 
         """Complete test flow with improved error handling"""
         try:
-            # 1. Login with extended timeout
-            self.driver.set_page_load_timeout(5)
+            # 1. Login (page-load timeout set by the pool from observed load times)
             self.assertTrue(self.login(), "Login failed")
 
             # 2. Navigate to Contacts
@@ -230,14 +224,11 @@ class TestContactCreation(unittest.TestCase):
                             "Navigation to contacts failed")
             self.take_screenshot("contact_lists")
 
-            # 3. Open creation form with retry
-            for attempt in range(2):
-                if self.open_create_form():
-                    break
-                if attempt == 1:
-                    self.assertTrue(False, "Form opening failed after retry")
-                time.sleep(6)
-                self.take_screenshot("form_contact")
+            # 3. Open creation form, retried once with a full reload (no fixed pause)
+            if not self.open_create_form():
+                self.navigator.invalidate()
+                self.assertTrue(self.open_create_form(), "Form opening failed after retry")
+            self.take_screenshot("form_contact")
 
 
             # 4. Fill and submit form
@@ -255,18 +246,24 @@ class TestContactCreation(unittest.TestCase):
                 raise Exception("Contact inexistant")
             self.take_screenshot("new_contact")
 
-            print("SUCCES: Contact créé et vérifié dans la base de donnée")
+            perf_problems = shared_perf().report(shared_tracer().current_test)
+            if setting("perf_fail_on_threshold"):
+                self.assertFalse(perf_problems, f"Performance thresholds exceeded: {perf_problems}")
+
+            log.info("SUCCES: Contact créé et vérifié dans la base de donnée", extra=SUMMARY)
             return True
 
         except Exception as e:
-            print(f"TEST FAILED: {str(e)}")
+            log.error(f"TEST FAILED: {str(e)}", extra=SUMMARY)
             raise
-        finally:
-            self.driver.quit()
+
+    def tearDown(self):
+        finish_test(self, self.driver)
+        shared_pool().release(self.driver)
 
 
 # if __name__ == "__main__":
 #     unittest.main()
 if __name__ == "__main__":
-    import xmlrunner
-    unittest.main(testRunner=xmlrunner.XMLTestRunner(output='reports'))
\ No newline at end of file
+    from harness.runner import main
+    main()
\ No newline at end of file
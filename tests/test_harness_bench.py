@@ -0,0 +1,35 @@
+"""Tests de la comparaison du benchmark à sa référence (sans navigateur)"""
+import unittest
+
+from harness.bench import regressions
+
+BASELINE = {
+    "rows_per_s": 2.0,
+    "webdriver_commands": 100,
+    "steps": {"fill_contact_form": {"p50_s": 0.1, "p95_s": 0.2}},
+}
+
+
+def result(rows_per_s=2.0, commands=100, fill_p95=0.2):
+    return {"rows_per_s": rows_per_s, "webdriver_commands": commands,
+            "steps": {"fill_contact_form": {"p50_s": 0.1, "p95_s": fill_p95},
+                      "submit_contact_form": {"p50_s": 0.3, "p95_s": 0.5}}}
+
+
+class TestRegressions(unittest.TestCase):
+    """Écarts signalés seulement au-delà du seuil relatif"""
+
+    def test_within_threshold(self):
+        self.assertEqual(regressions(result(rows_per_s=1.7, commands=115, fill_p95=0.23), BASELINE, 0.2), [])
+
+    def test_each_metric_checked(self):
+        problems = regressions(result(rows_per_s=1.5, commands=130, fill_p95=0.3), BASELINE, 0.2)
+        self.assertEqual(len(problems), 3)
+        self.assertTrue(problems[0].startswith("rows/s 1.5"))
+        self.assertTrue(problems[1].startswith("commandes 130"))
+        self.assertTrue(problems[2].startswith("fill_contact_form p95 0.3s"))
+
+
+if __name__ == "__main__":
+    from harness.runner import main
+    main()
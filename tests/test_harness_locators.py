@@ -0,0 +1,89 @@
+"""Tests de la résolution groupée des champs et du cache des sélecteurs par version d'Odoo (sans navigateur)"""
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from harness.locators import RESOLVE_JS, VERSION_JS, LocatorResolver
+
+MAPPING = [
+    ("name", ["input[id='o_field_input_200']", "div[name='name'] input", "input.o_input"]),
+    ("email", ["input[name='email']"]),
+    ("website", ["input[name='website']"]),
+]
+
+
+class _FakeDriver:
+    """Simule RESOLVE_JS sur un DOM réduit à un ensemble de sélecteurs présents"""
+
+    def __init__(self, version, present):
+        self.version = version
+        self.present = present
+        self.calls = []
+
+    def execute_script(self, script, *args):
+        if script == VERSION_JS:
+            return self.version
+        assert script == RESOLVE_JS
+        mapping = args[0]
+        self.calls.append(mapping)
+        elements, selectors = {}, {}
+        for field_name, candidates in mapping:
+            for selector in candidates:
+                if selector in self.present:
+                    elements[field_name] = f"<{selector}>"
+                    selectors[field_name] = selector
+                    break
+        return elements, selectors
+
+
+class TestLocatorResolver(unittest.TestCase):
+    """Un seul appel navigateur par formulaire; sélecteur gagnant essayé en premier pour la même version"""
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, "selector_cache.json")
+
+    def read_cache(self):
+        with open(self.path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_single_pass_with_missing_fields(self):
+        driver = _FakeDriver("17.0", {"div[name='name'] input", "input.o_input", "input[name='email']"})
+        elements, missing = LocatorResolver(driver, path=self.path).resolve(MAPPING)
+
+        self.assertEqual(elements, {"name": "<div[name='name'] input>", "email": "<input[name='email']>"})
+        self.assertEqual(missing, ["website"])
+        self.assertEqual(len(driver.calls), 1)
+        self.assertEqual(self.read_cache(), {"17.0": {"name": "div[name='name'] input",
+                                                      "email": "input[name='email']"}})
+
+    def test_learned_selector_tried_first_for_same_version(self):
+        present = {"div[name='name'] input", "input.o_input", "input[name='email']"}
+        LocatorResolver(_FakeDriver("17.0", present), path=self.path).resolve(MAPPING)
+
+        driver = _FakeDriver("17.0", present)
+        LocatorResolver(driver, path=self.path).resolve(MAPPING)
+        self.assertEqual(driver.calls[0][0], ["name", ["div[name='name'] input", "input[id='o_field_input_200']",
+                                                       "input.o_input"]])
+
+        # Autre version d'Odoo: ordre d'origine, apprentissage séparé
+        other = _FakeDriver("16.0", {"input.o_input"})
+        LocatorResolver(other, path=self.path).resolve(MAPPING[:1])
+        self.assertEqual(other.calls[0][0], list(MAPPING[0]))
+        self.assertEqual(self.read_cache()["16.0"], {"name": "input.o_input"})
+        self.assertEqual(self.read_cache()["17.0"]["name"], "div[name='name'] input")
+
+    def test_cache_not_rewritten_when_unchanged(self):
+        resolver = LocatorResolver(_FakeDriver("17.0", {"input[name='email']"}), path=self.path)
+        resolver.resolve(MAPPING[1:2])
+        os.remove(self.path)
+        resolver.resolve(MAPPING[1:2])
+        self.assertFalse(os.path.exists(self.path))
+
+
+if __name__ == "__main__":
+    from harness.runner import main
+    main()
@@ -0,0 +1,50 @@
+"""Tests de la journalisation structurée (sans serveur ni navigateur)"""
+import json
+import logging
+import queue
+import sys
+import unittest
+
+from harness.logs import BoundedQueueHandler, JsonFormatter
+
+
+def _record_with_exception():
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        return logging.getLogger("odoo_contact.test").makeRecord(
+            "odoo_contact.test", logging.ERROR, __file__, 1, "Erreur ligne %d", (3,), sys.exc_info())
+
+
+class TestQueuedRecords(unittest.TestCase):
+    """Enregistrements préparés pour la file puis formatés par le thread d'écriture"""
+
+    def setUp(self):
+        self.handler = BoundedQueueHandler(queue.Queue(2))
+
+    def test_traceback_kept_apart_from_message(self):
+        prepared = self.handler.prepare(_record_with_exception())
+        entry = json.loads(JsonFormatter().format(prepared))
+
+        self.assertEqual(entry["msg"], "Erreur ligne 3")
+        self.assertIn("ValueError: boom", entry["exc"])
+        self.assertIsNone(prepared.exc_info)
+        # La console garde la trace sous le message
+        self.assertIn("ValueError: boom", logging.Formatter("%(message)s").format(prepared))
+
+    def test_plain_record_has_no_exc(self):
+        record = logging.getLogger("odoo_contact.test").makeRecord(
+            "odoo_contact.test", logging.INFO, __file__, 1, "ok %s", ("a",), None)
+        entry = json.loads(JsonFormatter().format(self.handler.prepare(record)))
+        self.assertEqual(entry["msg"], "ok a")
+        self.assertNotIn("exc", entry)
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        for _ in range(3):
+            self.handler.handle(logging.makeLogRecord({"msg": "x"}))
+        self.assertEqual(self.handler.dropped, 1)
+
+
+if __name__ == "__main__":
+    from harness.runner import main
+    main()
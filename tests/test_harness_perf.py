@@ -0,0 +1,69 @@
+"""Tests des métriques Odoo et de leur report JUnit par profil navigateur (sans navigateur)"""
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from xml.dom import minidom
+
+from harness.perf import PerfCollector, endpoint_name
+from harness.runner import attach_properties
+from harness.tracing import Tracer
+
+
+class _FakeDriver:
+    profile_name = "lean"
+
+    def execute_script(self, script):
+        return {"navigation": {"load": 120.0}, "long_tasks": [40.0, 60.0], "heap": None,
+                "requests": [{"url": "http://odoo/web/dataset/call_kw/res.partner/create?debug=1", "duration": 30.0}]}
+
+
+class TestPerfCollector(unittest.TestCase):
+    """Mesures par test, rattachées au profil du navigateur qui les a relevées"""
+
+    def setUp(self):
+        self.perf = PerfCollector({"rpc:call_kw/res.partner/create": 25})
+        with mock.patch("harness.perf.shared_tracer", return_value=mock.Mock(current_test="T.test_a")):
+            self.perf.collect(_FakeDriver(), "form")
+
+    def test_endpoint_name(self):
+        self.assertEqual(endpoint_name("http://odoo/web/dataset/call_kw/res.partner/create?x=1"),
+                         "call_kw/res.partner/create")
+        self.assertEqual(endpoint_name("/web/action/load"), "action/load")
+
+    def test_profile_and_thresholds(self):
+        self.assertEqual(self.perf.profiles("T.test_a"), ["lean"])
+        properties = self.perf.junit_properties("T.test_a")
+        self.assertEqual(properties["perf.browser_profile"], "lean")
+        self.assertEqual(properties["perf.page:form.long_tasks_ms.max"], 100.0)
+        self.assertEqual(self.perf.violations("T.test_a"), ["rpc:call_kw/res.partner/create p95 30.0 > seuil 25"])
+        self.assertEqual(self.perf.junit_properties("T.test_b"), {})
+
+
+class TestJUnitProperties(unittest.TestCase):
+    """Profil du run et mesures des tests ajoutés sous <properties> de chaque suite"""
+
+    def test_attach_properties(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "TEST-T-1-20250101000000.xml")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write('<testsuite name="T"><testcase classname="T" name="test_a" time="1"/></testsuite>')
+        tracer = Tracer()
+        tracer.current_test = "T.test_a"
+        with tracer.span("fill_contact_form"):
+            pass
+
+        with mock.patch("harness.runner.profile_name", return_value="lean"):
+            attach_properties(path, tracer)
+
+        properties = {prop.getAttribute("name"): prop.getAttribute("value")
+                      for prop in minidom.parse(path).getElementsByTagName("property")}
+        self.assertEqual(properties["browser_profile"], "lean")
+        self.assertEqual(properties["test_a.span.fill_contact_form.count"], "1")
+
+
+if __name__ == "__main__":
+    from harness.runner import main
+    main()
@@ -0,0 +1,83 @@
+"""Tests de l'enregistreur d'échecs (sans navigateur)"""
+import unittest
+
+from harness import recorder
+from harness.recorder import FlightRecorder
+
+
+class _FakeDriver:
+    current_url = "http://odoo/web"
+    page_source = "<html></html>"
+
+    def execute_cdp_cmd(self, command, params):
+        return {"data": "aGVsbG8="}
+
+    def get_log(self, kind):
+        return [{"level": "SEVERE", "message": "js error"}]
+
+
+class TestFailureDetection(unittest.TestCase):
+    """Seuls les tests en échec ou en erreur déclenchent l'écriture des artefacts"""
+
+    # Classe imbriquée: hors de la découverte des tests du module
+    class _Probe(unittest.TestCase):
+        """Test dont le tearDown note le verdict de test_failed"""
+
+        verdicts = {}
+
+        def tearDown(self):
+            self.verdicts[self._testMethodName] = recorder.test_failed(self)
+
+        def test_pass(self):
+            pass
+
+        def test_fail(self):
+            self.fail("échec")
+
+        def test_error(self):
+            raise RuntimeError("erreur")
+
+        def test_skip(self):
+            self.skipTest("ignoré")
+
+        def test_subtest_fail(self):
+            with self.subTest(row=1):
+                self.fail("échec du sous-test")
+
+        @unittest.expectedFailure
+        def test_expected_failure(self):
+            self.fail("attendu")
+
+    @classmethod
+    def setUpClass(cls):
+        cls._Probe.verdicts.clear()
+        unittest.defaultTestLoader.loadTestsFromTestCase(cls._Probe).run(unittest.TestResult())
+
+    def test_failed_and_errored_tests(self):
+        for name in ("test_fail", "test_error", "test_subtest_fail"):
+            self.assertTrue(self._Probe.verdicts[name], name)
+
+    def test_passed_skipped_and_expected_failures(self):
+        for name in ("test_pass", "test_skip", "test_expected_failure"):
+            self.assertFalse(self._Probe.verdicts[name], name)
+
+    def test_outside_a_run(self):
+        self.assertFalse(recorder.test_failed(self._Probe("test_pass")))
+
+
+class TestFlightRecorder(unittest.TestCase):
+
+    def test_keeps_last_steps_in_memory(self):
+        recorder = FlightRecorder(capacity=2, output_dir="unused")
+        driver = _FakeDriver()
+        for step in ("a", "b", "c"):
+            recorder.record(driver, step)
+        self.assertEqual([entry["name"] for entry in recorder.buffers[id(driver)]], ["b", "c"])
+
+        recorder.discard(driver)
+        self.assertIsNone(recorder.flush(driver, "test"))
+
+
+if __name__ == "__main__":
+    from harness.runner import main
+    main()
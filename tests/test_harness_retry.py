@@ -0,0 +1,108 @@
+"""Tests des reprises d'échecs transitoires et des délais adaptatifs (sans serveur ni navigateur)"""
+import json
+import os
+import shutil
+import socket
+import tempfile
+import unittest
+import urllib.error
+
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
+
+from harness.retry import RetryQueue, is_transient
+from harness.rpc import SESSION_EXPIRED_CODE, OdooRPCError
+from harness.timeouts import AdaptiveTimeouts
+
+
+class TestIsTransient(unittest.TestCase):
+    """Échecs rejouables: serveur ou navigateur, jamais les données ni les sélecteurs"""
+
+    def test_transient_errors(self):
+        for error in (TimeoutException("délai"), StaleElementReferenceException("périmé"),
+                      urllib.error.URLError("refusé"), socket.timeout("délai"), ConnectionResetError(),
+                      OdooRPCError({"code": SESSION_EXPIRED_CODE, "message": "Session expired"})):
+            self.assertTrue(is_transient(error), repr(error))
+
+    def test_permanent_errors(self):
+        for error in (None, NoSuchElementException("introuvable"), ValueError("donnée"),
+                      OdooRPCError({"code": 200, "message": "Odoo Server Error"})):
+            self.assertFalse(is_transient(error), repr(error))
+
+
+class TestRetryQueue(unittest.TestCase):
+    """Lignes différées rejouées jusqu'à `max_attempts` tentatives, première comprise"""
+
+    def test_drain(self):
+        queue = RetryQueue(max_attempts=3)
+        for index in range(4):
+            queue.defer(index, {"name": f"Contact {index}"})
+        outcomes = {
+            0: [(10, None)],
+            1: [(None, TimeoutException()), (11, None)],
+            2: [(None, TimeoutException()), (None, TimeoutException())],
+            3: [(None, ValueError("donnée"))],
+        }
+        calls = []
+
+        def attempt(index, record):
+            calls.append(index)
+            return outcomes[index].pop(0)
+
+        created, failed = queue.drain(attempt)
+
+        self.assertEqual(created, [(0, {"name": "Contact 0"}, 10), (1, {"name": "Contact 1"}, 11)])
+        self.assertEqual(failed, [(3, {"name": "Contact 3"}), (2, {"name": "Contact 2"})])
+        # Tentative différée = deuxième tentative: la ligne 2 n'a droit qu'à deux reprises
+        self.assertEqual(calls, [0, 1, 2, 3, 1, 2])
+        self.assertEqual(len(queue), 0)
+
+
+class TestAdaptiveTimeouts(unittest.TestCase):
+    """Délai = percentile x marge, borné, une fois l'historique suffisant; expirations comptées"""
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, "timeouts.json")
+        self.timeouts = AdaptiveTimeouts(self.path)
+        self.timeouts.min_samples = 5
+
+    def test_default_until_enough_samples(self):
+        for _ in range(4):
+            self.timeouts.observe("form_saved", 0.5)
+        self.assertEqual(self.timeouts.timeout("form_saved", 15), 15)
+        self.timeouts.observe("form_saved", 0.5)
+        self.assertEqual(self.timeouts.timeout("form_saved", 15), self.timeouts.minimum)
+
+    def test_budget_follows_percentile_within_bounds(self):
+        for seconds in (1.0, 1.0, 1.0, 1.0, 4.0):
+            self.timeouts.observe("rpc_idle", seconds)
+        self.assertEqual(self.timeouts.timeout("rpc_idle"), 12.0)
+        for _ in range(5):
+            self.timeouts.observe("rpc_idle", 100.0)
+        self.assertEqual(self.timeouts.timeout("rpc_idle"), self.timeouts.maximum)
+
+    def test_timed_out_wait_is_sampled(self):
+        with self.assertRaises(TimeoutException):
+            with self.timeouts.measure("element"):
+                raise TimeoutException("délai")
+        with self.assertRaises(ValueError):
+            with self.timeouts.measure("element"):
+                raise ValueError("autre erreur")
+        self.assertEqual(len(self.timeouts.samples["element"]), 1)
+
+    def test_save_merges_with_other_processes(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"element": [1.0], "present": [2.0]}, f)
+        self.timeouts.observe("element", 3.0)
+        self.timeouts.save()
+        self.timeouts.save()
+
+        with open(self.path, encoding="utf-8") as f:
+            self.assertEqual(json.load(f), {"element": [1.0, 3.0], "present": [2.0]})
+        self.assertEqual(AdaptiveTimeouts(self.path).samples["element"], [1.0, 3.0])
+
+
+if __name__ == "__main__":
+    from harness.runner import main
+    main()
@@ -0,0 +1,109 @@
+"""Tests des runs incrémentaux: état local des lignes et écart des lignes inchangées (sans navigateur)"""
+import os
+import shutil
+import tempfile
+import unittest
+
+import TestMultipleContactsCreation as contacts_flow
+from harness.bulk_loader import BulkContactLoader
+from harness.oracle import ContactOracle
+from harness.rpc import OdooRPC
+from harness.run_state import RunState, row_hash
+from harness.session import http_login
+from harness.standin import StandInOdoo
+
+
+def contact(i, **extra):
+    return {"name": f"Incrémental {i}", "email": f"inc{i}@example.com", "city": "Tunis", **extra}
+
+
+class TestRunState(unittest.TestCase):
+    """Empreintes validées par serveur cible, conservées entre deux ouvertures"""
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, "run_state.sqlite3")
+
+    def test_row_hash_ignores_empty_cells_and_column_order(self):
+        self.assertEqual(row_hash({"name": "A", "city": None, "zip": ""}), row_hash({"name": "A"}))
+        self.assertEqual(row_hash({"name": "A", "city": "B"}), row_hash({"city": "B", "name": "A"}))
+        self.assertNotEqual(row_hash({"name": "A"}), row_hash({"name": "A", "city": "B"}))
+
+    def test_mark_known_forget(self):
+        state = RunState("http://odoo/", self.path)
+        state.mark([("a", 1, None), ("b", 2, {"name": "B", "email": "b@example.com"})])
+        state.close()
+
+        state = RunState("http://odoo", self.path)
+        self.addCleanup(state.close)
+        self.assertEqual(state.known(["a", "b", "c"]), {"a": (1, None), "b": (2, ["email", "name"])})
+        other = RunState("http://other", self.path)
+        self.addCleanup(other.close)
+        self.assertEqual(other.known(["a"]), {})
+
+        state.forget([1])
+        self.assertEqual(state.known(["a", "b"]), {"b": (2, ["email", "name"])})
+        state.forget()
+        self.assertEqual(state.known(["b"]), {})
+
+
+class TestSkipUnchangedRows(unittest.TestCase):
+    """Seules les lignes identiques au dernier run et toujours conformes en base sont écartées"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.odoo = StandInOdoo().start()
+        session_id, _ = http_login(cls.odoo.url, cls.odoo.email, cls.odoo.password)
+        cls.rpc = OdooRPC(cls.odoo.url, session_id=session_id)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.odoo.stop()
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        # Instance sans setUp: ni navigateur ni fichier Excel, seulement l'état incrémental
+        self.test = contacts_flow.TestMultipleContactsCreation("test_multiple_contacts_creation")
+        self.test.oracle = ContactOracle(self.rpc)
+        self.test.run_state = RunState(self.odoo.url, os.path.join(directory, "run_state.sqlite3"))
+        self.addCleanup(self.test.run_state.close)
+        self.test.full_run = False
+        self.test.submitted = {}
+
+    def remember(self, rows, submitted=None):
+        created, _ = BulkContactLoader(self.rpc).load([(i, submitted or record) for i, record in rows])
+        self.test.run_state.mark([(row_hash(record), created[i], submitted) for i, record in rows])
+        return created
+
+    def test_unchanged_rows_skipped(self):
+        rows = [(0, contact(0)), (1, contact(1)), (2, contact(2))]
+        created = self.remember(rows[:2])
+
+        remaining, unchanged = self.test.skip_unchanged_rows(rows)
+        self.assertEqual((remaining, unchanged), ([rows[2]], 2))
+
+        # Ligne modifiée dans le fichier, contact modifié ou supprimé en base: retraités
+        self.rpc.call_kw("res.partner", "write", [[created[1]], {"city": "Sfax"}])
+        self.rpc.call_kw("res.partner", "unlink", [[created[0]]])
+        changed = [(0, contact(0)), (1, contact(1)), (2, contact(2, city="Sousse"))]
+        self.assertEqual(self.test.skip_unchanged_rows(changed), (changed, 0))
+
+    def test_ui_row_checked_on_submitted_columns(self):
+        record = contact(3, company="Company A")
+        submitted = {column: value for column, value in record.items() if column != "company"}
+        self.remember([(3, record)], submitted)
+
+        self.assertEqual(self.test.skip_unchanged_rows([(3, record)]), ([], 1))
+
+    def test_full_run_reprocesses_everything(self):
+        rows = [(0, contact(0))]
+        self.remember(rows)
+        self.test.full_run = True
+        self.assertEqual(self.test.skip_unchanged_rows(rows), (rows, 0))
+
+
+if __name__ == "__main__":
+    from harness.runner import main
+    main()
@@ -0,0 +1,125 @@
+"""Tests de l'ordonnancement par durées passées (sans serveur ni navigateur)"""
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from harness import scheduler
+from harness.scheduler import DEFAULT_ROW_S, DEFAULT_TEST_S, TimingStore, file_lock, lpt_shards, module_classes
+
+REPORT = """<?xml version="1.0" encoding="UTF-8"?>
+<testsuite name="TestLoginFailure" tests="3">
+  <testcase classname="TestLoginFailure" name="test_wrong_password" time="{time}"/>
+  <testcase classname="TestLoginFailure" name="test_empty_fields" time="2.0"/>
+  <testcase classname="TestLoginFailure" name="test_skipped" time="0.001"><skipped message="ignoré"/></testcase>
+</testsuite>
+"""
+
+
+class TestLptShards(unittest.TestCase):
+    """Le plus long d'abord, vers le lot le moins chargé"""
+
+    def test_balanced_shards(self):
+        durations = {"a": 8, "b": 7, "c": 6, "d": 5, "e": 4}
+        shards = lpt_shards(list(durations), 2, durations.get)
+        self.assertEqual(shards, [["a", "d", "e"], ["b", "c"]])
+        self.assertEqual(sorted(sum(durations[item] for item in shard) for shard in shards), [13, 17])
+
+    def test_fewer_items_than_workers(self):
+        self.assertEqual(lpt_shards([(0, "row")], 4, lambda row: 1.0), [[(0, "row")]])
+        self.assertEqual(lpt_shards([], 4, lambda row: 1.0), [[]])
+
+
+class TestTimingStore(unittest.TestCase):
+    """Durées lissées tirées des rapports JUnit et des spans de lignes"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, "timings.json")
+
+    def write_report(self, suffix, seconds):
+        with open(os.path.join(self.directory, f"TEST-TestLoginFailure-{suffix}.xml"), "w", encoding="utf-8") as f:
+            f.write(REPORT.format(time=seconds))
+
+    def test_reports_ingested_once_and_smoothed(self):
+        store = TimingStore(self.path)
+        self.write_report("100-20250101000000", 10.0)
+        store.ingest_reports(self.directory)
+        self.write_report("200-20250102000000", 20.0)
+        store.ingest_reports(self.directory)
+        store.ingest_reports(self.directory)
+
+        self.assertEqual(store.test_duration("TestLoginFailure.test_wrong_password"), 15.0)
+        self.assertEqual(store.test_duration("TestLoginFailure.test_empty_fields"), 2.0)
+        self.assertEqual(store.test_duration("TestLoginFailure.test_skipped"), DEFAULT_TEST_S)
+        self.assertEqual(store.class_duration("TestLoginFailure"), 17.0)
+        self.assertEqual(store.class_duration("TestInconnu"), DEFAULT_TEST_S)
+
+        store.save()
+        reloaded = TimingStore(self.path)
+        self.assertEqual(reloaded.tests, store.tests)
+        self.assertEqual(len(reloaded.seen_reports), 2)
+
+    def test_row_durations(self):
+        store = TimingStore(self.path)
+        self.assertEqual(store.row_duration("inconnue"), DEFAULT_ROW_S)
+        store.ingest_rows([
+            {"name": "contact_row", "dur": 4e6, "args": {"row": "r1"}},
+            {"name": "contact_row", "dur": 2e6, "args": {"row": "r1"}},
+            {"name": "contact_row", "dur": 9e6, "args": {"row": "r2"}},
+            {"name": "fill_contact_form", "dur": 1e6, "args": {}},
+        ])
+        self.assertEqual(store.rows, {"r1": 3.0, "r2": 9.0})
+        self.assertEqual(store.row_duration("inconnue"), 3.0)
+
+
+class TestFileLock(unittest.TestCase):
+    """Sections exclusives entre processus, verrou abandonné repris"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, "timings.json")
+
+    def test_exclusive(self):
+        inside = []
+        overlaps = []
+
+        def section():
+            with file_lock(self.path):
+                inside.append(1)
+                overlaps.append(len(inside))
+                time.sleep(0.01)
+                inside.pop()
+
+        threads = [threading.Thread(target=section) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(overlaps, [1] * 5)
+        self.assertFalse(os.path.exists(f"{self.path}.lock"))
+
+    def test_stale_lock_taken_over(self):
+        open(f"{self.path}.lock", "w").close()
+        with self.assertRaises(TimeoutError):
+            with file_lock(self.path, timeout=0.1):
+                pass
+        with file_lock(self.path, timeout=1, stale_s=0):
+            pass
+        self.assertFalse(os.path.exists(f"{self.path}.lock"))
+
+
+class TestModuleDiscovery(unittest.TestCase):
+
+    def test_module_classes(self):
+        self.assertEqual(module_classes(os.path.join(scheduler.TESTS_DIR, "test_harness_scheduler.py")),
+                         ["TestLptShards", "TestTimingStore", "TestFileLock", "TestModuleDiscovery"])
+
+
+if __name__ == "__main__":
+    from harness.runner import main
+    main()
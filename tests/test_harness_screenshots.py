@@ -0,0 +1,81 @@
+"""Tests du service de captures d'écran: écriture asynchrone et dédoublonnage (sans navigateur)"""
+import base64
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from harness.screenshots import Image, ScreenshotService
+
+
+def _jpeg(draw):
+    image = Image.new("RGB", (320, 200), "white")
+    draw(image)
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=90)
+    return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def _form(image, label_x=20):
+    for x in range(label_x, label_x + 120):
+        for y in range(40, 60):
+            image.putpixel((x, y), (30, 30, 30))
+
+
+def _kanban(image):
+    for x in range(0, 320, 40):
+        for y in range(0, 200):
+            image.putpixel((x, y), (0, 90, 160))
+
+
+class _FakeDriver:
+    """Renvoie les captures préparées, une par appel"""
+
+    def __init__(self, captures):
+        self.captures = list(captures)
+
+    def execute_cdp_cmd(self, command, params):
+        return {"data": self.captures.pop(0)}
+
+
+@unittest.skipIf(Image is None, "Pillow absent")
+class TestScreenshotService(unittest.TestCase):
+    """Seules les captures visuellement nouvelles d'un même navigateur sont écrites"""
+
+    def setUp(self):
+        self.run_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.run_dir)
+        self.service = ScreenshotService(run_dir=self.run_dir)
+
+    def capture_all(self, driver, names):
+        for name in names:
+            self.service.capture(driver, name)
+        self.service.flush()
+
+    def test_duplicates_skipped(self):
+        form = _jpeg(_form)
+        # Même écran à quelques pixels près (curseur, horloge): même empreinte perceptuelle
+        nearly_same = _jpeg(lambda image: (_form(image), image.putpixel((300, 190), (0, 0, 0))))
+        driver = _FakeDriver([form, form, nearly_same, _jpeg(_kanban), form])
+
+        self.capture_all(driver, ["form", "form_again", "form_cursor", "kanban", "form_back"])
+
+        self.assertEqual(sorted(os.listdir(self.run_dir)), ["form.jpg", "form_back.jpg", "kanban.jpg"])
+        self.assertEqual((self.service.written, self.service.skipped), (3, 2))
+
+    def test_drivers_compared_separately(self):
+        form = _jpeg(_form)
+        first, second = _FakeDriver([form]), _FakeDriver([form])
+        self.capture_all(first, ["worker1_form"])
+        self.capture_all(second, ["worker2_form"])
+        self.assertEqual(sorted(os.listdir(self.run_dir)), ["worker1_form.jpg", "worker2_form.jpg"])
+
+    def test_distinct_screens_written(self):
+        self.capture_all(_FakeDriver([_jpeg(_form), _jpeg(lambda image: _form(image, 180))]), ["left", "right"])
+        self.assertEqual(self.service.written, 2)
+
+
+if __name__ == "__main__":
+    from harness.runner import main
+    main()
@@ -0,0 +1,95 @@
+"""Tests de la lecture en flux des feuilles de contacts et de son cache Parquet (sans serveur ni navigateur)"""
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from openpyxl import Workbook
+
+from harness import spreadsheet
+from harness.spreadsheet import count_rows, file_hash, iter_contact_chunks
+
+HEADER = ["name", "phone", "zip"]
+ROWS = [["Alice", 21655123456, 1000], [None, None, None], ["Bob", None, "75000"], ["Carol", "+216 1", None]]
+EXPECTED = [
+    {"name": "Alice", "phone": "21655123456", "zip": "1000"},
+    {"name": "Bob", "phone": None, "zip": "75000"},
+    {"name": "Carol", "phone": "+216 1", "zip": None},
+]
+
+
+class TestContactSpreadsheet(unittest.TestCase):
+    """Même lignes et même compte pour xlsx, csv et le cache, lignes vides exclues"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        patcher = mock.patch.object(spreadsheet, "CACHE_DIR", os.path.join(self.directory, "cache"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def write_xlsx(self):
+        path = os.path.join(self.directory, "contacts.xlsx")
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.append(HEADER)
+        for row in ROWS:
+            sheet.append(row)
+        workbook.save(path)
+        return path
+
+    def write_csv(self):
+        path = os.path.join(self.directory, "contacts.csv")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("name,phone,zip\nAlice,21655123456,1000\n,,\nBob,,75000\nCarol,+216 1,\n")
+        return path
+
+    def read(self, path, chunk_size=2, **kwargs):
+        frames = list(iter_contact_chunks(path, chunk_size, **kwargs))
+        return [len(frame) for frame in frames], [record for frame in frames for record in frame.to_dict("records")]
+
+    def test_xlsx_streamed_in_chunks(self):
+        path = self.write_xlsx()
+        sizes, records = self.read(path)
+        self.assertEqual(sizes, [2, 1])
+        self.assertEqual(records, EXPECTED)
+        self.assertEqual(count_rows(path), 3)
+
+    def test_csv_streamed_in_chunks(self):
+        path = self.write_csv()
+        self.assertEqual(self.read(path)[1], EXPECTED)
+        self.assertEqual(count_rows(path), 3)
+
+    def test_parquet_cache_reused(self):
+        path = self.write_xlsx()
+        digest = file_hash(path)
+        first = self.read(path, digest=digest)[1]
+        self.assertEqual(os.listdir(spreadsheet.CACHE_DIR), [f"{digest}.parquet"])
+
+        # Deuxième lecture depuis le cache: la feuille n'est plus parsée
+        with mock.patch.object(spreadsheet, "_parse_chunks", side_effect=AssertionError("feuille relue")):
+            sizes, records = self.read(path, digest=digest)
+            self.assertEqual(count_rows(path, digest), 3)
+        self.assertEqual(records, first)
+        self.assertEqual(sizes, [2, 1])
+
+    def test_interrupted_read_leaves_no_cache(self):
+        path = self.write_xlsx()
+        chunks = iter_contact_chunks(path, 1)
+        next(chunks)
+        chunks.close()
+        self.assertEqual(os.listdir(spreadsheet.CACHE_DIR), [])
+        self.assertEqual(self.read(path)[1], EXPECTED)
+
+    def test_cache_skipped_without_pyarrow(self):
+        path = self.write_csv()
+        with mock.patch.object(spreadsheet, "_parquet", return_value=None):
+            self.assertEqual(self.read(path)[1], EXPECTED)
+            self.assertEqual(count_rows(path), 3)
+        self.assertFalse(os.path.exists(spreadsheet.CACHE_DIR))
+
+
+if __name__ == "__main__":
+    from harness.runner import main
+    main()
@@ -0,0 +1,220 @@
+"""Tests du harnais contre les serveurs locaux de substitution (sans Odoo ni navigateur)"""
+import os
+import shutil
+import tempfile
+import time
+import unittest
+import urllib.error
+import urllib.request
+
+from harness.bulk_loader import BulkContactLoader
+from harness.login_matrix import LoginProber
+from harness.oracle import ContactOracle
+from harness.rpc import OdooRPC, OdooRPCError
+from harness.session import SESSION_COOKIE, http_login, odoo_url, session_is_valid
+from harness.standin import WEBCLIENT_PAGE, StandInOdoo, StandInTestRail
+from harness.testrail import CaseMap, ResultPublisher, TestRailClient, TestRailError
+
+
+def contact(i, **extra):
+    return {"name": f"Stand-in {i}", "email": f"standin{i}@example.com", "phone": f"2165{i:07d}",
+            "city": "Tunis", **extra}
+
+
+class TestBulkLoaderStandIn(unittest.TestCase):
+    """Création groupée JSON-RPC et contrôle serveur par id"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.odoo = StandInOdoo().start()
+        session_id, _ = http_login(cls.odoo.url, cls.odoo.email, cls.odoo.password)
+        cls.rpc = OdooRPC(cls.odoo.url, session_id=session_id)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.odoo.stop()
+
+    def setUp(self):
+        self.odoo.models["res.partner"].records.clear()
+
+    def test_load_in_concurrent_batches(self):
+        """Toutes les lignes créées, par lots, avec les valeurs communes"""
+        rows = [(i, contact(i)) for i in range(25)]
+        created, failures = BulkContactLoader(self.rpc, batch_size=10, concurrency=3,
+                                              extra_vals={"comment": "run"}).load(rows)
+
+        self.assertEqual(failures, [])
+        self.assertEqual(sorted(created), list(range(25)))
+        self.assertEqual(len(set(created.values())), 25)
+        partners = self.rpc.call_kw("res.partner", "search_read", [[("comment", "=", "run")]], {"fields": ["name"]})
+        self.assertEqual(len(partners), 25)
+        self.assertEqual(self.rpc.call_kw("res.partner", "read", [[created[7]], ["name"]])[0]["name"], "Stand-in 7")
+
+    def test_rejected_batch_reports_its_rows(self):
+        """Un lot refusé par le serveur (session invalide) remonte chacune de ses lignes en échec"""
+        rows = [(i, contact(i)) for i in range(5)]
+        created, failures = BulkContactLoader(OdooRPC(self.odoo.url, session_id="expired"), batch_size=2).load(rows)
+
+        self.assertEqual(created, {})
+        self.assertEqual(sorted(index for index, _ in failures), list(range(5)))
+
+    def test_oracle_checks_created_ids_only(self):
+        """Un partenaire identique d'un run précédent ne masque ni une ligne absente ni une divergence"""
+        oracle = ContactOracle(self.rpc)
+        self.rpc.call_kw("res.partner", "create", [[contact(1), contact(2)]])
+        floor = oracle.last_id()
+        created, _ = BulkContactLoader(self.rpc).load([(2, contact(2, city="Sfax"))])
+
+        report = oracle.verify([(1, contact(1), None), (2, contact(2), created[2])])
+
+        self.assertEqual(report.found, {2: created[2]})
+        self.assertEqual(report.missing, [(1, "Stand-in 1")])
+        self.assertEqual(report.mismatched, [(2, "city", "Tunis", "Sfax")])
+        self.assertEqual(oracle.count([("email", "=", "standin2@example.com")]), 2)
+
+        # Ligne sauvegardée malgré l'échec côté navigateur: retrouvée parmi les créations du run seulement
+        self.assertEqual(oracle.find_created(contact(2, city="Sfax"), floor), created[2])
+        self.assertIsNone(oracle.find_created(contact(1), floor))
+        self.assertIsNone(oracle.find_created(contact(2, city="Sfax"), floor, exclude={created[2]}))
+
+    def test_oracle_compares_submitted_columns_only(self):
+        """Une colonne que le formulaire n'a pas saisie (société) n'est pas signalée divergente"""
+        oracle = ContactOracle(self.rpc)
+        record = contact(1, company="Company A")
+        submitted = {column: value for column, value in record.items() if column != "company"}
+        created, _ = BulkContactLoader(self.rpc).load([(1, submitted)])
+
+        self.assertEqual(oracle.verify([(1, record, created[1])]).mismatched,
+                         [(1, "company_name", "Company A", False)])
+        self.assertTrue(oracle.verify([(1, submitted, created[1])]).ok)
+        self.assertEqual(oracle.find_created(submitted, 0), created[1])
+
+    def test_call_without_session_raises(self):
+        with self.assertRaises(OdooRPCError) as context:
+            OdooRPC(self.odoo.url, session_id="expired").call_kw("res.partner", "search_count", [[]])
+        self.assertEqual(context.exception.code, 100)
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class TestStandInWebClient(unittest.TestCase):
+    """Login, client web et blocage des échecs de connexion du serveur de substitution"""
+
+    def setUp(self):
+        self.odoo = StandInOdoo(login_cooldown_after=3, login_cooldown_s=0.5).start()
+        self.addCleanup(self.odoo.stop)
+
+    def get(self, path, session_id=None):
+        request = urllib.request.Request(odoo_url(self.odoo.url, path))
+        if session_id:
+            request.add_header("Cookie", f"{SESSION_COOKIE}={session_id}")
+        try:
+            response = urllib.request.build_opener(_NoRedirect).open(request, timeout=10)
+        except urllib.error.HTTPError as e:
+            return e.code, e.headers.get("Location"), ""
+        return response.status, None, response.read().decode("utf-8")
+
+    def test_webclient_requires_a_session(self):
+        status, location, _ = self.get("web")
+        self.assertEqual((status, location), (303, "/web/login"))
+
+        session_id, _ = http_login(self.odoo.url, self.odoo.email, self.odoo.password)
+        self.assertTrue(session_is_valid(self.odoo.url, session_id))
+        status, _, page = self.get("web", session_id)
+        self.assertEqual(status, 200)
+        self.assertEqual(page, WEBCLIENT_PAGE)
+
+    def test_wrong_password_is_rejected(self):
+        with self.assertRaises(RuntimeError):
+            http_login(self.odoo.url, self.odoo.email, "wrong")
+        result = LoginProber(self.odoo.url).submit(self.odoo.email, "wrong")
+        self.assertEqual(result.outcome, "rejected")
+
+    def test_cooldown_until_next_successful_login(self):
+        """Comme Odoo: IP bloquée après `login_cooldown_after` échecs, même pour une connexion valide;
+        seule une connexion réussie après le délai remet le compteur à zéro"""
+        prober = LoginProber(self.odoo.url)
+        outcomes = [prober.submit("nobody@example.com", "wrong").outcome for _ in range(4)]
+        self.assertEqual(outcomes, ["rejected"] * 3 + ["cooldown"])
+        with self.assertRaises(RuntimeError):
+            http_login(self.odoo.url, self.odoo.email, self.odoo.password)
+
+        time.sleep(self.odoo.login_cooldown_s)
+        http_login(self.odoo.url, self.odoo.email, self.odoo.password)
+        outcomes = [prober.submit("nobody@example.com", "wrong").outcome for _ in range(3)]
+        self.assertEqual(outcomes, ["rejected"] * 3)
+
+    def test_login_matrix_paced_around_cooldown(self):
+        """Vagues plus courtes que le seuil, séparées par une connexion valide: aucune combinaison bloquée"""
+        cases = [(f"user{i}@example.com", "wrong") for i in range(10)]
+        reset = lambda: http_login(self.odoo.url, self.odoo.email, self.odoo.password)
+        results = LoginProber(self.odoo.url).run(cases, workers=4, reset=reset, wave=2)
+
+        self.assertEqual([r.outcome for r in results], ["rejected"] * 10)
+        self.assertEqual([r.email for r in results], [email for email, _ in cases])
+
+
+class TestTestRailStandIn(unittest.TestCase):
+    """Publication TestRail: reprise sur 429/500, envois groupés et cache des cas"""
+
+    CONFIG = {"project": "ModuleContactOdoo", "auto_create_sections": True, "auto_create_cases": True}
+
+    def setUp(self):
+        self.testrail = StandInTestRail().start()
+        self.addCleanup(self.testrail.stop)
+        self.client = TestRailClient(self.testrail.url, "user", "key", backoff=0.01)
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        self.case_cache = os.path.join(cache_dir, "testrail_cases.json")
+
+    def test_retries_rate_limit_and_server_errors(self):
+        self.testrail.fail_next = [429, 500, 503]
+        projects = self.client.paged("get_projects", "projects")
+
+        self.assertEqual([p["name"] for p in projects], ["ModuleContactOdoo"])
+        self.assertEqual(self.testrail.calls, ["get_projects"] * 4)
+
+    def test_gives_up_on_client_errors_and_exhausted_retries(self):
+        self.testrail.fail_next = [400]
+        with self.assertRaises(TestRailError):
+            self.client.send("get_projects")
+        self.assertEqual(len(self.testrail.calls), 1)
+
+        self.testrail.fail_next = [500] * (self.client.retries + 1)
+        with self.assertRaises(TestRailError):
+            self.client.send("get_projects")
+
+    def test_publisher_sends_results_in_batches(self):
+        publisher = ResultPublisher(self.client, self.CONFIG, "run", batch_size=3, flush_interval=60,
+                                    case_cache=self.case_cache)
+        tests = [f"TestSuite.test_{i}" for i in range(7)]
+        # Erreurs transitoires en plein envoi: reprises par le client, aucun résultat perdu
+        self.testrail.fail_next = [429, 500]
+        for i, test_id in enumerate(tests):
+            publisher.publish(test_id, "failed" if i == 4 else "passed", elapsed=1.2)
+        publisher.close()
+
+        self.assertEqual(self.testrail.calls.count("add_results_for_cases"), 3)
+        self.assertEqual(self.testrail.calls.count("add_run"), 1)
+        self.assertEqual(publisher.published, 7)
+        self.assertEqual([r["status_id"] for r in self.testrail.results], [1, 1, 1, 1, 5, 1, 1])
+        run = self.testrail.runs[publisher.run_id]
+        self.assertEqual(sorted(run["case_ids"]), sorted(case["id"] for case in self.testrail.cases))
+
+    def test_case_ids_cached_between_runs(self):
+        publisher = ResultPublisher(self.client, self.CONFIG, "run", flush_interval=60, case_cache=self.case_cache)
+        publisher.publish("TestSuite.test_cached", "passed")
+        publisher.close()
+        self.testrail.calls.clear()
+
+        cases = CaseMap(self.client, 1, path=self.case_cache)
+        self.assertEqual(cases.resolve(["TestSuite.test_cached"]), {"TestSuite.test_cached": self.testrail.cases[0]["id"]})
+        self.assertEqual(self.testrail.calls, [])
+
+
+if __name__ == "__main__":
+    from harness.runner import main
+    main()
@@ -0,0 +1,79 @@
+"""Tests de la validation et de la normalisation des contacts (sans serveur ni navigateur)"""
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from harness.bulk_loader import PARTNER_FIELDS
+from harness.settings import TEST_CONFIG
+from harness.validation import normalize_contacts, validate_contacts
+
+KNOWN = list(PARTNER_FIELDS)
+
+
+class TestNormalizeContacts(unittest.TestCase):
+    """Cellules nettoyées comme elles seront envoyées au formulaire"""
+
+    def test_cells_cleaned(self):
+        frame = normalize_contacts(pd.DataFrame({
+            "name": ["  Alice  ", ""],
+            "phone": ["+216 55-123.456", 21655123456.0],
+            "email": [" Alice@Example.COM ", None],
+        }))
+        self.assertEqual(frame.at[0, "name"], "Alice")
+        self.assertTrue(pd.isna(frame.at[1, "name"]))
+        self.assertEqual(list(frame["phone"]), ["+21655123456", "21655123456"])
+        self.assertEqual(frame.at[0, "email"], "alice@example.com")
+
+    def test_zip_upper_cased_and_padded(self):
+        zips = pd.DataFrame({"zip": ["sw1a   1aa", 1000.0, "75000"]})
+        self.assertEqual(list(normalize_contacts(zips)["zip"]), ["SW1A 1AA", "1000", "75000"])
+        with mock.patch.dict(TEST_CONFIG, {"zip_digits": 5}):
+            self.assertEqual(list(normalize_contacts(zips)["zip"]), ["SW1A 1AA", "01000", "75000"])
+
+
+class TestValidateContacts(unittest.TestCase):
+    """Masques de rejet par règle, index de ligne conservés d'un lot à l'autre"""
+
+    def test_rejects_with_reasons(self):
+        frame = pd.DataFrame({
+            "name": ["Valide", None, "Email", "Tel", "Zip"],
+            "email": ["v@example.com", "x@example.com", "pas-un-email", None, None],
+            "phone": ["21655123456", None, None, "12", None],
+            "zip": ["1000", None, None, None, "1"],
+            "notes": ["ignorée"] * 5,
+        })
+        rows, rejects, unknown = validate_contacts(frame, KNOWN, offset=100)
+
+        self.assertEqual(unknown, ["notes"])
+        self.assertEqual([index for index, _ in rows], [100])
+        self.assertEqual(rows[0][1], {"name": "Valide", "email": "v@example.com", "phone": "21655123456",
+                                      "zip": "1000"})
+        self.assertEqual(rejects, [
+            (101, "Contact 102", ["name manquant"]),
+            (102, "Email", ["email invalide"]),
+            (103, "Tel", ["phone invalide"]),
+            (104, "Zip", ["zip invalide"]),
+        ])
+
+    def test_empty_cells_become_none(self):
+        rows, rejects, _ = validate_contacts(pd.DataFrame({"name": ["A"], "city": [None]}), KNOWN)
+        self.assertEqual(rejects, [])
+        self.assertEqual(rows, [(0, {"name": "A", "city": None})])
+
+    def test_missing_required_column(self):
+        rows, rejects, _ = validate_contacts(pd.DataFrame({"email": ["a@example.com"]}), KNOWN)
+        self.assertEqual(rows, [])
+        self.assertEqual(rejects, [(0, "Contact 1", ["colonne name absente"])])
+
+    def test_zip_pattern_override(self):
+        frame = pd.DataFrame({"name": ["A", "B"], "zip": ["1000", "75000"]})
+        with mock.patch.dict(TEST_CONFIG, {"zip_pattern": r"^\d{4}$"}):
+            rows, rejects, _ = validate_contacts(frame, KNOWN)
+        self.assertEqual([index for index, _ in rows], [0])
+        self.assertEqual(rejects, [(1, "B", ["zip invalide"])])
+
+
+if __name__ == "__main__":
+    from harness.runner import main
+    main()
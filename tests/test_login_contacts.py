@@ -1,32 +1,37 @@
 import os
-import time
 import unittest
 from datetime import datetime
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.service import Service as ChromeService
 from dotenv import load_dotenv
+from harness.drivers import shared_pool
+from harness.logs import SUMMARY, get_logger
+from harness.perf import shared_perf
+from harness.recorder import capture_step, finish_test, test_failed
+from harness.settings import setting
+from harness.timeouts import AdaptiveWait
+from harness.tracing import span
+from harness.waits import OdooWait
 
 load_dotenv()
 
+log = get_logger("TestOdooLogin")
+
 
 class TestOdooLogin(unittest.TestCase):
     def setUp(self):
-        self.driver = webdriver.Chrome(service=ChromeService(ChromeDriverManager().install()))
-        self.driver.maximize_window()
+        self.driver = shared_pool().acquire()
         self.driver.get(os.getenv("ODOO_URL"))
-        self.wait = WebDriverWait(self.driver, 10)  # Timeout augmenté à 10s
+        self.wait = AdaptiveWait(self.driver, "element")
+        self.odoo_wait = OdooWait(self.driver, setting("timeout"))
         self.test_start_time = datetime.now().strftime("%Y%m%d_%H%M%S")
 
     def take_screenshot(self, name):
         """Prend un screenshot avec nom timestampé"""
-        screenshot_name = f"screenshot_{self.test_start_time}_{name}.png"
-        self.driver.save_screenshot(screenshot_name)
-        print(f"Screenshot sauvegardé : {screenshot_name}")
+        screenshot_name = f"{self.test_start_time}_{name}"
+        capture_step(self.driver, screenshot_name)
+        log.debug(f"Screenshot enregistré : {screenshot_name}")
 
     def test_login(self):
         # Étape 1: Page de login
@@ -35,28 +40,32 @@ class TestOdooLogin(unittest.TestCase):
         password = os.getenv("ODOO_PASSWORD")
 
         # Étape 2: Saisie des identifiants
-        email_field = self.wait.until(EC.presence_of_element_located((By.NAME, "login")))
-        email_field.send_keys(email)
-        self.take_screenshot("02_email_entered")
-        password_field = self.driver.find_element(By.NAME, "password")
-        password_field.send_keys(password + Keys.RETURN)
-        self.take_screenshot("03_password_submitted")
+        with span("login_fill"):
+            email_field = self.wait.until(EC.presence_of_element_located((By.NAME, "login")))
+            email_field.send_keys(email)
+            self.take_screenshot("02_email_entered")
+            password_field = self.driver.find_element(By.NAME, "password")
+            password_field.send_keys(password + Keys.RETURN)
+            self.take_screenshot("03_password_submitted")
 
         # Étape 3: Vérification
-        try:
-            self.wait.until(EC.title_contains("Odoo"))  # Attente explicite
-            self.take_screenshot("04_login_success")
-            print("Connexion réussie - Page titre contient 'Odoo'")
-        except Exception as e:
-            self.take_screenshot("error_final_state")
-            raise
-        # Pause finale pour visualisation
-        time.sleep(10)  # 10 secondes avant fermeture
+        with span("login_verify"):
+            try:
+                self.wait.until(EC.title_contains("Odoo"))  # Attente explicite
+                self.take_screenshot("04_login_success")
+                log.info("Connexion réussie - Page titre contient 'Odoo'", extra=SUMMARY)
+            except Exception as e:
+                self.take_screenshot("error_final_state")
+                raise
+            # Attendre que le client web ait fini de charger
+            self.odoo_wait.until_rpc_idle()
+            shared_perf().collect(self.driver, "webclient")
     def tearDown(self):
-        if hasattr(self, '_outcome') and any(self._outcome.errors):
+        if test_failed(self):
             self.take_screenshot("final_error_state")
-        self.driver.quit()
+        finish_test(self, self.driver)
+        shared_pool().release(self.driver)
 
 if __name__ == "__main__":
-    import xmlrunner
-    unittest.main(testRunner=xmlrunner.XMLTestRunner(output='reports'))
+    from harness.runner import main
+    main()